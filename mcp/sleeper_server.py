@@ -23,7 +23,10 @@ from mcp.types import (
     CallToolRequest, CallToolResult, GetResourceRequest, GetResourceResult
 )
 
-from utils import make_sleeper_request
+from utils import make_sleeper_request, load_settings
+from sleeper_client import get_session_config, configure_session_from_settings, close_session, fetch_many
+from player_snapshot import load_players, refresh_snapshot, snapshot_player
+from niv import NIVEngine
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -35,6 +38,40 @@ LEGION_LEAGUE_ID = "1267325171853701120"
 # Create MCP server
 server = Server("sleeper-server")
 
+def _snapshot_players(player_ids: List[str]) -> Dict[str, Any]:
+    """Player models from the daily players/nfl snapshot (no full payload decode per call)"""
+    return {player_id: snapshot_player(record) for player_id, record in load_players(player_ids).items()}
+
+def _free_agent_niv(position: Optional[str], season: int, limit: int):
+    """Free-agent NIV records, universe size and rostered count (blocking; run in a thread)"""
+    # NIV over the whole players/nfl universe, then drop rostered players
+    season_stats = make_sleeper_request(f"stats/nfl/regular/{season}") or {}
+    rosters = make_sleeper_request(f"league/{LEGION_LEAGUE_ID}/rosters") or []
+    rostered = {pid for roster in rosters for pid in (roster.get("players") or [])}
+    
+    # Weekly splits of completed weeks give consistency and explosive NIV
+    nfl_state = make_sleeper_request("state/nfl") or {}
+    last_week = int(nfl_state.get("week") or 1) - 1 if str(nfl_state.get("season")) == str(season) else 18
+    weekly = fetch_many([f"stats/nfl/regular/{season}/{week}" for week in range(1, last_week + 1)])
+    weekly_stats = {int(endpoint.rsplit("/", 1)[1]): stats for endpoint, stats in weekly.items() if stats}
+    
+    snapshot, _ = refresh_snapshot()
+    engine = NIVEngine({"current_season": season}, LEGION_LEAGUE_ID)
+    universe = engine.calculate_universe_niv(
+        season_stats, snapshot=snapshot,
+        players_db=None if snapshot is not None else load_players(),
+        weekly_stats=weekly_stats
+    )
+    free_agents = [pid for pid in universe["player_ids"] if pid not in rostered]
+    records = engine.universe_records(universe, free_agents, position, limit)
+    
+    details = load_players([r["player_id"] for r in records])
+    for record in records:
+        info = details.get(record["player_id"], {})
+        record["name"] = info.get("full_name") or record["player_id"]
+        record["team"] = info.get("team") or "FA"
+    return records, universe["total_players"], len(rostered)
+
 @server.list_tools()
 async def handle_list_tools() -> List[Tool]:
     """List STREAMLINED Sleeper API tools using VERIFIED endpoints"""
@@ -282,6 +319,30 @@ async def handle_list_tools() -> List[Tool]:
                     }
                 }
             }
+        ),
+        Tool(
+            name="get_free_agent_niv",
+            description="Rank unrostered players by NIV for waiver and free-agent analysis",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "position": {
+                        "type": "string",
+                        "enum": ["QB", "RB", "WR", "TE", "K", "DEF", "IDP"],
+                        "description": "Filter by position"
+                    },
+                    "season": {
+                        "type": "integer",
+                        "description": "Season whose stats drive NIV",
+                        "default": 2025
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": "Max players to return",
+                        "default": 25
+                    }
+                }
+            }
         )
     ]
 
@@ -446,7 +507,7 @@ async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> CallToolResu
             include_stats = arguments.get("include_stats", False)
             
             # VERIFIED endpoint: players/nfl
-            players = sleeper_api.get_players(player_ids)
+            players = _snapshot_players(player_ids)
             
             result_data = []
             for player_id, player in players.items():
@@ -526,7 +587,7 @@ async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> CallToolResu
             include_trends = arguments.get("include_trends", True)
             
             # Get player info
-            players = sleeper_api.get_players(player_ids)
+            players = _snapshot_players(player_ids)
             
             # Get projections if requested
             projections_data = {}
@@ -759,6 +820,28 @@ async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> CallToolResu
                 )]
             )
         
+        elif name == "get_free_agent_niv":
+            position = arguments.get("position")
+            season = arguments.get("season", 2025)
+            limit = arguments.get("limit", 25)
+            
+            # Sleeper fetches and the NIV pass are blocking: keep them off the event loop
+            records, universe_size, rostered_count = await asyncio.to_thread(
+                _free_agent_niv, position, season, limit)
+            
+            return CallToolResult(
+                content=[TextContent(
+                    type="text",
+                    text=json.dumps({
+                        "free_agents": records,
+                        "position_filter": position,
+                        "universe_size": universe_size,
+                        "rostered_excluded": rostered_count,
+                        "source": f"VERIFIED players/nfl + stats/nfl/regular/{season} (season and weekly)"
+                    }, indent=2)
+                )]
+            )
+        
         else:
             return CallToolResult(
                 content=[TextContent(
@@ -783,21 +866,26 @@ async def main():
     logger.info("NFL Starting STREAMLINED Sleeper MCP Server...")
     logger.info(f"LIST Legion League ID: {LEGION_LEAGUE_ID}")
     logger.info("PASS Using VERIFIED Sleeper API endpoints")
+    configure_session_from_settings(load_settings())
+    logger.info(f"Pooled Sleeper session: {get_session_config()}")
     
     # Run the server using stdio
-    async with stdio_server() as (read_stream, write_stream):
-        await server.run(
-            read_stream,
-            write_stream,
-            InitializationOptions(
-                server_name="sleeper-server",
-                server_version="2.0.0",
-                capabilities=server.get_capabilities(
-                    notification_options=None,
-                    experimental_capabilities=None,
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await server.run(
+                read_stream,
+                write_stream,
+                InitializationOptions(
+                    server_name="sleeper-server",
+                    server_version="2.0.0",
+                    capabilities=server.get_capabilities(
+                        notification_options=None,
+                        experimental_capabilities=None,
+                    ),
                 ),
-            ),
-        )
+            )
+    finally:
+        close_session()
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+SLEEPER REQUEST BENCHMARK
+Compares cold (new connection per call) and pooled keep-alive latency across a full league run,
+sequential vs bounded-concurrency wall time for the pipeline fetch, full vs streamed
+players/nfl parsing, and wall time of the calculators on synthetic leagues against budgets
+"""
+
+import sys
+import json
+import time
+import random
+import tracemalloc
+import statistics
+import logging
+from pathlib import Path
+from typing import Dict, List, Callable, Optional, Tuple
+
+import requests
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.sleeper_client import (
+    SLEEPER_BASE_URL, DEFAULT_TIMEOUT, DEFAULT_MAX_CONCURRENT,
+    configure_session, ensure_pool_size, get_session, close_session, fetch_many
+)
+from src.utils import make_sleeper_request
+from src.player_stream import PLAYERS_ENDPOINT, CHUNK_SIZE, iter_object_items
+from src.season_simulator import SeasonSimulator
+from src.niv import NIVEngine
+from src.models import Team, Player, PlayerStats, Position
+from src.lineup_optimizer import LineupSolver
+from scripts.synthetic import round_robin, universe, weekly_payloads, random_team
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+def league_run_endpoints(league_id: str, num_teams: int = 12, weeks: int = 8,
+                         include_players: bool = False) -> List[str]:
+    """Endpoints requested by one RealCPRPipeline run (in call order, duplicates included)"""
+    endpoints = [f"league/{league_id}", f"league/{league_id}/rosters", f"league/{league_id}/users"]
+    if include_players:
+        endpoints.append("players/nfl")
+
+    endpoints.append(f"league/{league_id}/drafts")
+    matchup_sweep = [f"league/{league_id}/matchups/{week}" for week in range(1, weeks + 1)]
+
+    # Per team: total points, SMI, Alvarado and Zion each sweep the weekly matchups
+    for _ in range(num_teams):
+        for _ in range(4):
+            endpoints.extend(matchup_sweep)
+    return endpoints
+
+def _cold_get(url: str) -> requests.Response:
+    """One request on a fresh connection (no pooling, no keep-alive)"""
+    return requests.get(url, timeout=DEFAULT_TIMEOUT, headers={'Connection': 'close'})
+
+def _pooled_get(url: str) -> requests.Response:
+    """One request on the shared pooled keep-alive session"""
+    return get_session().get(url, timeout=DEFAULT_TIMEOUT)
+
+def time_requests(endpoints: List[str], fetch: Callable[[str], requests.Response]) -> List[float]:
+    """Time each endpoint request in milliseconds"""
+    latencies = []
+    for endpoint in endpoints:
+        start = time.perf_counter()
+        try:
+            fetch(f"{SLEEPER_BASE_URL}/{endpoint}").content
+        except requests.exceptions.RequestException as e:
+            logger.warning(f"Request failed: {endpoint} - {e}")
+            continue
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+def summarize(latencies: List[float]) -> Dict[str, float]:
+    """Summarize a latency sample"""
+    if not latencies:
+        return {'requests': 0, 'total_ms': 0.0, 'mean_ms': 0.0, 'median_ms': 0.0, 'p95_ms': 0.0}
+
+    ordered = sorted(latencies)
+    return {
+        'requests': len(latencies),
+        'total_ms': sum(latencies),
+        'mean_ms': statistics.mean(latencies),
+        'median_ms': statistics.median(latencies),
+        'p95_ms': ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+    }
+
+def run_session_benchmark(league_id: str, num_teams: int = 12, weeks: int = 8,
+                          include_players: bool = False,
+                          pool_size: Optional[int] = None) -> Dict[str, Dict[str, float]]:
+    """Run the league endpoint sweep cold and pooled, and report both"""
+    endpoints = league_run_endpoints(league_id, num_teams, weeks, include_players)
+
+    if pool_size:
+        configure_session(pool_size=pool_size)
+    close_session()
+
+    cold = summarize(time_requests(endpoints, _cold_get))
+    pooled = summarize(time_requests(endpoints, _pooled_get))
+    close_session()
+
+    return {'cold': cold, 'pooled': pooled}
+
+def pipeline_fetch_endpoints(league_id: str) -> List[str]:
+    """Endpoints requested by RealCPRPipeline.fetch_data"""
+    return [
+        "players/nfl",
+        *(f"stats/nfl/regular/{year}" for year in range(2019, 2026)),
+        f"league/{league_id}",
+        f"league/{league_id}/rosters",
+        f"league/{league_id}/users"
+    ]
+
+def run_fetch_benchmark(league_id: str, max_concurrent: int = DEFAULT_MAX_CONCURRENT) -> Dict[str, Dict[str, float]]:
+    """Compare sequential and bounded-concurrency wall time for the pipeline fetch"""
+    endpoints = pipeline_fetch_endpoints(league_id)
+    ensure_pool_size(max_concurrent)
+
+    start = time.perf_counter()
+    for endpoint in endpoints:
+        make_sleeper_request(endpoint)
+    sequential_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    fetch_many(endpoints, max_concurrent)
+    concurrent_ms = (time.perf_counter() - start) * 1000
+
+    return {
+        'sequential': {'requests': len(endpoints), 'total_ms': sequential_ms},
+        f'concurrent_{max_concurrent}': {'requests': len(endpoints), 'total_ms': concurrent_ms}
+    }
+
+def _measure(fn: Callable[[], object]) -> Dict[str, float]:
+    """Wall time and peak traced memory of one call"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'players': len(result), 'parse_ms': elapsed_ms, 'peak_mb': peak / (1024 * 1024)}
+
+def run_players_benchmark(league_id: str) -> Dict[str, Dict[str, float]]:
+    """Compare full decode vs streaming filtered decode of players/nfl"""
+    payload = get_session().get(f"{SLEEPER_BASE_URL}/{PLAYERS_ENDPOINT}", timeout=DEFAULT_TIMEOUT).content
+    rosters = make_sleeper_request(f"league/{league_id}/rosters") or []
+    wanted = {pid for roster in rosters for pid in roster.get('players') or []}
+
+    def full_decode():
+        players_db = json.loads(payload)
+        return {pid: data for pid, data in players_db.items() if pid in wanted}
+
+    def streamed():
+        chunks = (payload[i:i + CHUNK_SIZE] for i in range(0, len(payload), CHUNK_SIZE))
+        return dict(iter_object_items(chunks, wanted))
+
+    return {'full': _measure(full_decode), 'streamed': _measure(streamed)}
+
+def _elapsed(fn: Callable[[], object]) -> float:
+    """Wall time of one call in seconds"""
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+def bench_season_simulator() -> float:
+    """50k simulated seasons of a 12-team league with 8 of 14 weeks played"""
+    matchups = round_robin(12, 14)
+    for week in range(9, 15):
+        for entry in matchups[week]:
+            entry['points'] = 0.0
+    simulator = SeasonSimulator(matchups)
+    return _elapsed(lambda: simulator.simulate(50000, seed=3))
+
+def bench_universe_niv() -> float:
+    """NIV for a ~11k-player players/nfl universe from season totals"""
+    players_db, season_stats = universe(11000)
+    engine = NIVEngine({}, "benchmark")
+    return _elapsed(lambda: engine.calculate_universe_niv(season_stats, players_db=players_db))
+
+def bench_league_niv() -> float:
+    """League NIV ranking with ~11k rostered players"""
+    rng = random.Random(11)
+    positions = [Position.QB, Position.RB, Position.WR, Position.TE, Position.K, Position.DEF]
+    players = {f"p{i}": Player(player_id=f"p{i}", name=f"Player {i}", position=rng.choice(positions), team="FA",
+                               stats={2025: PlayerStats(season=2025, games_played=rng.randint(0, 17),
+                                                        fantasy_points=round(rng.uniform(0, 300), 1))})
+               for i in range(11000)}
+    teams = [Team(team_id="1", team_name="All", owner_name="", roster=list(players))]
+    engine = NIVEngine({}, "benchmark")
+    return _elapsed(lambda: engine.calculate_league_niv(teams, players))
+
+def bench_weekly_niv() -> float:
+    """Universe NIV for ~11k players with a 17-week season of weekly payloads"""
+    players_db, season_stats = universe(11000)
+    weekly = weekly_payloads(season_stats, 17)
+    engine = NIVEngine({}, "benchmark")
+    return _elapsed(lambda: engine.calculate_universe_niv(season_stats, players_db=players_db, weekly_stats=weekly))
+
+def bench_lineup_solver() -> float:
+    """2000 Legion optimal lineups for a 20-player roster"""
+    solver = LineupSolver()
+    _, points, positions = random_team(20, 1, seed=10)
+    eligibility = solver.eligibility(positions)
+
+    def solve_all():
+        for _ in range(2000):
+            solver.lineup_points(points, eligibility)
+    return _elapsed(solve_all)
+
+# name -> (timed case, wall-time budget in seconds); cases build their inputs untimed
+COMPUTE_CASES: Dict[str, Tuple[Callable[[], float], float]] = {
+    'season_simulator_50k': (bench_season_simulator, 5.0),
+    'universe_niv_11k': (bench_universe_niv, 1.0),
+    'league_niv_11k': (bench_league_niv, 10.0),
+    'weekly_niv_11k': (bench_weekly_niv, 1.0),
+    'lineup_solver_2k': (bench_lineup_solver, 1.0),
+}
+
+def run_compute_benchmark(cases: List[str] = None) -> Dict[str, Dict[str, float]]:
+    """Time each calculator case on synthetic data (no network) against its budget"""
+    results = {}
+    for name in cases or COMPUTE_CASES:
+        case, budget = COMPUTE_CASES[name]
+        elapsed = case()
+        results[name] = {'wall_ms': elapsed * 1000, 'budget_ms': budget * 1000, 'within_budget': elapsed < budget}
+    return results
+
+def _print_compute_report(results: Dict[str, Dict[str, float]]) -> None:
+    """Print a wall time vs budget table"""
+    print("\n" + "=" * 60)
+    print("COMPUTE BENCHMARK (synthetic leagues)")
+    print("=" * 60)
+    print(f"{'case':<28}{'wall ms':>10}{'budget ms':>11}  status")
+    for name, stats in results.items():
+        status = 'ok' if stats['within_budget'] else 'OVER'
+        print(f"{name:<28}{stats['wall_ms']:>10.1f}{stats['budget_ms']:>11.0f}  {status}")
+    print("=" * 60)
+
+def _print_players_report(results: Dict[str, Dict[str, float]]) -> None:
+    """Print a full vs streamed players/nfl parse table"""
+    print("\n" + "=" * 60)
+    print("PLAYERS/NFL PARSE BENCHMARK (full vs streamed)")
+    print("=" * 60)
+    print(f"{'mode':<12}{'players':>10}{'parse ms':>12}{'peak MB':>10}")
+    for mode, stats in results.items():
+        print(f"{mode:<12}{stats['players']:>10}{stats['parse_ms']:>12.1f}{stats['peak_mb']:>10.1f}")
+    print("=" * 60)
+
+def _print_fetch_report(results: Dict[str, Dict[str, float]]) -> None:
+    """Print a sequential vs concurrent wall time table"""
+    print("\n" + "=" * 60)
+    print("PIPELINE FETCH BENCHMARK (sequential vs concurrent)")
+    print("=" * 60)
+    print(f"{'mode':<16}{'requests':>10}{'wall ms':>12}")
+    for mode, stats in results.items():
+        print(f"{mode:<16}{stats['requests']:>10}{stats['total_ms']:>12.1f}")
+
+    walls = [stats['total_ms'] for stats in results.values()]
+    if walls[-1] > 0:
+        print(f"\nSpeedup: {walls[0] / walls[-1]:.2f}x")
+    print("=" * 60)
+
+def _print_report(results: Dict[str, Dict[str, float]]) -> None:
+    """Print a cold vs pooled comparison table"""
+    print("\n" + "=" * 60)
+    print("SLEEPER SESSION BENCHMARK (cold vs pooled)")
+    print("=" * 60)
+    print(f"{'mode':<10}{'requests':>10}{'total ms':>12}{'mean ms':>10}{'median ms':>11}{'p95 ms':>9}")
+    for mode, stats in results.items():
+        print(f"{mode:<10}{stats['requests']:>10}{stats['total_ms']:>12.1f}{stats['mean_ms']:>10.1f}"
+              f"{stats['median_ms']:>11.1f}{stats['p95_ms']:>9.1f}")
+
+    cold_total = results['cold']['total_ms']
+    pooled_total = results['pooled']['total_ms']
+    if pooled_total > 0:
+        print(f"\nSpeedup: {cold_total / pooled_total:.2f}x")
+    print("=" * 60)
+
+def main():
+    """Main entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Sleeper request benchmarks')
+    parser.add_argument('--suite', choices=['session', 'fetch', 'players', 'compute'], default='session',
+                       help='session: cold vs pooled; fetch: sequential vs concurrent pipeline fetch; '
+                            'players: full vs streamed players/nfl parse; '
+                            'compute: calculator wall time vs budget (exits 1 when over)')
+    parser.add_argument('--league-id', default='1267325171853701120',
+                       help='Sleeper league ID')
+    parser.add_argument('--teams', type=int, default=12,
+                       help='Number of teams in the league run')
+    parser.add_argument('--weeks', type=int, default=8,
+                       help='Number of matchup weeks in the league run')
+    parser.add_argument('--include-players', action='store_true',
+                       help='Include the players/nfl payload in the sweep')
+    parser.add_argument('--pool-size', type=int,
+                       help='Pooled connections per host')
+    parser.add_argument('--max-concurrent', type=int, default=DEFAULT_MAX_CONCURRENT,
+                       help='Concurrent requests for the fetch suite')
+    parser.add_argument('--case', action='append', choices=list(COMPUTE_CASES),
+                       help='Compute case to run (repeatable; default: all)')
+
+    args = parser.parse_args()
+
+    if args.suite == 'fetch':
+        _print_fetch_report(run_fetch_benchmark(args.league_id, args.max_concurrent))
+    elif args.suite == 'players':
+        _print_players_report(run_players_benchmark(args.league_id))
+    elif args.suite == 'compute':
+        results = run_compute_benchmark(args.case)
+        _print_compute_report(results)
+        if not all(stats['within_budget'] for stats in results.values()):
+            sys.exit(1)
+    else:
+        results = run_session_benchmark(args.league_id, args.teams, args.weeks,
+                                        args.include_players, args.pool_size)
+        _print_report(results)
+
+if __name__ == "__main__":
+    main()
@@ -20,6 +20,7 @@ from database import Database
 from cpr import CPREngine
 from models import LeagueInfo, Team, Player, PlayerStats, CPRMetrics
 from team_extraction import LegionTeamExtractor
+from cassette import add_cassette_arguments, configure_cassette_from_args
 
 # Configure logging
 logging.basicConfig(
@@ -191,18 +192,26 @@ async def main():
     parser.add_argument("--output", help="Output file for JSON results")
     parser.add_argument("--verbose", "-v", action="store_true",
                        help="Verbose logging")
+    add_cassette_arguments(parser)
     
     args = parser.parse_args()
     
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
     
+    cassette = configure_cassette_from_args(args)
+    
     # Initialize REAL calculator
     calculator = RealCalculationEngine(args.league_id)
     
     # Calculate REAL CPR metrics
     results = await calculator.calculate_all_metrics(args.week)
     
+    if cassette is not None:
+        if cassette.recording:
+            cassette.save()
+        logger.info(f"Sleeper cassette: {cassette.stats()}")
+    
     # Save to database if requested
     if args.save:
         await calculator.save_to_database(results)
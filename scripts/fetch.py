@@ -13,6 +13,7 @@ sys.path.append(str(Path(__file__).parent.parent / "src"))
 from api import SleeperAPI
 from database import Database
 from models import LeagueInfo, Team, Player, PlayerStats, Matchup, Transaction, LeagueAnalysis
+from league_sync import LeagueSync
 
 # Configure logging
 logging.basicConfig(
@@ -132,9 +133,28 @@ async def main():
     parser.add_argument("--save", action="store_true", 
                        help="Save data to database")
     parser.add_argument("--output", help="Output file for JSON data")
+    parser.add_argument("--incremental", action="store_true",
+                       help="Only sync what changed since the last run (rosters, open weeks, new transactions)")
+    parser.add_argument("--full-sync", action="store_true",
+                       help="With --incremental, rebuild the persisted league state from scratch")
     
     args = parser.parse_args()
     
+    if args.incremental:
+        sync = LeagueSync(args.league_id)
+        summary = sync.sync(full=args.full_sync)
+        
+        print("\nINCREMENTAL SYNC SUMMARY")
+        print("=" * 40)
+        print(f"Mode: {summary['mode']}")
+        print(f"Requests: {summary['requests']}")
+        print(f"Weeks refreshed: {summary['weeks']}")
+        print(f"Transaction legs: {summary['legs']}")
+        print(f"Changed rosters: {summary['changed_rosters'] or 'none'}")
+        print(f"New transactions: {summary['new_transactions']}")
+        print(f"State: {sync.path}")
+        return
+    
     # Initialize fetcher
     fetcher = DataFetcher(args.league_id)
     
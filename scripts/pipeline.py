@@ -9,8 +9,10 @@ import sys
 import os
 from pathlib import Path
 from datetime import datetime
+import time
 import logging
 import json
+from concurrent.futures import ThreadPoolExecutor
 
 # Add src directory to path
 sys.path.append(str(Path(__file__).parent.parent))
@@ -18,8 +20,22 @@ sys.path.append(str(Path(__file__).parent.parent))
 from src.cpr import CPREngine
 from src.niv import NIVEngine
 from src.database import Database, LocalDatabase
-from src.utils import make_sleeper_request
-from src.models import Player, PlayerStats, Team, LeagueAnalysis, Position
+from src.utils import load_settings
+from src.sleeper_client import (
+    configure_session, configure_session_from_settings, configure_rate_limit_from_settings, ensure_pool_size,
+    fetch_many, get_max_concurrent, get_request_metrics
+)
+from src.response_cache import configure_response_cache, configure_response_cache_from_settings, get_response_cache
+from src.immutable_store import configure_immutable_store, configure_immutable_store_from_settings, get_immutable_store
+from src.player_stream import stream_players
+from src.league_sync import LeagueSync
+from src.points_matrix import PointsMatrixStore
+from src.matchup_store import season_weeks
+from src.season_simulator import SeasonSimulator, DEFAULT_SIMULATIONS
+from src.league_context import current_nfl_week
+from src.player_snapshot import load_players, DEFAULT_MAX_AGE
+from src.cassette import add_cassette_arguments, configure_cassette_from_args, get_cassette
+from src.models import Player, PlayerStats, Team, LeagueAnalysis, position_from_sleeper
 
 # Configure logging
 logging.basicConfig(
@@ -28,74 +44,150 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def _map_position(pos_str: str) -> Position:
-    if not pos_str: return Position.FLEX
-    pos_upper = pos_str.upper()
-    if pos_upper in Position.__members__:
-        return Position[pos_upper]
-    # Handle defensive positions
-    if pos_upper in ["DL", "DE", "DT", "LB", "OLB", "ILB", "DB", "CB", "S"]:
-        return Position.IDP
-    if pos_upper == "DST":
-        return Position.DEF
-    return Position.FLEX # Fallback
+STATS_ENDPOINTS = {str(year): f"stats/nfl/regular/{year}" for year in range(2019, 2026)}
+
+def rostered_player_ids(rosters: list) -> set:
+    """Every player ID on a roster (including reserve and taxi slots)"""
+    player_ids = set()
+    for roster in rosters:
+        for slot in ('players', 'starters', 'reserve', 'taxi'):
+            player_ids.update(pid for pid in roster.get(slot) or [] if pid and pid != '0')
+    return player_ids
+
+def build_players(players_db: dict, historical_stats: dict) -> dict:
+    """Player objects from players/nfl records and per-season stats payloads"""
+    players = {}
+    for player_id, player_data in players_db.items():
+        stats = {}
+        for year, year_stats in historical_stats.items():
+            if player_id in year_stats:
+                player_year_stats = year_stats[player_id]
+                stats[int(year)] = PlayerStats(
+                    season=int(year),
+                    games_played=player_year_stats.get('gp', 0),
+                    passing_yards=player_year_stats.get('pass_yd', 0),
+                    passing_tds=player_year_stats.get('pass_td', 0),
+                    passing_ints=player_year_stats.get('pass_int', 0),
+                    rushing_yards=player_year_stats.get('rush_yd', 0),
+                    rushing_tds=player_year_stats.get('rush_td', 0),
+                    receptions=player_year_stats.get('rec', 0),
+                    receiving_yards=player_year_stats.get('rec_yd', 0),
+                    receiving_tds=player_year_stats.get('rec_td', 0),
+                    targets=player_year_stats.get('rec_tgt', 0),
+                    fumbles=player_year_stats.get('fum_lost', 0),
+                    fantasy_points=player_year_stats.get('pts_ppr', 0.0)
+                )
+        players[player_id] = Player(
+            player_id=player_id,
+            name=player_data.get('full_name', f"{player_data.get('first_name', '')} {player_data.get('last_name', '')}".strip()),
+            position=position_from_sleeper(player_data.get('position')),
+            team=player_data.get('team', 'FA'),
+            stats=stats
+        )
+    return players
 
 class RealCPRPipeline:
     """REAL CPR-NFL data processing pipeline based on the official guide"""
 
-    def __init__(self, league_id: str, use_local_db: bool = False):
+    def __init__(self, league_id: str, use_local_db: bool = False, config: dict = None,
+                 incremental: bool = False, full_sync: bool = False):
         self.league_id = league_id
-        self.cpr_engine = CPREngine({}, league_id)
-        self.niv_engine = NIVEngine({}, league_id)
+        self.incremental = incremental
+        self.full_sync = full_sync
+        self.config = config if config is not None else load_settings()
+        self.max_concurrent = get_max_concurrent(self.config)
+        configure_session_from_settings(self.config)
+        ensure_pool_size(self.max_concurrent)
+        sleeper_config = self.config.get('data_sources', {}).get('sleeper', {})
+        self.players_filter = sleeper_config.get('players_filter', 'rostered')
+        self.use_player_snapshot = sleeper_config.get('player_snapshot', True)
+        self.player_snapshot_max_age = sleeper_config.get('player_snapshot_max_age', DEFAULT_MAX_AGE)
+        configure_rate_limit_from_settings(self.config)
+        configure_response_cache_from_settings(self.config)
+        configure_immutable_store_from_settings(self.config)
+        self.cpr_engine = CPREngine(self.config, league_id)
+        if sleeper_config.get('points_matrix_cache', True):
+            self.cpr_engine.points_store = PointsMatrixStore(league_id)
+        self.niv_engine = NIVEngine(self.config, league_id)
+        self.season_simulations = int(self.config.get('performance', {}).get('season_simulations', DEFAULT_SIMULATIONS))
         self.db = LocalDatabase() if use_local_db else Database()
         logger.info(f"REAL CPR Pipeline initialized for league: {league_id}")
 
-    def fetch_data(self) -> dict:
-        """Fetch all required data from Sleeper API according to the guide"""
-        logger.info("Fetching all league data...")
-        players_db = make_sleeper_request("players/nfl")
-        historical_stats = {str(year): make_sleeper_request(f"stats/nfl/regular/{year}") for year in range(2019, 2026)}
-        league_info = make_sleeper_request(f"league/{self.league_id}")
-        rosters = make_sleeper_request(f"league/{self.league_id}/rosters")
-        users = make_sleeper_request(f"league/{self.league_id}/users")
-        return {
-            "players_db": players_db,
-            "historical_stats": historical_stats,
-            "league_info": league_info,
-            "rosters": rosters,
-            "users": users
-        }
+    def league_endpoints(self) -> list:
+        """League endpoints fetched up front (none when syncing incrementally)"""
+        return [] if self.incremental else [
+            f"league/{self.league_id}",
+            f"league/{self.league_id}/rosters",
+            f"league/{self.league_id}/users"
+        ]
+
+    def fetch_league_data(self, responses: dict = None) -> dict:
+        """League settings, rosters, users and (incremental) matchups for this league
+
+        `responses` holds already-fetched league endpoints; missing ones are fetched here.
+        """
+        matchups = None
+        if self.incremental:
+            # Only rosters, open weeks and new transactions are fetched; the rest is persisted
+            sync = LeagueSync(self.league_id, max_concurrent=self.max_concurrent)
+            sync.sync(full=self.full_sync)
+            league_info = sync.state['league']
+            rosters = sync.state['rosters']
+            users = sync.state['users']
+            matchups = sync.matchups()
+        else:
+            responses = dict(responses or {})
+            missing = [endpoint for endpoint in self.league_endpoints() if endpoint not in responses]
+            if missing:
+                responses.update(fetch_many(missing, self.max_concurrent))
+            league_info = responses[f"league/{self.league_id}"]
+            rosters = responses[f"league/{self.league_id}/rosters"]
+            users = responses[f"league/{self.league_id}/users"]
+        
+        return {"league_info": league_info, "rosters": rosters, "users": users, "matchups": matchups}
+
+    def fetch_shared_data(self, player_ids: set = None, responses: dict = None) -> dict:
+        """Global data every league reads: historical stats and players/nfl
+
+        `player_ids` limits the players loaded (None loads every player).
+        """
+        responses = dict(responses or {})
+        missing = [endpoint for endpoint in STATS_ENDPOINTS.values() if endpoint not in responses]
+        if missing:
+            responses.update(fetch_many(missing, self.max_concurrent))
+        historical_stats = {year: responses[endpoint] for year, endpoint in STATS_ENDPOINTS.items()}
+        
+        if self.use_player_snapshot:
+            players_db = load_players(player_ids, max_age=self.player_snapshot_max_age)
+        else:
+            players_db = stream_players(player_ids)
+        logger.info(f"Loaded {len(players_db)} players from players/nfl")
+        
+        return {"players_db": players_db, "historical_stats": historical_stats}
+
+    def fetch_data(self, player_ids: list = None) -> dict:
+        """Fetch all required data from Sleeper API according to the guide
+        
+        Players come from the daily player snapshot (or a filtered players/nfl stream),
+        limited to rostered players (or `player_ids`) unless players_filter is "all".
+        """
+        logger.info(f"Fetching all league data (max {self.max_concurrent} concurrent requests)...")
+        responses = fetch_many([*STATS_ENDPOINTS.values(), *self.league_endpoints()], self.max_concurrent)
+        league_data = self.fetch_league_data(responses)
+        
+        if player_ids is None and self.players_filter != 'all':
+            player_ids = rostered_player_ids(league_data['rosters'] or [])
+        
+        return {**self.fetch_shared_data(player_ids, responses), **league_data}
 
     def process_data(self, raw_data: dict) -> dict:
-        """Process raw data into structured Player and Team objects"""
-        players = {}
-        for player_id, player_data in raw_data['players_db'].items():
-            stats = {}
-            for year, year_stats in raw_data['historical_stats'].items():
-                if player_id in year_stats:
-                    player_year_stats = year_stats[player_id]
-                    stats[int(year)] = PlayerStats(
-                        season=int(year),
-                        games_played=player_year_stats.get('gp', 0),
-                        passing_yards=player_year_stats.get('pass_yd', 0),
-                        passing_tds=player_year_stats.get('pass_td', 0),
-                        passing_ints=player_year_stats.get('pass_int', 0),
-                        rushing_yards=player_year_stats.get('rush_yd', 0),
-                        rushing_tds=player_year_stats.get('rush_td', 0),
-                        receptions=player_year_stats.get('rec', 0),
-                        receiving_yards=player_year_stats.get('rec_yd', 0),
-                        receiving_tds=player_year_stats.get('rec_td', 0),
-                        targets=player_year_stats.get('rec_tgt', 0),
-                        fumbles=player_year_stats.get('fum_lost', 0),
-                        fantasy_points=player_year_stats.get('pts_ppr', 0.0)
-                    )
-            players[player_id] = Player(
-                player_id=player_id,
-                name=player_data.get('full_name', f"{player_data.get('first_name', '')} {player_data.get('last_name', '')}".strip()),
-                position=_map_position(player_data.get('position')),
-                team=player_data.get('team', 'FA'),
-                stats=stats
-            )
+        """Process raw data into structured Player and Team objects
+        
+        Player objects already built for a batch of leagues (raw_data['players']) are reused.
+        """
+        players = raw_data.get('players')
+        if players is None:
+            players = build_players(raw_data['players_db'], raw_data['historical_stats'])
 
         teams = []
         user_lookup = {user['user_id']: user for user in raw_data['users']}
@@ -114,15 +206,46 @@ class RealCPRPipeline:
                 fpts_against=roster.get('settings', {}).get('fpts_against', 0)
             ))
 
-        return {"players": players, "teams": teams, "league_info": raw_data['league_info']}
+        return {"players": players, "teams": teams, "league_info": raw_data['league_info'],
+                "matchups": raw_data.get('matchups'), "rosters": raw_data['rosters'],
+                "users": raw_data['users']}
 
     def calculate_cpr(self, processed_data: dict) -> dict:
         """Calculate CPR rankings using REAL algorithms"""
-        return self.cpr_engine.calculate_league_cpr(processed_data['teams'], processed_data['players'])
+        self.cpr_engine.set_roster_positions((processed_data.get('league_info') or {}).get('roster_positions'))
+        return self.cpr_engine.calculate_league_cpr(processed_data['teams'], processed_data['players'],
+                                                    processed_data.get('matchups'),
+                                                    processed_data.get('rosters'), processed_data.get('users'))
 
     def calculate_niv(self, processed_data: dict) -> dict:
         """Calculate NIV rankings using REAL algorithms"""
-        return self.niv_engine.calculate_league_niv(processed_data['teams'], processed_data['players'])
+        context = self.cpr_engine.context
+        if context is None:
+            return self.niv_engine.calculate_league_niv(processed_data['teams'], processed_data['players'])
+        return self.niv_engine.calculate_league_niv(processed_data['teams'], processed_data['players'],
+                                                    context.points_matrix, current_nfl_week())
+    
+    def simulate_season(self, processed_data: dict) -> dict:
+        """Playoff, bye and championship odds per roster from Monte Carlo seasons
+        
+        Simulated over the league's whole schedule (season_weeks), not just the weeks
+        CPR loaded, so the remaining regular season is actually played out; weeks from
+        the current NFL week on count as unplayed.
+        """
+        league_info = processed_data.get('league_info') or {}
+        weeks = season_weeks(league_info)
+        store = self.cpr_engine.matchup_store
+        store.load(weeks)
+        simulator = SeasonSimulator.from_league(league_info, store.get_all_matchups(weeks), current_nfl_week())
+        result = simulator.simulate(self.season_simulations)
+        logger.info(f"Season simulation: {result['simulations']} seasons, "
+                    f"{result['remaining_weeks']} regular-season weeks left from week {result['current_week']}")
+        return {
+            'simulations': result['simulations'],
+            'current_week': result['current_week'],
+            'remaining_weeks': result['remaining_weeks'],
+            'team_odds': SeasonSimulator.team_odds(result)
+        }
     
     def save_results(self, cpr_results: dict, niv_results: dict, league_data: dict) -> bool:
         """Save results to database"""
@@ -151,8 +274,8 @@ class RealCPRPipeline:
             logger.error(f"Failed to save results: {e}")
             return False
     
-    def generate_report(self, cpr_results: dict, processed_data: dict) -> str:
-        """Generate human-readable report with REAL algorithm insights"""
+    def generate_report(self, cpr_results: dict, processed_data: dict, season_odds: dict = None) -> str:
+        """Generate human-readable report with REAL algorithm insights (and playoff odds)"""
         logger.info("Generating CPR report...")
         
         try:
@@ -161,8 +284,8 @@ class RealCPRPipeline:
             
             report = f"""
 # REAL CPR-NFL Analysis Report
-**League**: {league_info.name}
-**Season**: {league_info.season}, Week {league_info.current_week}
+**League**: {league_info.get('name')}
+**Season**: {league_info.get('season')}, Week {(league_info.get('settings') or {}).get('leg')}
 **Generated**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 **Algorithm**: {cpr_results.get('algorithm_version', 'REAL_CPR_v1.0')}
 
@@ -178,14 +301,28 @@ class RealCPRPipeline:
             
             for i, team in enumerate(rankings[:5], 1):
                 report += f"""
-**{i}. {team['team_name']}** - CPR: {team['cpr']:.3f}
-   - Record: {team['wins']}-{team['losses']} | Tier: {team['cpr_tier']}
-   - SLI: {team['sli']:.3f} | BSI: {team['bsi']:.3f} | SMI: {team['smi']:.3f}
-   - **Ingram**: {team['ingram']:.3f} (positional balance)
-   - **Alvarado**: {team['alvarado']:.3f} (draft value efficiency)  
-   - **Zion**: {team['zion']:.3f} (4D strength of schedule)
+**{i}. {team.team_name}** - CPR: {team.cpr:.3f}
+   - Record: {team.wins}-{team.losses} | Tier: {team.cpr_tier}
+   - SLI: {team.sli:.3f} | BSI: {team.bsi:.3f} | SMI: {team.smi:.3f}
+   - **Ingram**: {team.ingram:.3f} (positional balance)
+   - **Alvarado**: {team.alvarado:.3f} (draft value efficiency)  
+   - **Zion**: {team.zion:.3f} (4D strength of schedule)
 """
             
+            if season_odds:
+                names = {int(team.team_id): team.team_name for team in processed_data['teams']}
+                odds = sorted(season_odds['team_odds'].items(),
+                              key=lambda item: item[1]['playoff_probability'], reverse=True)
+                report += (f"\n## Playoff Odds\n\n*{season_odds['simulations']} simulated seasons, "
+                           f"{season_odds['remaining_weeks']} regular-season weeks left*\n\n"
+                           "| Team | Exp. Wins | Playoffs | Bye | Final | Title |\n"
+                           "|---|---|---|---|---|---|\n")
+                for roster_id, team_odds in odds:
+                    report += (f"| {names.get(roster_id, f'Roster {roster_id}')} | {team_odds['expected_wins']:.1f} "
+                               f"| {team_odds['playoff_probability']:.1%} | {team_odds['bye_probability']:.1%} "
+                               f"| {team_odds['finals_probability']:.1%} "
+                               f"| {team_odds['championship_probability']:.1%} |\n")
+            
             # Add algorithm insights
             if cpr_results.get('insights'):
                 report += "\n## REAL Algorithm Insights\n"
@@ -202,14 +339,16 @@ class RealCPRPipeline:
             logger.error(f"Failed to generate report: {e}")
             return f"Report generation failed: {e}"
     
-    def run_pipeline(self) -> dict:
-        """Run complete REAL CPR pipeline"""
+    def run_pipeline(self, raw_data: dict = None) -> dict:
+        """Run complete REAL CPR pipeline (on `raw_data` when it was fetched by a batch)"""
         logger.info("Starting REAL CPR-NFL pipeline...")
         logger.info("Revolutionary algorithms: Ingram, Alvarado, Zion")
         
         try:
             # Step 1: Fetch data with Legion integration
-            raw_data = self.fetch_data()
+            standalone = raw_data is None
+            if standalone:
+                raw_data = self.fetch_data()
             processed_data = self.process_data(raw_data)
             
             # Step 2: Calculate REAL CPR
@@ -218,24 +357,36 @@ class RealCPRPipeline:
             # Step 3: Calculate REAL NIV
             niv_results = self.calculate_niv(processed_data)
             
-            # Step 4: Save results (pass raw objects, not serialized data)
+            # Step 4: Simulate the rest of the season for playoff odds
+            try:
+                season_odds = self.simulate_season(processed_data)
+            except Exception as e:
+                logger.warning(f"Season simulation failed: {e}")
+                season_odds = None
+            
+            # Step 5: Save results (pass raw objects, not serialized data)
             save_success = self.save_results(cpr_results, niv_results, processed_data)
             
-            # Step 4: Generate report
-            report = self.generate_report(cpr_results, processed_data)
+            # Step 6: Generate report
+            report = self.generate_report(cpr_results, processed_data, season_odds)
             
-            # Step 5: Save report locally
-            report_path = Path(__file__).parent.parent / "data" / f"real_cpr_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
+            # Step 7: Save report locally
+            report_path = Path(__file__).parent.parent / "data" / f"real_cpr_report_{self.league_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
             with open(report_path, 'w') as f:
                 f.write(report)
             
             logger.info("CPR Pipeline completed successfully.")
             logger.info(f"Report saved to: {report_path}")
             
+            # A batch logs the shared counters once for all its leagues
+            if standalone:
+                self.log_shared_stats()
+            
             return {
                 'success': True,
                 'cpr_results': cpr_results,
                 'niv_results': niv_results,
+                'season_odds': season_odds,
                 'league_data': processed_data,
                 'report': report,
                 'report_path': str(report_path),
@@ -250,6 +401,142 @@ class RealCPRPipeline:
                 'error': str(e),
                 'algorithm_version': 'REAL_CPR_v1.0'
             }
+    
+    def run_backfill(self) -> dict:
+        """Compute the season's week-by-week CPR history in one pass and save it as JSON"""
+        try:
+            processed_data = self.process_data(self.fetch_data())
+            self.cpr_engine.set_roster_positions((processed_data.get('league_info') or {}).get('roster_positions'))
+            backfill = self.cpr_engine.backfill_league_cpr(processed_data['teams'], processed_data['players'],
+                                                           processed_data.get('matchups'),
+                                                           processed_data.get('rosters'), processed_data.get('users'),
+                                                           league=processed_data.get('league_info'))
+            
+            history_path = Path(__file__).parent.parent / "data" / f"cpr_history_{self.league_id}.json"
+            with open(history_path, 'w') as f:
+                json.dump({'league_id': self.league_id, 'weeks': backfill['weeks'],
+                           'history': {str(week): rows for week, rows in backfill['history'].items()}}, f, indent=2)
+            logger.info(f"CPR history for {len(backfill['weeks'])} weeks saved to: {history_path}")
+            self.log_shared_stats()
+            
+            return {'success': True, 'backfill': backfill, 'history_path': str(history_path)}
+        
+        except Exception as e:
+            logger.error(f"CPR backfill failed: {e}")
+            return {'success': False, 'error': str(e)}
+    
+    @staticmethod
+    def log_shared_stats() -> None:
+        """Log cassette, request, response cache and immutable store counters"""
+        cassette = get_cassette()
+        if cassette is not None:
+            if cassette.recording:
+                cassette.save()
+            logger.info(f"Sleeper cassette: {cassette.stats()}")
+        
+        metrics = get_request_metrics()
+        logger.info(f"Sleeper requests: {metrics['requests']} sent, {metrics['retries']} retries, "
+                    f"{metrics['throttled_seconds']:.2f}s throttled, {metrics['backoff_seconds']:.2f}s backoff")
+        
+        cache = get_response_cache()
+        if cache is not None:
+            cache_stats = cache.stats()
+            logger.info(f"Response cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses "
+                        f"({cache_stats['hit_rate']:.0%}), {cache_stats['entries']} entries")
+        
+        store = get_immutable_store()
+        if store is not None:
+            store_stats = store.stats()
+            logger.info(f"Immutable store: {store_stats['hits']} hits, {store_stats['misses']} misses, "
+                        f"{store_stats['entries']} entries ({store_stats['bytes'] / 1024:.0f} KB)")
+
+class BatchCPRPipeline:
+    """CPR for many leagues in one run
+
+    Global data (historical stats, players/nfl) is fetched and turned into Player
+    objects once for every league; league endpoints are fetched together, and the
+    per-league pipelines (matchups, CPR, NIV, saves, reports) run concurrently.
+    """
+
+    def __init__(self, league_ids: list, use_local_db: bool = False, config: dict = None,
+                 incremental: bool = False, full_sync: bool = False, max_workers: int = None):
+        self.league_ids = list(dict.fromkeys(str(league_id) for league_id in league_ids))
+        self.config = config if config is not None else load_settings()
+        self.max_concurrent = get_max_concurrent(self.config)
+        performance = self.config.get('performance', {})
+        self.max_workers = max(1, int(max_workers or performance.get('max_concurrent_leagues', 4)))
+        self.pipelines = {league_id: RealCPRPipeline(league_id, use_local_db, self.config, incremental, full_sync)
+                          for league_id in self.league_ids}
+        # Leagues run concurrently, each with up to max_concurrent requests in flight
+        ensure_pool_size(self.max_concurrent * self.max_workers)
+
+    def fetch_data(self) -> dict:
+        """league_id -> raw data, with one copy of the global data shared by all leagues"""
+        pipelines = list(self.pipelines.values())
+        endpoints = [*STATS_ENDPOINTS.values()]
+        for pipeline in pipelines:
+            endpoints += pipeline.league_endpoints()
+        logger.info(f"Fetching shared data and {len(pipelines)} leagues "
+                    f"(max {self.max_concurrent} concurrent requests)...")
+        responses = fetch_many(endpoints, self.max_concurrent)
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            league_data = dict(zip(self.pipelines, executor.map(
+                lambda pipeline: pipeline.fetch_league_data(responses), pipelines)))
+        
+        # Every league's rostered players, loaded in one pass
+        player_ids = None
+        if any(pipeline.players_filter != 'all' for pipeline in pipelines):
+            player_ids = set()
+            for data in league_data.values():
+                player_ids |= rostered_player_ids(data['rosters'] or [])
+        shared = pipelines[0].fetch_shared_data(player_ids, responses)
+        shared['players'] = build_players(shared['players_db'], shared['historical_stats'])
+        
+        return {league_id: {**shared, **data} for league_id, data in league_data.items()}
+
+    def run(self) -> dict:
+        """Run every league; returns per-league results and throughput"""
+        start = time.perf_counter()
+        results = {}
+        try:
+            raw_data = self.fetch_data()
+        except Exception as e:
+            logger.error(f"Batch fetch failed: {e}")
+            raw_data = {}
+            results = {league_id: {'success': False, 'error': str(e), 'algorithm_version': 'REAL_CPR_v1.0'}
+                       for league_id in self.league_ids}
+        
+        if raw_data:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = {league_id: executor.submit(self.pipelines[league_id].run_pipeline, data)
+                           for league_id, data in raw_data.items()}
+                results = {league_id: future.result() for league_id, future in futures.items()}
+        
+        elapsed = time.perf_counter() - start
+        succeeded = sum(1 for result in results.values() if result.get('success'))
+        leagues_per_minute = succeeded / elapsed * 60.0 if elapsed > 0 else 0.0
+        logger.info(f"Batch complete: {succeeded}/{len(results)} leagues in {elapsed:.1f}s "
+                    f"({leagues_per_minute:.1f} leagues/min)")
+        RealCPRPipeline.log_shared_stats()
+        
+        return {
+            'results': results,
+            'succeeded': succeeded,
+            'failed': len(results) - succeeded,
+            'elapsed_seconds': elapsed,
+            'leagues_per_minute': leagues_per_minute
+        }
+
+def apply_pool_size(pool_size: int, in_flight: int) -> None:
+    """Apply --pool-size, never below the `in_flight` requests the run's concurrency needs
+
+    Called after the pipelines applied settings.yaml, so the flag wins over it.
+    """
+    if pool_size < in_flight:
+        logger.warning(f"--pool-size {pool_size} is below the {in_flight} concurrent requests "
+                       f"this run makes; using {in_flight}")
+    configure_session(pool_size=max(pool_size, in_flight))
 
 def main():
     """Main entry point"""
@@ -258,18 +545,67 @@ def main():
     parser = argparse.ArgumentParser(description='REAL CPR-NFL Data Pipeline')
     parser.add_argument('--league-id', default='1267325171853701120', 
                        help='Sleeper league ID')
+    parser.add_argument('--league-ids', nargs='+',
+                       help='Run several Sleeper leagues in one batch (shared global data)')
+    parser.add_argument('--backfill', action='store_true',
+                       help="Compute week-by-week CPR history for the season instead of today's rankings")
     parser.add_argument('--local-db', action='store_true',
                        help='Use local database instead of Firebase')
     parser.add_argument('--verbose', '-v', action='store_true',
                        help='Verbose logging')
+    parser.add_argument('--pool-size', type=int,
+                       help='Pooled keep-alive connections per host for Sleeper requests')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Bypass the on-disk Sleeper response cache, immutable store and points matrix')
+    parser.add_argument('--incremental', action='store_true',
+                       help='Sync league state incrementally (rosters, open weeks, new transactions)')
+    parser.add_argument('--full-sync', action='store_true',
+                       help='With --incremental, rebuild the persisted league state from scratch')
+    add_cassette_arguments(parser)
     
     args = parser.parse_args()
     
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
     
+    configure_cassette_from_args(args)
+    
+    if args.league_ids:
+        batch = BatchCPRPipeline(args.league_ids, args.local_db, incremental=args.incremental,
+                                 full_sync=args.full_sync)
+        if args.no_cache:
+            configure_response_cache(enabled=False)
+            configure_immutable_store(enabled=False)
+            for pipeline in batch.pipelines.values():
+                pipeline.cpr_engine.points_store = None
+        if args.pool_size:
+            apply_pool_size(args.pool_size, batch.max_concurrent * batch.max_workers)
+        summary = batch.run()
+        print(f"\nBatch: {summary['succeeded']} leagues succeeded, {summary['failed']} failed "
+              f"in {summary['elapsed_seconds']:.1f}s ({summary['leagues_per_minute']:.1f} leagues/min)")
+        for league_id, result in summary['results'].items():
+            print(f"  {league_id}: {result.get('report_path') if result['success'] else 'FAILED: ' + result['error']}")
+        sys.exit(0 if summary['failed'] == 0 else 1)
+    
     # Create REAL CPR pipeline
-    pipeline = RealCPRPipeline(args.league_id, args.local_db)
+    pipeline = RealCPRPipeline(args.league_id, args.local_db, incremental=args.incremental,
+                               full_sync=args.full_sync)
+    
+    if args.no_cache:
+        configure_response_cache(enabled=False)
+        configure_immutable_store(enabled=False)
+        pipeline.cpr_engine.points_store = None
+    
+    if args.pool_size:
+        apply_pool_size(args.pool_size, pipeline.max_concurrent)
+    
+    if args.backfill:
+        results = pipeline.run_backfill()
+        if results['success']:
+            print(f"\nCPR history ({len(results['backfill']['weeks'])} weeks): {results['history_path']}")
+            sys.exit(0)
+        print(f"\nCPR backfill failed: {results['error']}")
+        sys.exit(1)
     
     # Run pipeline
     results = pipeline.run_pipeline()
@@ -285,6 +621,14 @@ def main():
         print(f"Report: {results['report_path']}")
         print("="*60)
         
+        if results['season_odds']:
+            print(f"\nPLAYOFF ODDS ({results['season_odds']['simulations']} simulated seasons):")
+            names = {int(team.team_id): team.team_name for team in results['league_data']['teams']}
+            for roster_id, odds in sorted(results['season_odds']['team_odds'].items(),
+                                          key=lambda item: item[1]['playoff_probability'], reverse=True):
+                print(f"  {names.get(roster_id, roster_id)}: playoffs {odds['playoff_probability']:.1%}, "
+                      f"bye {odds['bye_probability']:.1%}, title {odds['championship_probability']:.1%}")
+        
         # Show top 3 teams with REAL algorithm breakdown
         print("\nTOP 3 REAL CPR RANKINGS:")
         for i, team in enumerate(results['cpr_results']['rankings'][:3], 1):
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+PLAYER SNAPSHOT REFRESH
+Daily job: rebuild the columnar players/nfl snapshot and report what changed
+(status, team and injury updates) since the previous snapshot
+"""
+
+import sys
+import logging
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.player_snapshot import refresh_snapshot, DEFAULT_SNAPSHOT_PATH, DEFAULT_MAX_AGE
+from src.cassette import add_cassette_arguments, configure_cassette_from_args
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+def _print_delta(delta: dict, limit: int) -> None:
+    """Print a snapshot delta summary and the first changed players"""
+    summary = delta['summary']
+    print("\n" + "=" * 60)
+    print("PLAYER SNAPSHOT DELTA")
+    print("=" * 60)
+    print(f"Added: {summary['added']} | Removed: {summary['removed']} | Changed: {summary['changed']}")
+    print(f"Status: {summary['status_changes']} | Team: {summary['team_changes']} | "
+          f"Injury: {summary['injury_status_changes']}")
+
+    for player_id, changes in list(delta['changed'].items())[:limit]:
+        details = ", ".join(f"{field}: {before} -> {after}" for field, (before, after) in changes.items())
+        print(f"  {player_id}: {details}")
+    print("=" * 60)
+
+def main():
+    """Main entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Refresh the players/nfl snapshot')
+    parser.add_argument('--path', default=DEFAULT_SNAPSHOT_PATH,
+                       help='Snapshot file')
+    parser.add_argument('--max-age', type=float, default=DEFAULT_MAX_AGE,
+                       help='Rebuild only when the snapshot is older than this many seconds')
+    parser.add_argument('--force', action='store_true',
+                       help='Rebuild even if the snapshot is fresh')
+    parser.add_argument('--show', type=int, default=25,
+                       help='Changed players to list')
+    add_cassette_arguments(parser)
+
+    args = parser.parse_args()
+    configure_cassette_from_args(args)
+
+    snapshot, delta = refresh_snapshot(args.path, args.max_age, args.force)
+    if snapshot is None:
+        logger.error("No player snapshot available")
+        sys.exit(1)
+
+    print(f"Snapshot: {len(snapshot)} players, {snapshot.age_seconds / 3600:.1f}h old ({args.path})")
+    if delta is not None:
+        _print_delta(delta, args.show)
+    elif snapshot.age_seconds > 60:
+        print("Snapshot is fresh; nothing to refresh")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+SYNTHETIC LEAGUE DATA
+Deterministic leagues, matchups, player universes and weekly payloads for benchmarks and tests
+"""
+
+import sys
+import random
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.models import Team, Player, PlayerStats, Position
+
+LEAGUE_POSITIONS = [Position.QB, Position.RB, Position.WR, Position.TE, Position.WR, Position.RB, Position.IDP]
+TEAM_POSITIONS = [Position.QB, Position.RB, Position.WR, Position.TE, Position.IDP]
+SLEEPER_POSITIONS = ["QB", "RB", "WR", "TE", "K", "DEF", "LB", "DB", None]
+
+def round_robin(num_teams: int, weeks: int, seed: int = 3):
+    """Weekly matchups from a rotating round-robin (repeat opponents after a cycle)"""
+    rng = random.Random(seed)
+    ids = list(range(1, num_teams + 1))
+    schedule = {}
+    for week in range(1, weeks + 1):
+        entries = []
+        for matchup_id, i in enumerate(range(num_teams // 2), 1):
+            for roster_id in (ids[i], ids[-1 - i]):
+                entries.append({
+                    'roster_id': roster_id,
+                    'matchup_id': matchup_id,
+                    'points': round(rng.uniform(70, 160), 2),
+                    'players_points': {f"p{roster_id}_{slot}": round(rng.uniform(0, 30), 2) for slot in range(7)}
+                })
+        schedule[week] = entries
+        ids = [ids[0]] + [ids[-1]] + ids[1:-1]
+    return schedule
+
+def league(num_teams: int, seed: int = 5):
+    """Teams and players with random positions, records and stats"""
+    rng = random.Random(seed)
+    teams = []
+    players = {}
+    for r in range(1, num_teams + 1):
+        roster = [f"p{r}_{slot}" for slot in range(12)]
+        for player_id in roster:
+            players[player_id] = Player(player_id=player_id, name=player_id, position=rng.choice(LEAGUE_POSITIONS),
+                                        team="FA", stats={2025: PlayerStats(season=2025, games_played=8,
+                                                                            fantasy_points=rng.uniform(0, 200))})
+        wins = rng.randint(0, 8)
+        teams.append(Team(team_id=str(r), team_name=f"Team {r}", owner_name="", wins=wins, losses=8 - wins,
+                          roster=roster, starters=roster[:7]))
+    return teams, players
+
+def universe(count: int, seed: int = 13):
+    """Raw players/nfl records and a matching stats/nfl/regular payload"""
+    rng = random.Random(seed)
+    players_db = {}
+    season_stats = {}
+    for i in range(count):
+        player_id = str(1000 + i)
+        players_db[player_id] = {"full_name": f"Player {i}", "position": rng.choice(SLEEPER_POSITIONS)}
+        if rng.random() > 0.4:
+            season_stats[player_id] = {"gp": rng.randint(0, 17), "pts_ppr": round(rng.uniform(-2, 320), 1)}
+    return players_db, season_stats
+
+def weekly_payloads(season_stats, weeks: int, seed: int = 17):
+    """stats/nfl/regular/<season>/<week> payloads for the players in a season payload"""
+    rng = np.random.default_rng(seed)
+    payloads = {}
+    for week in range(1, weeks + 1):
+        payloads[week] = {player_id: {"gp": 1, "pts_ppr": round(float(rng.gamma(2.0, 6.0)), 2)}
+                          for player_id in season_stats if rng.random() > 0.2}
+    return payloads
+
+def random_team(num_players: int, weeks: int, seed: int):
+    """Player IDs, players x weeks points and cycling positions for one team"""
+    rng = np.random.default_rng(seed)
+    positions = [TEAM_POSITIONS[i % len(TEAM_POSITIONS)] for i in range(num_players)]
+    points = rng.gamma(2.0, 6.0, size=(num_players, weeks))
+    return [f"p{i}" for i in range(num_players)], points, positions
@@ -13,19 +13,42 @@ import logging
 try:
     from .models import Team, Player, Position
     from .utils import make_sleeper_request, calculate_z_score
+    from .matchup_store import MatchupStore
+    from .league_context import LeagueContext
+    from .shapley import team_shapley, league_shapley
+    from .lineup_optimizer import LEGION_SLOTS
 except ImportError:
     from models import Team, Player, Position
     from utils import make_sleeper_request, calculate_z_score
+    from matchup_store import MatchupStore
+    from league_context import LeagueContext
+    from shapley import team_shapley, league_shapley
+    from lineup_optimizer import LEGION_SLOTS
 
 logger = logging.getLogger(__name__)
 
 class AlvaradoCalculator:
     """Calculate Alvarado Index using Shapley Value + ADP methodology"""
     
-    def __init__(self, league_id: str = "1267325171853701120"):
+    def __init__(self, league_id: str = "1267325171853701120", matchup_store: MatchupStore = None):
         self.league_id = league_id
+        self.matchup_store = matchup_store or MatchupStore(league_id)
         self.draft_data = None
         self.adp_cache = {}
+        self.context: Optional[LeagueContext] = None
+        self.workers = 1
+        self.lineup_slots: Tuple[str, ...] = LEGION_SLOTS
+        self._shapley: Dict[Tuple, Dict[str, Any]] = {}
+        self._shapley_source = None
+    
+    def bind_context(self, context: LeagueContext) -> None:
+        """Read draft picks and matchups from a shared league context instead of fetching"""
+        self.context = context
+        self.draft_data = {
+            'draft_id': context.draft_id,
+            'picks': list(context.draft_picks),
+            'adp_mapping': context.adp_mapping
+        }
         
     def _fetch_draft_data(self) -> Dict[str, Any]:
         """Fetch draft data from Sleeper API"""
@@ -91,68 +114,89 @@ class AlvaradoCalculator:
             # Undrafted player (waiver pickup) = cheapest possible
             return 0.0
     
+    def _shapley_inputs(self, team: Team, weekly_matchups: Dict[int, Dict[int, Any]]) -> Tuple:
+        """(player_ids, players x weeks points, positions) for a team's Shapley game
+
+        Weeks the team didn't score in (unplayed or missing) are left out. Points come from
+        the bound context's points matrix, positions from its players; without positions
+        every player can fill every slot.
+        """
+        roster_id = int(team.team_id)
+        player_ids = list(dict.fromkeys(team.roster))
+        weeks = [week for week in sorted(weekly_matchups)
+                 if ((weekly_matchups[week].get(roster_id) or {}).get('points') or 0.0) > 0]
+        
+        if self.context is not None and weekly_matchups is self.context.weekly:
+            points = self.context.points_matrix.take(player_ids, weeks, roster_id)
+        else:
+            entries = [weekly_matchups[week][roster_id].get('players_points') or {} for week in weeks]
+            points = np.array([[entry.get(player_id, 0.0) or 0.0 for entry in entries] for player_id in player_ids],
+                              dtype=np.float64).reshape(len(player_ids), len(weeks))
+        players = self.context.players if self.context is not None else None
+        positions = None
+        if players is not None:
+            positions = [players[p].position if p in players else Position.FLEX for p in player_ids]
+        return player_ids, points, positions
+    
+    def _team_shapley(self, team: Team, weekly_matchups: Dict[int, Dict[int, Any]]) -> Dict[str, Any]:
+        """Lineup Shapley values for a team, memoized per roster and slots for the current matchups"""
+        if self._shapley_source is not weekly_matchups:
+            self._shapley = {}
+            self._shapley_source = weekly_matchups
+        
+        key = (int(team.team_id), tuple(team.roster), self.lineup_slots)
+        if key not in self._shapley:
+            player_ids, points, positions = self._shapley_inputs(team, weekly_matchups)
+            self._shapley[key] = team_shapley(player_ids, points, positions, self.lineup_slots, seed=key[0])
+        return self._shapley[key]
+    
+    def _prime_shapley(self, teams: List[Team], weekly_matchups: Dict[int, Dict[int, Any]]) -> None:
+        """Compute every team's Shapley values at once (across `self.workers` processes)"""
+        if self._shapley_source is not weekly_matchups:
+            self._shapley = {}
+            self._shapley_source = weekly_matchups
+        
+        pending = {(int(team.team_id), tuple(team.roster), self.lineup_slots): team for team in teams}
+        pending = {key: team for key, team in pending.items() if key not in self._shapley}
+        if not pending:
+            return
+        inputs = {key: self._shapley_inputs(team, weekly_matchups) for key, team in pending.items()}
+        # Seed each team's sampler with its roster_id, as _team_shapley does
+        seeds = {key: key[0] for key in inputs}
+        self._shapley.update(league_shapley(inputs, workers=self.workers, seeds=seeds, slots=self.lineup_slots))
+    
     def _calculate_shapley_value(self, player_id: str, team: Team, 
                                 weekly_matchups: Dict[int, Dict[str, float]]) -> float:
-        """Calculate Shapley value for player's contribution to team success"""
+        """Player's Shapley value as a share (0-100) of the team's optimal lineup points
+        
+        The coalition game is worth the average weekly points of the best lineup a set of
+        the team's players could field, so the values over a roster add up to 100.
+        """
         
         if not weekly_matchups:
             logger.warning("No weekly matchup data for Shapley calculation")
             return 0.0
         
-        total_contribution = 0.0
-        total_weeks = 0
-        
-        # For each week, calculate marginal contribution
-        for week, matchup_data in weekly_matchups.items():
-            team_matchup = matchup_data.get(str(team.team_id))
-            if not team_matchup:
-                continue
-            
-            player_points = team_matchup.get('players_points', {}).get(player_id, 0.0)
-            team_total = team_matchup.get('points', 0.0)
-            
-            if team_total > 0:
-                # Player's contribution as percentage of team total
-                contribution = player_points / team_total
-                total_contribution += contribution
-                total_weeks += 1
-        
-        if total_weeks == 0:
+        shapley = self._team_shapley(team, weekly_matchups)
+        if shapley['total'] <= 0:
             return 0.0
         
-        # Average weekly contribution
-        avg_contribution = total_contribution / total_weeks
-        
-        # Scale to meaningful range (0-100)
-        shapley_value = avg_contribution * 100
+        shapley_value = shapley['values'].get(player_id, 0.0) / shapley['total'] * 100
         
         return max(0.0, shapley_value)
     
-    def _fetch_weekly_matchups(self, weeks: List[int] = None) -> Dict[int, Dict[str, Any]]:
-        """Fetch weekly matchup data for Shapley calculation"""
-        if weeks is None:
-            weeks = list(range(1, 9))  # Weeks 1-8 (current)
+    def _fetch_weekly_matchups(self, weeks: List[int] = None) -> Dict[int, Dict[int, Any]]:
+        """Weekly matchup entries keyed by int roster_id for Shapley calculation"""
+        if self.context is not None and weeks is None:
+            return self.context.weekly
         
         weekly_data = {}
         
-        for week in weeks:
-            try:
-                matchups = make_sleeper_request(f"league/{self.league_id}/matchups/{week}")
-                if matchups:
-                    week_data = {}
-                    for matchup in matchups:
-                        roster_id = str(matchup.get('roster_id'))
-                        week_data[roster_id] = {
-                            'points': matchup.get('points', 0.0),
-                            'players_points': matchup.get('players_points', {})
-                        }
-                    weekly_data[week] = week_data
-                    
-            except Exception as e:
-                logger.warning(f"Failed to fetch week {week} matchups: {e}")
-                continue
+        for week, matchups in self.matchup_store.get_all_matchups(weeks).items():
+            weekly_data[week] = {int(matchup['roster_id']): matchup for matchup in matchups
+                                 if matchup.get('roster_id') is not None}
         
-        logger.info(f"Loaded matchup data for {len(weekly_data)} weeks")
+        logger.debug(f"Loaded matchup data for {len(weekly_data)} weeks")
         return weekly_data
     
     def calculate_player_alvarado(self, player_id: str, team: Team, 
@@ -231,6 +275,7 @@ class AlvaradoCalculator:
         
         # Fetch weekly matchups once for all teams
         weekly_matchups = self._fetch_weekly_matchups()
+        self._prime_shapley(teams, weekly_matchups)
         
         alvarado_scores = {}
         
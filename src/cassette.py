@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+SLEEPER CASSETTE
+Record/replay of Sleeper responses for deterministic, offline benchmarks
+"""
+
+import os
+import gzip
+import json
+import time
+import atexit
+import tempfile
+import threading
+import logging
+from typing import Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CASSETTE_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'cassettes', 'sleeper.json.gz')
+MODES = ('off', 'record', 'replay')
+
+class Cassette:
+    """gzip-compressed recording of Sleeper responses keyed by request URL"""
+
+    def __init__(self, path: str = DEFAULT_CASSETTE_PATH, mode: str = 'replay', latency_ms: float = 0.0):
+        if mode not in ('record', 'replay'):
+            raise ValueError(f"Cassette mode must be 'record' or 'replay', got {mode!r}")
+        self.path = path
+        self.mode = mode
+        self.latency_ms = max(0.0, latency_ms)
+        self._lock = threading.Lock()
+        self._responses: Dict[str, Any] = {}
+        self._dirty = False
+        self._stats = {'plays': 0, 'misses': 0, 'recorded': 0}
+
+        if mode == 'replay':
+            self._responses = self._read(path)
+            logger.info(f"Replaying {len(self._responses)} Sleeper responses from {path}")
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == 'replay'
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == 'record'
+
+    @staticmethod
+    def _read(path: str) -> Dict[str, Any]:
+        """Load a cassette file"""
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            return json.load(f).get('responses', {})
+
+    def play(self, url: str) -> Tuple[bool, Any]:
+        """Serve a recorded response; returns (hit, data)"""
+        with self._lock:
+            hit = url in self._responses
+            data = self._responses.get(url)
+            self._stats['plays' if hit else 'misses'] += 1
+
+        if hit and self.latency_ms:
+            time.sleep(self.latency_ms / 1000.0)
+        return hit, data
+
+    def record(self, url: str, data: Any) -> None:
+        """Capture a response (the latest response for a URL wins)"""
+        with self._lock:
+            self._responses[url] = data
+            self._dirty = True
+            self._stats['recorded'] += 1
+
+    def save(self) -> None:
+        """Write recorded responses atomically (temp file + rename)"""
+        with self._lock:
+            if not self._dirty:
+                return
+            payload = {'recorded_at': time.time(), 'responses': self._responses}
+
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.path)), suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as raw, gzip.open(raw, 'wt', encoding='utf-8') as f:
+                    json.dump(payload, f, separators=(',', ':'))
+                os.replace(tmp_path, self.path)
+            except OSError:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+            self._dirty = False
+            logger.info(f"Recorded {len(self._responses)} Sleeper responses to {self.path}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Get play/miss/record counters"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._responses)
+        stats['mode'] = self.mode
+        return stats
+
+_cassette: Optional[Cassette] = None
+_cassette_lock = threading.Lock()
+_cassette_loaded = False
+
+def _save_on_exit() -> None:
+    """Flush a recording cassette at interpreter exit"""
+    if _cassette is not None and _cassette.recording:
+        try:
+            _cassette.save()
+        except OSError as e:
+            logger.error(f"Failed to save Sleeper cassette: {e}")
+
+def configure_cassette(mode: str = 'off', path: str = None, latency_ms: float = 0.0) -> Optional[Cassette]:
+    """Switch record/replay mode ('off', 'record' or 'replay')"""
+    global _cassette, _cassette_loaded
+
+    if mode not in MODES:
+        raise ValueError(f"Cassette mode must be one of {MODES}, got {mode!r}")
+
+    with _cassette_lock:
+        if _cassette is not None and _cassette.recording:
+            _cassette.save()
+        _cassette = None if mode == 'off' else Cassette(path or DEFAULT_CASSETTE_PATH, mode, latency_ms)
+        _cassette_loaded = True
+    return _cassette
+
+def configure_cassette_from_env() -> Optional[Cassette]:
+    """Apply SLEEPER_CASSETTE_MODE, SLEEPER_CASSETTE and SLEEPER_REPLAY_LATENCY_MS"""
+    return configure_cassette(
+        mode=os.getenv('SLEEPER_CASSETTE_MODE', 'off').lower(),
+        path=os.getenv('SLEEPER_CASSETTE'),
+        latency_ms=float(os.getenv('SLEEPER_REPLAY_LATENCY_MS', 0))
+    )
+
+def get_cassette() -> Optional[Cassette]:
+    """Get the active cassette (None when record/replay is off)"""
+    if not _cassette_loaded:
+        configure_cassette_from_env()
+    return _cassette
+
+def add_cassette_arguments(parser) -> None:
+    """Add --record/--replay/--replay-latency to a script's argparse parser"""
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--record', metavar='CASSETTE',
+                       help='Record every Sleeper response into a compressed cassette file')
+    group.add_argument('--replay', metavar='CASSETTE',
+                       help='Serve Sleeper responses from a cassette file (no network)')
+    parser.add_argument('--replay-latency', type=float, default=0.0, metavar='MS',
+                        help='Injected per-request latency in milliseconds during replay')
+
+def configure_cassette_from_args(args) -> Optional[Cassette]:
+    """Apply cassette CLI flags (falls back to the environment when neither is given)"""
+    if args.record:
+        return configure_cassette('record', args.record)
+    if args.replay:
+        return configure_cassette('replay', args.replay, args.replay_latency)
+
+    cassette = get_cassette()
+    if cassette is not None and args.replay_latency:
+        cassette.latency_ms = args.replay_latency
+    return cassette
+
+atexit.register(_save_on_exit)
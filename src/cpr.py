@@ -5,29 +5,157 @@ Uses actual Ingram, Alvarado, and Zion algorithms for CPR framework
 """
 
 import math
+import dataclasses
 import numpy as np
 import statistics
-from typing import Dict, List, Any, Optional
+from itertools import chain
+from typing import Dict, List, Any, Optional, Tuple, Iterable
 from datetime import datetime
 import logging
 
 try:
     from .models import Team, Player, CPRMetrics, LeagueAnalysis
-    from .utils import calculate_gini_coefficient, make_sleeper_request
+    from .utils import calculate_gini_coefficient
     from .ingram_calculator import IngramCalculator
     from .alvarado_calculator import AlvaradoCalculator
-    from .zion_calculator import ZionTensorCalculator
+    from .zion_calculator import ZionTensorCalculator, zion_tensor_matrix
+    from .cpr_backfill import (
+        score_matrix, prefix_records, prefix_slopes, prefix_variances, prefix_schedule_counts,
+        prefix_ppg, weekly_lineups
+    )
     from .team_extraction import LegionTeamExtractor
+    from .matchup_store import MatchupStore, season_weeks
+    from .league_context import LeagueContext
+    from .sleeper_client import get_max_concurrent
+    from .lineup_optimizer import LineupSolver
+    from .points_matrix import PointsMatrixStore
 except ImportError:
     from .models import Team, Player, CPRMetrics, LeagueAnalysis
-    from utils import calculate_gini_coefficient, make_sleeper_request
+    from utils import calculate_gini_coefficient
     from ingram_calculator import IngramCalculator
     from alvarado_calculator import AlvaradoCalculator
-    from zion_calculator import ZionTensorCalculator
+    from zion_calculator import ZionTensorCalculator, zion_tensor_matrix
+    from cpr_backfill import (
+        score_matrix, prefix_records, prefix_slopes, prefix_variances, prefix_schedule_counts,
+        prefix_ppg, weekly_lineups
+    )
     from team_extraction import LegionTeamExtractor
+    from matchup_store import MatchupStore, season_weeks
+    from league_context import LeagueContext
+    from sleeper_client import get_max_concurrent
+    from lineup_optimizer import LineupSolver
+    from points_matrix import PointsMatrixStore
 
 logger = logging.getLogger(__name__)
 
+MAX_STARTERS = 7
+MAX_BENCH = 5
+
+def season_ppg(players: Dict[str, Player], season: int, player_ids: Iterable[str] = None) -> Dict[str, float]:
+    """Fantasy points per game for players (default: all) with games played in a season"""
+    ppg = {}
+    for player_id in (players if player_ids is None else player_ids):
+        player = players.get(player_id)
+        stats = player.stats.get(season) if player is not None else None
+        if stats and stats.games_played > 0:
+            ppg[player_id] = stats.fantasy_points / stats.games_played
+    return ppg
+
+def lineup_slots(teams: List[Team]) -> Tuple[List[List[str]], List[List[str]]]:
+    """Starter and bench player IDs per team, truncated to the SLI/BSI slot counts"""
+    starters = []
+    benches = []
+    for team in teams:
+        starter_ids = set(team.starters)
+        starters.append(team.starters[:MAX_STARTERS])
+        benches.append([p for p in team.roster if p not in starter_ids][:MAX_BENCH])
+    return starters, benches
+
+def ppg_matrix(lineups: List[List[str]], ppg: Dict[str, float], width: int) -> np.ndarray:
+    """Rows x slots matrix of points per game (NaN for empty slots and players without stats)"""
+    padding = [None] * width
+    values = [ppg.get(player_id, np.nan)
+              for player_ids in lineups for player_id in (player_ids + padding)[:width]]
+    return np.array(values, dtype=np.float64).reshape(len(lineups), width)
+
+def average_ppg(matrix: np.ndarray) -> np.ndarray:
+    """Per-row mean over slots with stats (0.0 for rows without any)"""
+    valid = ~np.isnan(matrix)
+    totals = np.where(valid, matrix, 0.0).sum(axis=1)
+    counts = valid.sum(axis=1)
+    return np.divide(totals, counts, out=np.zeros_like(totals), where=counts > 0)
+
+def lineup_indices(starters: List[List[str]], benches: List[List[str]], ppg: Dict[str, float],
+                   bench_multiplier: float) -> Tuple[np.ndarray, np.ndarray]:
+    """SLI and BSI for many teams at once (any number of leagues)
+    
+    Builds teams x starter-slot and teams x bench-slot PPG matrices in one pass and
+    reduces them with NumPy; matches calculate_sli/calculate_bsi team by team.
+    """
+    sli = np.clip(average_ppg(ppg_matrix(starters, ppg, MAX_STARTERS)) / 10.0, 0.0, 2.0)
+    bsi = np.clip(average_ppg(ppg_matrix(benches, ppg, MAX_BENCH)) * bench_multiplier / 10.0, 0.0, 2.0)
+    return sli, bsi
+
+def player_fingerprint(player: Optional[Player]) -> Tuple:
+    """What SLI, BSI and Ingram read from a player: position, status and season stats"""
+    if player is None:
+        return ()
+    stats = tuple(sorted((season, dataclasses.astuple(season_stats))
+                         for season, season_stats in (player.stats or {}).items()))
+    return (player.position, player.status, player.injury_status, stats)
+
+COMPONENTS = ('sli', 'bsi', 'smi', 'ingram', 'alvarado', 'zion')
+
+def weight_matrix(weight_sets: List[Dict[str, float]]) -> np.ndarray:
+    """Weight sets x components matrix; rows off 1.0 by more than 0.01 are normalized
+    (as CPREngine does for its configured weights)"""
+    weights = np.array([[float(weights.get(key, 0.0)) for key in COMPONENTS] for weights in weight_sets],
+                       dtype=np.float64).reshape(len(weight_sets), len(COMPONENTS))
+    totals = weights.sum(axis=1, keepdims=True)
+    off = (np.abs(totals - 1.0) > 0.01) & (totals > 0)
+    return np.where(off, weights / np.where(totals > 0, totals, 1.0), weights)
+
+def sample_weight_sets(base: Dict[str, float], count: int, concentration: float = 50.0,
+                       seed: int = None) -> List[Dict[str, float]]:
+    """Random weight sets around `base` (Dirichlet; higher concentration = closer to base)"""
+    rng = np.random.default_rng(seed)
+    alpha = np.maximum(weight_matrix([base])[0] * concentration, 1e-3)
+    return [dict(zip(COMPONENTS, row)) for row in rng.dirichlet(alpha, size=count)]
+
+def rank_matrix(scores: np.ndarray) -> np.ndarray:
+    """Rank of each team (column) under each weight set (row); 1 = best, ties keep team order"""
+    order = np.argsort(-scores, axis=1, kind='stable')
+    ranks = np.empty_like(order)
+    rows = np.arange(scores.shape[0])[:, None]
+    ranks[rows, order] = np.arange(1, scores.shape[1] + 1)
+    return ranks
+
+def weight_sweep(components: np.ndarray, weights: np.ndarray) -> Dict[str, np.ndarray]:
+    """Score and rank every weight set at once and summarize rank stability
+    
+    `components` is teams x COMPONENTS and `weights` is weight sets x COMPONENTS;
+    scores are one matrix product (weight sets x teams).
+    """
+    scores = weights @ components.T
+    ranks = rank_matrix(scores)
+    num_sets, num_teams = ranks.shape
+    
+    # rank_frequency[team, rank - 1]: share of weight sets where the team holds that rank
+    frequency = np.zeros((num_teams, num_teams))
+    np.add.at(frequency, (np.tile(np.arange(num_teams), num_sets), ranks.ravel() - 1), 1.0)
+    frequency /= max(num_sets, 1)
+    
+    return {
+        'scores': scores,
+        'ranks': ranks,
+        'rank_frequency': frequency,
+        'mean_rank': ranks.mean(axis=0),
+        'rank_std': ranks.std(axis=0),
+        'best_rank': ranks.min(axis=0),
+        'worst_rank': ranks.max(axis=0),
+        'modal_rank': frequency.argmax(axis=1) + 1
+    }
+
 class CPREngine:
     """REAL CPR (Commissioner's Power Rankings) calculation engine"""
     
@@ -51,11 +179,26 @@ class CPREngine:
             for key in self.weights:
                 self.weights[key] = self.weights[key] / total_weight
         
+        # Shared per-run matchup data (each week fetched once)
+        self.matchup_store = MatchupStore(league_id, max_concurrent=get_max_concurrent(config))
+        
         # Initialize real algorithm calculators
         self.ingram_calc = IngramCalculator()
-        self.alvarado_calc = AlvaradoCalculator(league_id)
-        self.zion_calc = ZionTensorCalculator(league_id)
+        self.alvarado_calc = AlvaradoCalculator(league_id, self.matchup_store)
+        self.alvarado_calc.workers = max(1, int(config.get('performance', {}).get('shapley_workers', 1)))
+        self.zion_calc = ZionTensorCalculator(league_id, self.matchup_store, self.ingram_calc, self.alvarado_calc)
         self.team_extractor = LegionTeamExtractor(league_id)
+        self.lineup_solver = LineupSolver()
+        # Weekly points matrix persisted for completed weeks (None: rebuilt from matchups)
+        self.points_store: Optional[PointsMatrixStore] = None
+        
+        # Per-run league snapshot, built once in calculate_league_cpr
+        self.context: Optional[LeagueContext] = None
+        self._components: Dict[int, Dict[str, float]] = {}
+        self._lineups: Dict[int, Tuple[float, float]] = {}
+        self._ingram_raw: Dict[int, float] = {}
+        self._alvarado_raw: Dict[int, float] = {}
+        self._team_states: Dict[int, Dict[str, Any]] = {}
         
         # Configuration
         self.bench_multiplier = config.get('bench_multiplier', 0.3)
@@ -72,7 +215,7 @@ class CPREngine:
         total_fantasy_points = 0.0
         valid_starters = 0
         
-        for player_id in team.starters[:7]:  # Max 7 starters
+        for player_id in team.starters[:MAX_STARTERS]:  # Max 7 starters
             player = players.get(player_id)
             if player:
                 # Get current season stats
@@ -94,7 +237,7 @@ class CPREngine:
     
     def calculate_bsi(self, team: Team, players: Dict[str, Player]) -> float:
         """Calculate Bench Strength Index (BSI) - bench depth"""
-        bench_players = [p for p in team.roster if p not in team.starters][:5]  # Max 5 bench
+        bench_players = [p for p in team.roster if p not in team.starters][:MAX_BENCH]  # Max 5 bench
         
         if not bench_players:
             return 0.0
@@ -121,19 +264,43 @@ class CPREngine:
         bsi = min((avg_bench_points * self.bench_multiplier) / 10.0, 2.0)
         return max(bsi, 0.0)
     
+    def calculate_league_sli_bsi(self, teams: List[Team], players: Dict[str, Player]) -> Dict[int, Tuple[float, float]]:
+        """Calculate SLI and BSI for every team in one batched pass (roster_id -> (sli, bsi))"""
+        starters, benches = lineup_slots(teams)
+        ppg = season_ppg(players, self.current_season, chain.from_iterable(starters + benches))
+        sli, bsi = lineup_indices(starters, benches, ppg, self.bench_multiplier)
+        return {int(team.team_id): (float(sli[i]), float(bsi[i])) for i, team in enumerate(teams)}
+    
+    def set_roster_positions(self, roster_positions: List[str]) -> None:
+        """Use a league's roster_positions for optimal lineups, Alvarado's Shapley game and
+        Ingram's starting and bench slots"""
+        self.lineup_solver = LineupSolver.from_roster_positions(roster_positions)
+        self.alvarado_calc.lineup_slots = self.lineup_solver.slots
+        self.ingram_calc.lineup_slots = self.lineup_solver.slots
+        bench_size = sum(1 for slot in roster_positions or () if str(slot).upper() == 'BN')
+        if bench_size:
+            self.ingram_calc.bench_size = bench_size
+    
+    def calculate_optimal_lineups(self, teams: List[Team], players: Dict[str, Player]) -> Dict[int, Dict[str, Any]]:
+        """Best lineup from each full roster by season PPG (roster_id -> LineupSolver.solve result)"""
+        ppg = season_ppg(players, self.current_season, chain.from_iterable(team.roster for team in teams))
+        lineups = {}
+        for team in teams:
+            roster = list(dict.fromkeys(team.roster))
+            positions = [players[p].position if p in players else None for p in roster]
+            lineups[int(team.team_id)] = self.lineup_solver.solve(roster, [ppg.get(p, 0.0) for p in roster], positions)
+        return lineups
+    
+    def calculate_optimal_sli(self, teams: List[Team], players: Dict[str, Player]) -> Dict[int, float]:
+        """SLI of each roster's optimal lineup rather than its set starters (same 0-2 scale)"""
+        slots = max(len(self.lineup_solver.slots), 1)
+        return {roster_id: max(min(lineup['points'] / slots / 10.0, 2.0), 0.0)
+                for roster_id, lineup in self.calculate_optimal_lineups(teams, players).items()}
+    
     def calculate_smi(self, team: Team, all_teams: List[Team]) -> float:
         """Calculate Schedule Momentum Index (SMI) - recent performance trends"""
         # Get weekly scores for the team
-        weekly_scores = []
-        for week in range(1, 9):  # Assuming 8 weeks of data
-            try:
-                matchups = make_sleeper_request(f"league/{self.league_id}/matchups/{week}")
-                for m in matchups:
-                    if m['roster_id'] == int(team.team_id):
-                        weekly_scores.append(m['points'])
-                        break
-            except Exception:
-                continue
+        weekly_scores = self._get_team_scores(team)
         
         if len(weekly_scores) < 2:
             return 0.5 # Neutral score if not enough data
@@ -148,16 +315,9 @@ class CPREngine:
         smi = 1.0 + (slope / 10.0)
         return max(0.0, min(2.0, smi))
     
-    def calculate_team_cpr(self, team: Team, players: Dict[str, Player], 
-                          all_teams: List[Team]) -> CPRMetrics:
-        """Calculate CPR for a single team using REAL algorithms"""
-        
-        logger.debug(f"Calculating CPR for {team.team_name}...")
-        
-        # Calculate total points from matchups
-        team.fpts = self._get_total_points(team, all_teams)
-
-        # Calculate traditional indices
+    def calculate_team_components(self, team: Team, players: Dict[str, Player],
+                                  all_teams: List[Team]) -> Dict[str, float]:
+        """Calculate one team's normalized component scores"""
         sli = self.calculate_sli(team, players)
         bsi = self.calculate_bsi(team, players)
         smi = self.calculate_smi(team, all_teams)
@@ -186,6 +346,201 @@ class CPREngine:
             logger.warning(f"Zion calculation failed for {team.team_name}: {e}")
             zion = 1.0  # Default neutral score
         
+        return {'sli': sli, 'bsi': bsi, 'smi': smi, 'ingram': ingram, 'alvarado': alvarado, 'zion': zion}
+    
+    def _calculate_team_inputs(self, teams: List[Team], players: Dict[str, Player],
+                               alvarado_teams: List[Team] = None) -> None:
+        """Refresh cached SLI/BSI and raw Ingram for `teams`, and raw Alvarado for
+        `alvarado_teams` (defaults to `teams`)"""
+        self._lineups.update(self.calculate_league_sli_bsi(teams, players))
+        
+        for team in teams:
+            roster_id = int(team.team_id)
+            try:
+                self._ingram_raw[roster_id] = self.ingram_calc.calculate_team_ingram(team, players)
+            except Exception as e:
+                logger.warning(f"Ingram calculation failed for {team.team_name}: {e}")
+                self._ingram_raw.pop(roster_id, None)
+        
+        alvarado_teams = teams if alvarado_teams is None else alvarado_teams
+        try:
+            # Every team's Shapley game at once, so they can share a process pool
+            self.alvarado_calc._prime_shapley(alvarado_teams, self.alvarado_calc._fetch_weekly_matchups())
+        except Exception as e:
+            logger.warning(f"Shapley precompute failed: {e}")
+        
+        for team in alvarado_teams:
+            roster_id = int(team.team_id)
+            try:
+                self._alvarado_raw[roster_id] = self.alvarado_calc.calculate_team_alvarado(team)
+            except Exception as e:
+                logger.warning(f"Alvarado calculation failed for {team.team_name}: {e}")
+                self._alvarado_raw.pop(roster_id, None)
+    
+    def _calculate_zion_scores(self, teams: List[Team], players: Dict[str, Player],
+                               roster_ids: Optional[List[int]] = None) -> Dict[int, float]:
+        """Normalized Zion from the league matrix (1.0 when unavailable)
+        
+        Covers every team, or only `roster_ids` when given (opponent features still
+        come from the whole league).
+        """
+        try:
+            zion_tensors = self.zion_calc.calculate_league_zion_matrix(teams, players,
+                                                                       self._ingram_raw, self._alvarado_raw,
+                                                                       roster_ids=roster_ids)
+        except Exception as e:
+            logger.warning(f"Zion calculation failed: {e}")
+            zion_tensors = {}
+        
+        wanted = None if roster_ids is None else set(roster_ids)
+        zion = {}
+        for team in teams:
+            if wanted is not None and int(team.team_id) not in wanted:
+                continue
+            zion_result = zion_tensors.get(team.team_id)
+            # Normalize Zion to 0-2 scale (higher = harder schedule, so invert for CPR)
+            zion[int(team.team_id)] = max(2.0 - zion_result['tensor_magnitude'], 0.0) if zion_result else 1.0
+        return zion
+    
+    def _team_component_scores(self, roster_id: int) -> Dict[str, float]:
+        """Normalized lineup, Ingram and Alvarado scores from the run caches"""
+        sli, bsi = self._lineups[roster_id]
+        alvarado = self._alvarado_raw.get(roster_id)
+        return {
+            'sli': sli,
+            'bsi': bsi,
+            'ingram': self._ingram_raw.get(roster_id, 0.5),
+            'alvarado': min(alvarado / 10.0, 2.0) if alvarado is not None else 0.5
+        }
+    
+    def calculate_league_components(self, teams: List[Team],
+                                    players: Dict[str, Player]) -> Dict[int, Dict[str, float]]:
+        """Calculate every team's normalized component scores in batch
+        
+        SLI/BSI come from the PPG matrices and Zion from the league matrix form, which
+        reuses the Ingram and Alvarado scores computed here for each team once.
+        """
+        self._lineups, self._ingram_raw, self._alvarado_raw = {}, {}, {}
+        self._calculate_team_inputs(teams, players)
+        zion = self._calculate_zion_scores(teams, players)
+        
+        components = {}
+        for team in teams:
+            roster_id = int(team.team_id)
+            components[roster_id] = {
+                **self._team_component_scores(roster_id),
+                'smi': self.calculate_smi(team, teams),
+                'zion': zion[roster_id]
+            }
+        return components
+    
+    def _team_state(self, team: Team, players: Dict[str, Player]) -> Dict[str, Any]:
+        """What a team's components depend on besides matchups (for change detection)"""
+        return {
+            'lineup': (tuple(team.roster), tuple(team.starters)),
+            'players': tuple(player_fingerprint(players.get(player_id)) for player_id in team.roster),
+            'record': (team.wins, team.losses, team.ties)
+        }
+    
+    def update_league_cpr(self, teams: List[Team], players: Dict[str, Player],
+                          changed_rosters: Iterable[Any] = None,
+                          matchups: Dict[int, List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """Recompute only the components a roster transaction or new week changed, then re-rank
+        
+        Needs a previous calculate_league_cpr run on this engine (otherwise runs one).
+        Dependencies tracked per team:
+        - SLI, BSI, Ingram: the team's roster and starters, and its players' stats
+        - Alvarado: roster plus the team's weekly matchup entries
+        - SMI: the team's weekly matchup entries
+        - Zion: its schedule and its opponents' record, scores, Ingram and Alvarado
+        Rosters that changed are detected from `teams` as well as `changed_rosters`;
+        `matchups` (week -> entries) replaces the loaded weeks. A new week's player
+        stats mark every roster holding a changed player as changed.
+        """
+        if self.context is None or not self._components:
+            return self.calculate_league_cpr(teams, players, matchups)
+        
+        logger.info("START Incremental CPR update...")
+        previous = self.context
+        if matchups is not None:
+            self.matchup_store.prime(matchups)
+            self.matchup_store.load()
+        
+        # New snapshot from what is already loaded: no draft or Legion refetch
+        self.bind_context(LeagueContext.build(self.league_id, teams, players, self.matchup_store,
+                                              draft_data=previous.draft_data(),
+                                              legion_teams=list(previous.legion_teams.values()),
+                                              points_store=self.points_store))
+        context = self.context
+        
+        by_id = {int(team.team_id): team for team in teams}
+        weeks = set(previous.weeks) | set(context.weeks)
+        roster_dirty = {int(roster_id) for roster_id in (changed_rosters or []) if int(roster_id) in by_id}
+        record_dirty = set()
+        for roster_id, team in by_id.items():
+            state = self._team_states.get(roster_id)
+            current = self._team_state(team, players)
+            if state is None or state['lineup'] != current['lineup'] or state['players'] != current['players']:
+                roster_dirty.add(roster_id)
+            if state is None or state['record'] != current['record']:
+                record_dirty.add(roster_id)
+        
+        entry_dirty = {roster_id for roster_id in by_id
+                       if roster_id not in self._components
+                       or any(previous.weekly.get(week, {}).get(roster_id) != context.weekly.get(week, {}).get(roster_id)
+                              for week in weeks)}
+        alvarado_dirty = roster_dirty | entry_dirty
+        schedule_dirty = {roster_id for roster_id in by_id
+                          if previous.team_opponents(roster_id) != context.team_opponents(roster_id)}
+        feature_dirty = roster_dirty | record_dirty | entry_dirty
+        zion_dirty = schedule_dirty | {
+            roster_id for roster_id in by_id if feature_dirty.intersection(context.team_opponents(roster_id))}
+        
+        # Recompute only the dirty inputs; everything else comes from the run caches
+        self._calculate_team_inputs([by_id[r] for r in sorted(roster_dirty)], players,
+                                    [by_id[r] for r in sorted(alvarado_dirty)])
+        zion = self._calculate_zion_scores(teams, players, sorted(zion_dirty)) if zion_dirty else {}
+        
+        components = {}
+        for roster_id, team in by_id.items():
+            scores = dict(self._components.get(roster_id, {}))
+            if roster_id in alvarado_dirty:
+                scores.update(self._team_component_scores(roster_id))
+            if roster_id in entry_dirty:
+                scores['smi'] = self.calculate_smi(team, teams)
+            if roster_id in zion_dirty:
+                scores['zion'] = zion[roster_id]
+            components[roster_id] = scores
+        self._components = components
+        self._team_states = {roster_id: self._team_state(team, players) for roster_id, team in by_id.items()}
+        
+        result = self._rank_league(teams, players)
+        result['recomputed'] = {
+            'lineup': sorted(roster_dirty),
+            'alvarado': sorted(alvarado_dirty),
+            'smi': sorted(entry_dirty),
+            'zion': sorted(zion_dirty)
+        }
+        logger.info(f"Incremental CPR update: {len(roster_dirty)} rosters, {len(entry_dirty)} matchup histories, "
+                    f"{len(zion_dirty)} Zion tensors recomputed")
+        return result
+    
+    def calculate_team_cpr(self, team: Team, players: Dict[str, Player], 
+                          all_teams: List[Team]) -> CPRMetrics:
+        """Calculate CPR for a single team using REAL algorithms"""
+        
+        logger.debug(f"Calculating CPR for {team.team_name}...")
+        
+        # Calculate total points from matchups
+        team.fpts = self._get_total_points(team, all_teams)
+
+        # Component scores (batched per league run when available)
+        components = self._components.get(int(team.team_id))
+        if components is None:
+            components = self.calculate_team_components(team, players, all_teams)
+        sli, bsi, smi = components['sli'], components['bsi'], components['smi']
+        ingram, alvarado, zion = components['ingram'], components['alvarado'], components['zion']
+        
         # Calculate weighted CPR score
         cpr = (
             sli * self.weights['sli'] +
@@ -197,13 +552,16 @@ class CPREngine:
         )
         
         # Get real team name from Legion data
-        try:
-            legion_teams = self.team_extractor.get_teams()
-            team_data = next((t for t in legion_teams if t['roster_id'] == int(team.team_id)), None)
-            display_name = team_data['team_name'] if team_data else team.team_name
-        except Exception as e:
-            logger.warning(f"Failed to get Legion team name: {e}")
-            display_name = team.team_name
+        if self.context is not None:
+            display_name = self.context.display_name(team)
+        else:
+            try:
+                legion_teams = self.team_extractor.get_teams()
+                team_data = next((t for t in legion_teams if t['roster_id'] == int(team.team_id)), None)
+                display_name = team_data['team_name'] if team_data else team.team_name
+            except Exception as e:
+                logger.warning(f"Failed to get Legion team name: {e}")
+                display_name = team.team_name
         
         return CPRMetrics(
             team_id=team.team_id,
@@ -219,10 +577,61 @@ class CPREngine:
             losses=team.losses
         )
     
-    def calculate_league_cpr(self, teams: List[Team], players: Dict[str, Player]) -> Dict[str, Any]:
-        """Calculate CPR for entire league using REAL algorithms"""
+    def build_context(self, teams: List[Team], players: Dict[str, Player],
+                      rosters: List[Dict[str, Any]] = None,
+                      users: List[Dict[str, Any]] = None) -> LeagueContext:
+        """Build the run's LeagueContext from the loaded matchup store
+        
+        Draft picks are fetched once here; Legion team data comes from `rosters` and
+        `users` when the caller already has them, otherwise it is fetched.
+        """
+        if rosters and users:
+            legion_teams = self.team_extractor.build_teams(rosters, users)
+        else:
+            try:
+                legion_teams = self.team_extractor.get_teams()
+            except Exception as e:
+                logger.warning(f"Failed to get Legion team data: {e}")
+                legion_teams = []
+        
+        return LeagueContext.build(self.league_id, teams, players, self.matchup_store,
+                                   draft_data=self.alvarado_calc._fetch_draft_data(),
+                                   legion_teams=legion_teams, points_store=self.points_store)
+    
+    def bind_context(self, context: LeagueContext) -> None:
+        """Share one LeagueContext across every calculator"""
+        self.context = context
+        self.alvarado_calc.bind_context(context)
+        self.zion_calc.bind_context(context)
+    
+    def calculate_league_cpr(self, teams: List[Team], players: Dict[str, Player],
+                             matchups: Dict[int, List[Dict[str, Any]]] = None,
+                             rosters: List[Dict[str, Any]] = None,
+                             users: List[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Calculate CPR for entire league using REAL algorithms
+        
+        `matchups` (week -> entries, e.g. from an incremental league sync) seeds the
+        matchup store; any week not supplied is fetched. `rosters` and `users` save
+        refetching them for Legion team names.
+        """
         logger.info("START Calculating REAL CPR rankings for league...")
         
+        # Load each week's matchups once for the whole run
+        if matchups is not None:
+            self.matchup_store.prime(matchups)
+        else:
+            self.matchup_store.refresh()
+        self.matchup_store.load()
+        
+        # Fetch and index everything else once, then share it with every calculator
+        self.bind_context(self.build_context(teams, players, rosters, users))
+        self._components = self.calculate_league_components(teams, players)
+        self._team_states = {int(team.team_id): self._team_state(team, players) for team in teams}
+        
+        return self._rank_league(teams, players)
+    
+    def _rank_league(self, teams: List[Team], players: Dict[str, Player]) -> Dict[str, Any]:
+        """Assemble, rank and summarize CPR from the current component scores"""
         # Calculate CPR for each team
         cpr_metrics = []
         for team in teams:
@@ -254,6 +663,13 @@ class CPREngine:
         # Generate insights using REAL algorithms
         insights = self._generate_real_insights(cpr_metrics, teams, players)
         
+        # SLI the set starters could reach with each roster's best lineup
+        try:
+            optimal_sli = {str(roster_id): sli for roster_id, sli in self.calculate_optimal_sli(teams, players).items()}
+        except Exception as e:
+            logger.warning(f"Optimal SLI calculation failed: {e}")
+            optimal_sli = {}
+        
         result = {
             'rankings': cpr_metrics,  # Raw CPRMetrics objects for database
             'rankings_serialized': [self._serialize_cpr_metrics(team) for team in cpr_metrics],  # Serialized for API
@@ -261,6 +677,7 @@ class CPREngine:
             'gini_coefficient': gini_coefficient,
             'calculation_timestamp': datetime.now().isoformat(),
             'insights': insights,
+            'optimal_sli': optimal_sli,  # team_id -> SLI of the roster's optimal lineup
             'weights_used': self.weights.copy(),
             'algorithm_version': 'REAL_CPR_v1.0'
         }
@@ -268,6 +685,137 @@ class CPREngine:
         logger.info(f"REAL CPR calculation complete: {len(cpr_metrics)} teams, health: {league_health:.1%}")
         return result
     
+    def backfill_league_cpr(self, teams: List[Team], players: Dict[str, Player],
+                            matchups: Dict[int, List[Dict[str, Any]]] = None,
+                            rosters: List[Dict[str, Any]] = None, users: List[Dict[str, Any]] = None,
+                            weeks: List[int] = None, league: Dict[str, Any] = None) -> Dict[str, Any]:
+        """CPR, its components and rank for every week W as of week W, in one pass
+        
+        Matchups are loaded once (as in calculate_league_cpr). Records, SMI slopes, score
+        variances and Zion schedule counts come from prefix sums over the weeks x teams
+        score matrix, and every week's Zion tensors from one batched matrix product.
+        SLI/BSI as of W use each week's starters and roster from the matchup entry, rated
+        by points per rostered week through W from players_points (season PPG isn't
+        available per week). Ingram and Alvarado have no weekly history (rosters and
+        draft value are as of now), so they hold their current values in every week.
+        `weeks` defaults to every loaded week with points scored. Without `matchups`,
+        `weeks` (default: the whole season from the Sleeper `league` settings) are fetched.
+        """
+        store_weeks = self.matchup_store.weeks
+        try:
+            if matchups is not None:
+                self.matchup_store.prime(matchups)
+            else:
+                # Only this run reads the whole season; the store keeps its weeks for later runs
+                self.matchup_store.refresh()
+                self.matchup_store.weeks = sorted(weeks) if weeks is not None else season_weeks(league)
+            self.matchup_store.load()
+            self.bind_context(self.build_context(teams, players, rosters, users))
+        finally:
+            if matchups is None:
+                self.matchup_store.weeks = store_weeks
+        self._lineups, self._ingram_raw, self._alvarado_raw = {}, {}, {}
+        self._calculate_team_inputs(teams, players)
+        
+        all_matchups = self.context.matchups
+        if weeks is None:
+            weeks = [week for week in self.context.weeks
+                     if any((entry.get('points') or 0) > 0 for entry in all_matchups.get(week, ()))]
+        weeks = sorted(weeks)
+        team_ids = [int(team.team_id) for team in teams]
+        index = {roster_id: i for i, roster_id in enumerate(team_ids)}
+        
+        scores, played, opponent = score_matrix(all_matchups, weeks, index)
+        results, games = prefix_records(scores, opponent)
+        win_pct = np.divide(results, games, out=np.zeros_like(results), where=games > 0)
+        slopes = prefix_slopes(scores, played)
+        smi = np.where(np.isnan(slopes), 0.5, np.clip(1.0 + slopes / 10.0, 0.0, 2.0))
+        
+        # Zion for every week at once: (weeks, teams, teams) counts and (weeks, teams, 4) features
+        counts = prefix_schedule_counts(opponent)
+        features = np.empty((len(weeks), len(teams), 4))
+        features[..., 0] = win_pct
+        features[..., 1] = prefix_variances(scores, played)
+        features[..., 2] = [self._ingram_raw.get(roster_id, np.nan) for roster_id in team_ids]
+        features[..., 3] = [self._alvarado_raw.get(roster_id, np.nan) for roster_id in team_ids]
+        _, magnitudes = zion_tensor_matrix(counts, features)
+        zion = np.maximum(2.0 - np.where(counts.any(axis=-1), magnitudes, 0.5), 0.0)
+        
+        # Lineup strength as of each week
+        matrix = self.context.points_matrix.select_weeks(weeks)
+        ppg = prefix_ppg(matrix.points, matrix.rostered)
+        fallback = {int(team.team_id): (team.starters, team.roster) for team in teams}
+        sli = np.zeros((len(weeks), len(teams)))
+        bsi = np.zeros((len(weeks), len(teams)))
+        for w, week in enumerate(weeks):
+            lineups = weekly_lineups(all_matchups, week, fallback)
+            as_of = {player_id: ppg[row, w] for player_id, row in matrix.index.items() if not np.isnan(ppg[row, w])}
+            week_teams = [Team(team_id=str(roster_id), team_name='', owner_name='',
+                               roster=list(lineups[roster_id][1]), starters=list(lineups[roster_id][0]))
+                          for roster_id in team_ids]
+            sli[w], bsi[w] = lineup_indices(*lineup_slots(week_teams), as_of, self.bench_multiplier)
+        
+        constant = {roster_id: self._team_component_scores(roster_id) for roster_id in team_ids}
+        components = np.stack([
+            sli, bsi, smi,
+            np.broadcast_to([constant[r]['ingram'] for r in team_ids], sli.shape),
+            np.broadcast_to([constant[r]['alvarado'] for r in team_ids], sli.shape),
+            zion
+        ], axis=-1)
+        cpr = components @ weight_matrix([self.weights])[0]
+        ranks = rank_matrix(cpr) if len(weeks) else np.zeros((0, len(teams)), dtype=np.intp)
+        
+        history = {}
+        for w, week in enumerate(weeks):
+            rows = []
+            for i, team in enumerate(teams):
+                rows.append({
+                    'team_id': team.team_id,
+                    'team_name': self.context.display_name(team),
+                    'rank': int(ranks[w, i]),
+                    'cpr': float(cpr[w, i]),
+                    'win_pct': float(win_pct[w, i]),
+                    **{key: float(components[w, i, k]) for k, key in enumerate(COMPONENTS)}
+                })
+            history[week] = sorted(rows, key=lambda row: row['rank'])
+        
+        logger.info(f"CPR backfill complete: {len(teams)} teams x {len(weeks)} weeks")
+        return {
+            'weeks': weeks,
+            'team_ids': team_ids,
+            'components': components,
+            'cpr': cpr,
+            'rank': ranks,
+            'win_pct': win_pct,
+            'history': history
+        }
+    
+    def sweep_weights(self, weight_sets: List[Dict[str, float]]) -> Dict[str, Any]:
+        """Rank the league under many CPR weight sets without recomputing components
+        
+        Uses the component scores from the last calculate_league_cpr (or
+        update_league_cpr) run: the teams x components matrix is built once and every
+        weight set is scored in one matrix product. Returns per-weight-set scores and
+        ranks plus rank-stability statistics per team, including how often each team
+        holds each rank and how far it moves from the configured weights' ranking.
+        """
+        if not self._components:
+            raise ValueError("No component scores yet; run calculate_league_cpr first")
+        
+        roster_ids = list(self._components)
+        components = np.array([[self._components[r][key] for key in COMPONENTS] for r in roster_ids])
+        
+        baseline = rank_matrix(weight_matrix([self.weights]) @ components.T)[0]
+        sweep = weight_sweep(components, weight_matrix(weight_sets))
+        sweep['team_ids'] = roster_ids
+        sweep['components'] = list(COMPONENTS)
+        sweep['baseline_rank'] = baseline
+        sweep['mean_rank_shift'] = np.abs(sweep['ranks'] - baseline).mean(axis=0)
+        sweep['baseline_hold_rate'] = (sweep['ranks'] == baseline).mean(axis=0)
+        
+        logger.info(f"Weight sweep: {len(weight_sets)} weight sets x {len(roster_ids)} teams")
+        return sweep
+    
     def _generate_real_insights(self, cpr_metrics: List[CPRMetrics], 
                                teams: List[Team], players: Dict[str, Player]) -> List[str]:
         """Generate insights using REAL algorithm analysis"""
@@ -317,19 +865,15 @@ class CPREngine:
         
         return insights
     
+    def _get_team_scores(self, team: Team) -> List[float]:
+        """Get a team's weekly points (from the bound context when there is one)"""
+        if self.context is not None:
+            return list(self.context.team_scores(int(team.team_id)))
+        return self.matchup_store.get_team_scores(team.team_id)
+    
     def _get_total_points(self, team: Team, all_teams: List[Team]) -> float:
         """Get total points for a team from weekly matchups"""
-        total_points = 0.0
-        for week in range(1, 9): # Assuming 8 weeks
-            try:
-                matchups = make_sleeper_request(f"league/{self.league_id}/matchups/{week}")
-                for m in matchups:
-                    if m['roster_id'] == int(team.team_id):
-                        total_points += m['points']
-                        break
-            except Exception:
-                continue
-        return total_points
+        return float(sum(self._get_team_scores(team)))
 
     def _serialize_cpr_metrics(self, metrics: CPRMetrics) -> Dict[str, Any]:
         """Convert CPRMetrics to dictionary for JSON serialization"""
@@ -349,9 +893,9 @@ class CPREngine:
             'cpr_tier': metrics.cpr_tier
         }
     
-def get_algorithm_explanation(self) -> str:
-    """Get explanation of REAL CPR algorithms"""
-    return """
+    def get_algorithm_explanation(self) -> str:
+        """Get explanation of REAL CPR algorithms"""
+        return """
 REAL CPR ALGORITHM BREAKDOWN:
 
 TRADITIONAL COMPONENTS (65%):
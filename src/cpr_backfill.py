@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+CPR BACKFILL
+Week-by-week league history (records, momentum, score spread, schedule counts and
+player form as of every week) from prefix sums over the weekly score matrices
+"""
+
+import logging
+from typing import Dict, List, Any, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+def score_matrix(matchups: Dict[int, List[Dict[str, Any]]], weeks: List[int],
+                 index: Dict[int, int]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Weeks x teams points, played mask and opponent column (-1 on a bye)"""
+    scores = np.zeros((len(weeks), len(index)))
+    played = np.zeros((len(weeks), len(index)), dtype=bool)
+    opponent = np.full((len(weeks), len(index)), -1, dtype=np.intp)
+    for w, week in enumerate(weeks):
+        by_matchup: Dict[Any, List[int]] = {}
+        for entry in matchups.get(week) or []:
+            if entry.get('roster_id') is None or int(entry['roster_id']) not in index:
+                continue
+            col = index[int(entry['roster_id'])]
+            scores[w, col] = entry.get('points') or 0.0
+            played[w, col] = True
+            if entry.get('matchup_id') is not None:
+                by_matchup.setdefault(int(entry['matchup_id']), []).append(col)
+        for cols in by_matchup.values():
+            if len(cols) == 2:
+                opponent[w, cols[0]], opponent[w, cols[1]] = cols[1], cols[0]
+    return scores, played, opponent
+
+def prefix_records(scores: np.ndarray, opponent: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Cumulative (wins + ties / 2) and games as of each week, weeks x teams"""
+    has_game = opponent >= 0
+    rows = np.arange(scores.shape[0])[:, None]
+    opponent_scores = scores[rows, np.where(has_game, opponent, 0)]
+    results = np.where(scores > opponent_scores, 1.0, np.where(scores == opponent_scores, 0.5, 0.0))
+    return np.cumsum(np.where(has_game, results, 0.0), axis=0), np.cumsum(has_game, axis=0)
+
+def prefix_slopes(scores: np.ndarray, played: np.ndarray) -> np.ndarray:
+    """Least-squares slope of each team's scores against game number as of each week
+    (NaN with fewer than two scores); equals np.polyfit(range(n), scores, 1)[0]"""
+    y = np.where(played, scores, 0.0)
+    n = np.cumsum(played, axis=0)
+    position = n - played                      # 0-based game number of each week's score
+    sum_y = np.cumsum(y, axis=0)
+    sum_xy = np.cumsum(position * y, axis=0)
+    sum_x = n * (n - 1) / 2.0
+    sum_xx = (n - 1) * n * (2 * n - 1) / 6.0
+    denominator = n * sum_xx - sum_x ** 2
+    return np.divide(n * sum_xy - sum_x * sum_y, denominator,
+                     out=np.full(scores.shape, np.nan), where=n >= 2)
+
+def prefix_variances(scores: np.ndarray, played: np.ndarray) -> np.ndarray:
+    """Sample variance of each team's scores as of each week (NaN with fewer than two)"""
+    y = np.where(played, scores, 0.0)
+    n = np.cumsum(played, axis=0)
+    sum_y = np.cumsum(y, axis=0)
+    sum_yy = np.cumsum(y * y, axis=0)
+    centered = sum_yy - np.divide(sum_y ** 2, n, out=np.zeros_like(sum_y), where=n > 0)
+    return np.divide(np.maximum(centered, 0.0), n - 1, out=np.full(scores.shape, np.nan), where=n >= 2)
+
+def prefix_schedule_counts(opponent: np.ndarray) -> np.ndarray:
+    """Weeks x teams x teams games played between each pair as of each week"""
+    num_weeks, num_teams = opponent.shape
+    weekly = np.zeros((num_weeks, num_teams, num_teams))
+    weeks, teams = np.nonzero(opponent >= 0)
+    weekly[weeks, teams, opponent[weeks, teams]] = 1.0
+    return np.cumsum(weekly, axis=0)
+
+def prefix_ppg(points: np.ndarray, rostered: np.ndarray) -> np.ndarray:
+    """Players x weeks points per rostered week as of each week (NaN before the first)"""
+    totals = np.cumsum(points, axis=1)
+    weeks = np.cumsum(rostered, axis=1)
+    return np.divide(totals, weeks, out=np.full(points.shape, np.nan), where=weeks > 0)
+
+def weekly_lineups(matchups: Dict[int, List[Dict[str, Any]]], week: int,
+                   fallback: Dict[int, Tuple[List[str], List[str]]]) -> Dict[int, Tuple[List[str], List[str]]]:
+    """roster_id -> (starters, roster) for a week, from the matchup entry when it lists them"""
+    lineups = dict(fallback)
+    for entry in matchups.get(week) or []:
+        if entry.get('roster_id') is None:
+            continue
+        roster_id = int(entry['roster_id'])
+        starters = [p for p in entry.get('starters') or [] if p and p != '0']
+        roster = [p for p in entry.get('players') or [] if p and p != '0']
+        if starters or roster:
+            default_starters, default_roster = fallback.get(roster_id, ([], []))
+            lineups[roster_id] = (starters or default_starters, roster or default_roster)
+    return lineups
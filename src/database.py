@@ -403,6 +403,10 @@ class LocalDatabase(Database):
         os.makedirs(data_dir, exist_ok=True)
         logger.info(f"Using local database: {data_dir}")
     
+    def _path(self, kind: str, league_id: str, suffix: str = 'latest') -> str:
+        """League-scoped file for a kind of rankings, so leagues run together don't collide"""
+        return os.path.join(self.data_dir, f'{kind}_{league_id}_{suffix}.json')
+    
     @property
     def is_connected(self) -> bool:
         return True
@@ -418,15 +422,12 @@ class LocalDatabase(Database):
             }
             
             # Save latest
-            latest_path = os.path.join(self.data_dir, 'cpr_rankings_latest.json')
+            latest_path = self._path('cpr_rankings', league_id)
             with open(latest_path, 'w') as f:
                 json.dump(rankings_data, f, indent=2)
             
             # Save with timestamp
-            timestamp_path = os.path.join(
-                self.data_dir, 
-                f'cpr_rankings_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json'
-            )
+            timestamp_path = self._path('cpr_rankings', league_id, datetime.now().strftime("%Y%m%d_%H%M%S"))
             with open(timestamp_path, 'w') as f:
                 json.dump(rankings_data, f, indent=2)
             
@@ -440,7 +441,7 @@ class LocalDatabase(Database):
     def get_cpr_rankings(self, league_id: str, latest_only: bool = True) -> Optional[Dict[str, Any]]:
         """Get CPR rankings from local file"""
         try:
-            latest_path = os.path.join(self.data_dir, 'cpr_rankings_latest.json')
+            latest_path = self._path('cpr_rankings', league_id)
             
             if os.path.exists(latest_path):
                 with open(latest_path, 'r') as f:
@@ -464,15 +465,12 @@ class LocalDatabase(Database):
             }
             
             # Save latest
-            latest_path = os.path.join(self.data_dir, 'niv_rankings_latest.json')
+            latest_path = self._path('niv_rankings', league_id)
             with open(latest_path, 'w') as f:
                 json.dump(niv_data, f, indent=2)
             
             # Save with timestamp
-            timestamp_path = os.path.join(
-                self.data_dir, 
-                f'niv_rankings_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json'
-            )
+            timestamp_path = self._path('niv_rankings', league_id, datetime.now().strftime("%Y%m%d_%H%M%S"))
             with open(timestamp_path, 'w') as f:
                 json.dump(niv_data, f, indent=2)
             
@@ -486,7 +484,7 @@ class LocalDatabase(Database):
     def get_niv_data(self, league_id: str, latest_only: bool = True) -> Optional[Dict[str, Any]]:
         """Get NIV data from local file"""
         try:
-            latest_path = os.path.join(self.data_dir, 'niv_rankings_latest.json')
+            latest_path = self._path('niv_rankings', league_id)
             
             if os.path.exists(latest_path):
                 with open(latest_path, 'r') as f:
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+IMMUTABLE STORE
+Permanent compact cache for Sleeper data that can no longer change
+(past-season stats and completed-week matchups)
+"""
+
+import os
+import re
+import json
+import time
+import zlib
+import sqlite3
+import threading
+import logging
+from typing import Dict, Any, Optional, Callable
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORE_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'cache', 'immutable.sqlite3')
+STATE_REFRESH_SECONDS = 300
+# Weeks after a week ends during which Sleeper may still apply stat corrections to it
+STAT_CORRECTION_WEEKS = 1
+
+# Endpoint patterns that become immutable once their season/week is over
+_SEASON_STATS = re.compile(r"^(?:stats|projections)/nfl/(?:regular|post)/(\d{4})(?:/(\d+))?$")
+_LEAGUE_MATCHUPS = re.compile(r"^league/[^/]+/matchups/(\d+)$")
+
+def classify_endpoint(endpoint: str, nfl_state: Optional[Dict[str, Any]]) -> bool:
+    """Classify an endpoint as immutable (True) or mutable (False) given state/nfl"""
+    if not nfl_state:
+        return False
+
+    try:
+        current_season = int(nfl_state.get('season'))
+        current_week = int(nfl_state.get('week') or 0)
+    except (TypeError, ValueError):
+        return False
+
+    match = _SEASON_STATS.match(endpoint)
+    if match:
+        season = int(match.group(1))
+        if season < current_season:
+            return True
+        # Weekly splits of the current season are final once the stat-correction window is over
+        week = match.group(2)
+        return (season == current_season and week is not None and nfl_state.get('season_type') == 'regular'
+                and int(week) < current_week - STAT_CORRECTION_WEEKS)
+
+    match = _LEAGUE_MATCHUPS.match(endpoint)
+    if match:
+        # The endpoint doesn't carry the league's season, so weeks are judged against the
+        # current NFL week and only while the NFL season is under way: outside it (season_type
+        # 'pre'/'off') no league's matchups are frozen, past-season leagues included
+        return (nfl_state.get('season_type') in ('regular', 'post')
+                and int(match.group(1)) < current_week - STAT_CORRECTION_WEEKS)
+
+    return False
+
+class ImmutableStore:
+    """zlib-compressed, SQLite-backed permanent store for immutable Sleeper responses"""
+
+    def __init__(self, path: str = DEFAULT_STORE_PATH,
+                 state_fn: Callable[[], Optional[Dict[str, Any]]] = None):
+        self.path = path
+        self._state_fn = state_fn
+        self._state: Optional[Dict[str, Any]] = None
+        self._state_loaded_at = 0.0
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'writes': 0}
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "endpoint TEXT PRIMARY KEY, data BLOB NOT NULL, stored_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def _nfl_state(self) -> Optional[Dict[str, Any]]:
+        """Get state/nfl, refreshed at most every few minutes"""
+        if self._state is not None and time.time() - self._state_loaded_at < STATE_REFRESH_SECONDS:
+            return self._state
+
+        state_fn = self._state_fn
+        if state_fn is None:
+            try:
+                from .utils import make_sleeper_request
+            except ImportError:
+                from utils import make_sleeper_request
+            state_fn = lambda: make_sleeper_request("state/nfl")
+
+        state = state_fn()
+        if state:
+            self._state = state
+            self._state_loaded_at = time.time()
+        return self._state
+
+    def is_immutable(self, endpoint: str) -> bool:
+        """Check whether an endpoint's data can no longer change"""
+        if endpoint == "state/nfl":
+            return False
+        if not (_SEASON_STATS.match(endpoint) or _LEAGUE_MATCHUPS.match(endpoint)):
+            return False
+        return classify_endpoint(endpoint, self._nfl_state())
+
+    def get(self, endpoint: str) -> Optional[Any]:
+        """Get a stored response (None if absent)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM responses WHERE endpoint = ?", (endpoint,)
+            ).fetchone()
+            self._stats['hits' if row else 'misses'] += 1
+
+        if row is None:
+            return None
+        return json.loads(zlib.decompress(row[0]))
+
+    def set(self, endpoint: str, data: Any) -> None:
+        """Store a response permanently (empty responses are skipped)"""
+        if not data:
+            return
+
+        blob = zlib.compress(json.dumps(data, separators=(',', ':')).encode('utf-8'), 6)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (endpoint, data, stored_at) VALUES (?, ?, ?)",
+                (endpoint, blob, time.time())
+            )
+            self._conn.commit()
+            self._stats['writes'] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and stored size"""
+        with self._lock:
+            stats = dict(self._stats)
+            count, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(data)), 0) FROM responses"
+            ).fetchone()
+        stats['entries'] = count
+        stats['bytes'] = size
+        return stats
+
+    def close(self) -> None:
+        """Close the underlying database"""
+        with self._lock:
+            self._conn.close()
+
+_ENV_DISABLED = os.getenv('CPR_CACHE_DISABLED', 'false').lower() == 'true'
+_store: Optional[ImmutableStore] = None
+_store_enabled = not _ENV_DISABLED
+_store_lock = threading.Lock()
+
+def get_immutable_store() -> Optional[ImmutableStore]:
+    """Get the shared immutable store (None when disabled)"""
+    global _store
+
+    if not _store_enabled:
+        return None
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ImmutableStore(os.getenv('CPR_IMMUTABLE_STORE', DEFAULT_STORE_PATH))
+    return _store
+
+def configure_immutable_store(enabled: bool = None, path: str = None) -> Optional[ImmutableStore]:
+    """Reconfigure (or disable) the shared immutable store"""
+    global _store, _store_enabled
+
+    with _store_lock:
+        if enabled is not None:
+            _store_enabled = enabled
+        if _store is not None and (not _store_enabled or path):
+            _store.close()
+            _store = None
+        if _store_enabled and path:
+            _store = ImmutableStore(path)
+        return _store if _store_enabled else None
+
+def configure_immutable_store_from_settings(config: Dict[str, Any]) -> Optional[ImmutableStore]:
+    """Apply data_sources.sleeper.immutable_cache and performance.enable_caching"""
+    sleeper = config.get('data_sources', {}).get('sleeper', {})
+    performance = config.get('performance', {})
+    enabled = sleeper.get('immutable_cache', True) and performance.get('enable_caching', True)
+    return configure_immutable_store(enabled=bool(enabled) and not _ENV_DISABLED)
@@ -5,39 +5,44 @@ Real HHI-based positional balance calculator for CPR framework
 """
 
 import math
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Sequence
 from collections import Counter
 import logging
 
 try:
     from .models import Team, Player, Position
     from .utils import make_sleeper_request
+    from .lineup_optimizer import LEGION_SLOTS
 except ImportError:
     from models import Team, Player, Position
     from utils import make_sleeper_request
+    from lineup_optimizer import LEGION_SLOTS
 
 logger = logging.getLogger(__name__)
 
 class IngramCalculator:
     """Calculate Ingram Index using HHI positional balance methodology"""
     
-    def __init__(self):
-        # Legion roster structure (from memory)
-        self.starter_positions = {
-            'QB': 1,    # 1 QB (locked)
-            'RB': 1,    # 1 RB (locked) 
-            'WR': 1,    # 1 WR (locked)
-            'FLEX_WRT': 2,  # 2 W/R/T FLEX slots
-            'FLEX_WT': 1,   # 1 W/T FLEX slot
-            'IDP': 1    # 1 IDP slot
-        }
-        self.total_starters = 7
+    def __init__(self, lineup_slots: Sequence[str] = LEGION_SLOTS):
+        # Starting slots (Legion by default: QB, RB, WR, 2x W/R/T FLEX, W/T FLEX, IDP);
+        # CPREngine.set_roster_positions sets the league's own
+        self.lineup_slots = tuple(lineup_slots)
         self.bench_size = 5  # 5 bench + 1 IR
         
         # Weights from memory
         self.starter_weight = 0.7
         self.bench_weight = 0.3
     
+    @property
+    def starter_positions(self) -> Dict[str, int]:
+        """Number of starting slots of each kind"""
+        return dict(Counter(self.lineup_slots))
+    
+    @property
+    def total_starters(self) -> int:
+        """Number of starting slots"""
+        return len(self.lineup_slots)
+    
     def _get_position_category(self, position: Position) -> str:
         """Map position to HHI category"""
         if position == Position.QB:
@@ -81,8 +86,8 @@ class IngramCalculator:
         """Calculate Ingram Index for a team using real HHI methodology"""
         
         # Get starters and bench
-        starters = team.starters[:self.total_starters]  # Ensure exactly 7 starters
-        bench = [p for p in team.roster if p not in starters][:self.bench_size]  # Max 5 bench
+        starters = team.starters[:self.total_starters]  # At most one player per starting slot
+        bench = [p for p in team.roster if p not in starters][:self.bench_size]  # At most bench_size bench
         
         if not starters:
             logger.warning(f"Team {team.team_name} has no starters")
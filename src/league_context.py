@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+LEAGUE CONTEXT
+Immutable per-run snapshot of league data shared by every CPR calculator
+"""
+
+import logging
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, List, Any, Optional, Mapping, Tuple
+
+try:
+    from .models import Team, Player
+    from .matchup_store import MatchupStore
+    from .schedule_graph import ScheduleGraph
+    from .points_matrix import PointsMatrix, PointsMatrixStore
+    from .utils import make_sleeper_request
+except ImportError:
+    from models import Team, Player
+    from matchup_store import MatchupStore
+    from schedule_graph import ScheduleGraph
+    from points_matrix import PointsMatrix, PointsMatrixStore
+    from utils import make_sleeper_request
+
+logger = logging.getLogger(__name__)
+
+def _frozen(mapping: Dict) -> Mapping:
+    """Read-only view of a dict"""
+    return MappingProxyType(mapping)
+
+def current_nfl_week() -> Optional[int]:
+    """The NFL week from state/nfl while the season is under way (None otherwise or when unavailable)"""
+    state = make_sleeper_request("state/nfl")
+    if not state or state.get('season_type') not in ('regular', 'post'):
+        return None
+    try:
+        return int(state.get('week'))
+    except (TypeError, ValueError):
+        return None
+
+@dataclass(frozen=True)
+class LeagueContext:
+    """Everything a CPR run reads, fetched and indexed once
+
+    Built once per run and passed to every calculator. Roster IDs are normalized to
+    ints at build time so calculators never convert IDs in their inner loops. The
+    matchup entries themselves are the raw Sleeper dicts and are treated as read-only.
+    """
+    league_id: str
+    teams: Tuple[Team, ...]
+    players: Mapping[str, Player]
+    weeks: Tuple[int, ...]
+    matchups: Mapping[int, Tuple[Dict[str, Any], ...]]            # week -> raw entries
+    weekly: Mapping[int, Mapping[int, Dict[str, Any]]]            # week -> roster_id -> entry
+    team_index: Mapping[int, Team]                                # roster_id -> Team
+    scores: Mapping[int, Tuple[float, ...]]                       # roster_id -> points in week order
+    schedule: ScheduleGraph                                       # who plays whom, by week
+    points_matrix: PointsMatrix                                   # players x weeks players_points
+    draft_id: Optional[str]
+    draft_picks: Tuple[Dict[str, Any], ...]
+    adp_mapping: Mapping[str, Dict[str, Any]]                     # player_id -> pick info
+    legion_teams: Mapping[int, Dict[str, Any]]                    # roster_id -> Legion team data
+
+    @classmethod
+    def build(cls, league_id: str, teams: List[Team], players: Dict[str, Player],
+              matchup_store: MatchupStore, draft_data: Dict[str, Any] = None,
+              legion_teams: List[Dict[str, Any]] = None,
+              points_store: PointsMatrixStore = None, current_week: int = None) -> 'LeagueContext':
+        """Index loaded matchups, draft picks and Legion team data into a context
+
+        The points matrix is read back from `points_store` for its completed weeks when given;
+        weeks are completed relative to the NFL `current_week` (default: from state/nfl).
+        """
+        weeks = tuple(matchup_store.weeks)
+        all_matchups = matchup_store.get_all_matchups(weeks)
+
+        weekly = {}
+        scores = {}
+        for week in weeks:
+            by_roster = {}
+            for entry in all_matchups.get(week, []):
+                if entry.get('roster_id') is None:
+                    continue
+                roster_id = int(entry['roster_id'])
+                by_roster[roster_id] = entry
+                scores.setdefault(roster_id, []).append(entry.get('points', 0.0))
+            weekly[week] = _frozen(by_roster)
+
+        if points_store is not None:
+            if current_week is None:
+                current_week = current_nfl_week()
+            points_matrix = points_store.update(all_matchups, weeks, current_week)
+        else:
+            points_matrix = PointsMatrix.from_matchups(all_matchups, weeks)
+
+        draft_data = draft_data or {}
+        context = cls(
+            league_id=league_id,
+            teams=tuple(teams),
+            players=_frozen(dict(players)),
+            weeks=weeks,
+            matchups=_frozen({week: tuple(entries) for week, entries in all_matchups.items()}),
+            weekly=_frozen(weekly),
+            team_index=_frozen({int(team.team_id): team for team in teams}),
+            scores=_frozen({roster_id: tuple(points) for roster_id, points in scores.items()}),
+            schedule=ScheduleGraph(all_matchups),
+            points_matrix=points_matrix,
+            draft_id=draft_data.get('draft_id'),
+            draft_picks=tuple(draft_data.get('picks', [])),
+            adp_mapping=_frozen(dict(draft_data.get('adp_mapping', {}))),
+            legion_teams=_frozen({int(team['roster_id']): team for team in (legion_teams or [])})
+        )
+        logger.debug(f"League context built: {len(teams)} teams, {len(weeks)} weeks, "
+                     f"{len(context.draft_picks)} draft picks")
+        return context
+
+    def draft_data(self) -> Dict[str, Any]:
+        """Draft data in the shape LeagueContext.build takes (to rebuild without refetching)"""
+        return {'draft_id': self.draft_id, 'picks': list(self.draft_picks), 'adp_mapping': dict(self.adp_mapping)}
+
+    def team(self, roster_id: int) -> Optional[Team]:
+        """Team for a roster_id"""
+        return self.team_index.get(roster_id)
+
+    def team_scores(self, roster_id: int) -> Tuple[float, ...]:
+        """A team's weekly points in week order"""
+        return self.scores.get(roster_id, ())
+
+    def team_opponents(self, roster_id: int) -> Tuple[int, ...]:
+        """A team's opponents in week order"""
+        return self.schedule.opponents(roster_id)
+
+    def display_name(self, team: Team) -> str:
+        """Legion team name, falling back to the team's own name"""
+        team_data = self.legion_teams.get(int(team.team_id))
+        return team_data['team_name'] if team_data else team.team_name
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+LEAGUE SYNC
+Incremental weekly sync of league state against a persisted cursor
+(last synced week, last transaction leg, roster hash)
+"""
+
+import os
+import json
+import time
+import hashlib
+import tempfile
+import logging
+from typing import Dict, List, Any, Optional
+
+try:
+    from .utils import make_sleeper_request
+    from .sleeper_client import fetch_many, DEFAULT_MAX_CONCURRENT
+except ImportError:
+    from utils import make_sleeper_request
+    from sleeper_client import fetch_many, DEFAULT_MAX_CONCURRENT
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SYNC_DIR = os.path.join(os.path.dirname(__file__), '..', 'data', 'cache', 'league_sync')
+
+def _digest(data: Any) -> str:
+    """Stable content hash of a JSON-serializable value"""
+    return hashlib.sha1(json.dumps(data, sort_keys=True, separators=(',', ':')).encode('utf-8')).hexdigest()
+
+def roster_hashes(rosters: List[Dict[str, Any]]) -> Dict[str, str]:
+    """Per-roster content hashes keyed by roster_id"""
+    return {str(roster.get('roster_id')): _digest(roster) for roster in rosters}
+
+class LeagueSync:
+    """Persisted league state kept current by fetching only what changed since the last run
+
+    Completed weeks are never refetched: each run pulls rosters, the matchups from the
+    last synced week through the current one, and transactions from the last synced
+    leg onward, then merges them into the state file.
+    """
+
+    def __init__(self, league_id: str, path: str = None, max_concurrent: int = DEFAULT_MAX_CONCURRENT):
+        self.league_id = league_id
+        self.path = path or os.path.join(DEFAULT_SYNC_DIR, f"{league_id}.json")
+        self.max_concurrent = max_concurrent
+        self.state: Optional[Dict[str, Any]] = self._load()
+
+    def _load(self) -> Optional[Dict[str, Any]]:
+        """Read the persisted state (None when missing or unreadable)"""
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, 'r') as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding unreadable league state {self.path}: {e}")
+            return None
+
+        # JSON object keys are strings; weeks and legs are ints in memory
+        state['matchups'] = {int(week): data for week, data in state.get('matchups', {}).items()}
+        state['transactions'] = {int(leg): data for leg, data in state.get('transactions', {}).items()}
+        return state
+
+    def save(self) -> None:
+        """Persist the state atomically (temp file + rename)"""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(self.state, f, separators=(',', ':'))
+            os.replace(tmp_path, self.path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    @property
+    def cursor(self) -> Optional[Dict[str, Any]]:
+        return self.state.get('cursor') if self.state else None
+
+    def _fetch(self, endpoints: List[str]) -> Dict[str, Any]:
+        """Fetch endpoints concurrently"""
+        if len(endpoints) == 1 or self.max_concurrent <= 1:
+            return {endpoint: make_sleeper_request(endpoint) for endpoint in endpoints}
+        return fetch_many(endpoints, self.max_concurrent, make_sleeper_request)
+
+    def sync(self, full: bool = False) -> Dict[str, Any]:
+        """Bring the state up to date; returns what was fetched and what changed"""
+        nfl_state = make_sleeper_request("state/nfl") or {}
+        week = max(1, int(nfl_state.get('week') or 1))
+        leg = max(1, int(nfl_state.get('leg') or week))
+        season = str(nfl_state.get('season', ''))
+
+        cursor = self.cursor
+        full = full or cursor is None or bool(season and cursor.get('season') != season)
+        first_week = 1 if full else min(cursor['week'], week)
+        first_leg = 1 if full else min(cursor['transaction_leg'], leg)
+        weeks = list(range(first_week, week + 1))
+        legs = list(range(first_leg, leg + 1))
+
+        base = f"league/{self.league_id}"
+        endpoints = [f"{base}/rosters"]
+        if full:
+            endpoints += [base, f"{base}/users"]
+        endpoints += [f"{base}/matchups/{w}" for w in weeks]
+        endpoints += [f"{base}/transactions/{l}" for l in legs]
+        responses = self._fetch(endpoints)
+        requests_made = len(endpoints) + 1
+
+        if full:
+            self.state = {'league_id': self.league_id, 'league': None, 'users': [], 'rosters': [],
+                          'roster_hashes': {}, 'matchups': {}, 'transactions': {}}
+        state = self.state
+
+        # Rosters: detect which teams changed since the last sync
+        rosters = responses.get(f"{base}/rosters")
+        changed_rosters: List[str] = []
+        if rosters is not None:
+            hashes = roster_hashes(rosters)
+            changed_rosters = sorted(rid for rid, digest in hashes.items()
+                                     if state['roster_hashes'].get(rid) != digest)
+            state['rosters'] = rosters
+            state['roster_hashes'] = hashes
+
+        # League settings and owners only move with roster changes (new owners, renames)
+        if full:
+            state['league'] = responses.get(base) or state['league']
+            state['users'] = responses.get(f"{base}/users") or state['users']
+        elif changed_rosters:
+            extra = self._fetch([base, f"{base}/users"])
+            requests_made += 2
+            state['league'] = extra.get(base) or state['league']
+            state['users'] = extra.get(f"{base}/users") or state['users']
+
+        for w in weeks:
+            matchups = responses.get(f"{base}/matchups/{w}")
+            if matchups is not None:
+                state['matchups'][w] = matchups
+
+        new_transactions = 0
+        for l in legs:
+            fetched = responses.get(f"{base}/transactions/{l}")
+            if fetched is None:
+                continue
+            known = {t.get('transaction_id') for t in state['transactions'].get(l, [])}
+            new_transactions += sum(1 for t in fetched if t.get('transaction_id') not in known)
+            merged = {t.get('transaction_id'): t for t in state['transactions'].get(l, [])}
+            merged.update((t.get('transaction_id'), t) for t in fetched)
+            state['transactions'][l] = list(merged.values())
+
+        state['cursor'] = {
+            'season': season or (cursor or {}).get('season'),
+            'week': week,
+            'transaction_leg': leg,
+            'roster_hash': _digest(state['rosters']),
+            'synced_at': time.time()
+        }
+        self.save()
+
+        summary = {
+            'mode': 'full' if full else 'incremental',
+            'requests': requests_made,
+            'weeks': weeks,
+            'legs': legs,
+            'changed_rosters': changed_rosters,
+            'new_transactions': new_transactions
+        }
+        logger.info(f"League sync ({summary['mode']}): {requests_made} requests, weeks {weeks}, "
+                    f"{len(changed_rosters)} rosters changed, {new_transactions} new transactions")
+        return summary
+
+    def matchups(self) -> Dict[int, List[Dict[str, Any]]]:
+        """Synced matchups by week"""
+        return dict(self.state['matchups']) if self.state else {}
+
+    def transactions(self) -> List[Dict[str, Any]]:
+        """Every synced transaction, oldest leg first"""
+        if not self.state:
+            return []
+        return [t for leg in sorted(self.state['transactions']) for t in self.state['transactions'][leg]]
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+LINEUP OPTIMIZER
+Best starting lineup (and its points) for a set of players and a league's
+starting slots, as listed in the Sleeper league's roster_positions
+"""
+
+import logging
+from typing import Dict, List, Any, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from .models import Position, LeagueInfo
+except ImportError:
+    from models import Position, LeagueInfo
+
+logger = logging.getLogger(__name__)
+
+_WRT = frozenset({Position.WR, Position.RB, Position.TE})
+_WT = frozenset({Position.WR, Position.TE})
+
+# Positions each lineup slot accepts (Sleeper roster_positions names plus the Ingram
+# FLEX_WRT/FLEX_WT names). Players carry grouped positions, so DL/LB/DB take any IDP.
+SLOT_ELIGIBILITY = {
+    'QB': frozenset({Position.QB}),
+    'RB': frozenset({Position.RB}),
+    'WR': frozenset({Position.WR}),
+    'TE': frozenset({Position.TE}),
+    'K': frozenset({Position.K}),
+    'DEF': frozenset({Position.DEF}),
+    'IDP': frozenset({Position.IDP}),
+    'DL': frozenset({Position.IDP}),
+    'LB': frozenset({Position.IDP}),
+    'DB': frozenset({Position.IDP}),
+    'IDP_FLEX': frozenset({Position.IDP}),
+    'FLEX': _WRT,
+    'FLEX_WRT': _WRT,
+    'REC_FLEX': _WT,
+    'FLEX_WT': _WT,
+    'WRRB_FLEX': frozenset({Position.WR, Position.RB}),
+    'SUPER_FLEX': frozenset({Position.QB, Position.WR, Position.RB, Position.TE}),
+}
+
+NON_STARTING_SLOTS = {'BN', 'IR', 'TAXI'}
+
+# Legion starting lineup: QB, RB, WR, 2x W/R/T FLEX, W/T FLEX, IDP
+LEGION_SLOTS = ('QB', 'RB', 'WR', 'FLEX_WRT', 'FLEX_WRT', 'FLEX_WT', 'IDP')
+
+def starting_slots(roster_positions: Sequence[str]) -> Tuple[str, ...]:
+    """Starting slots from a roster_positions list (bench, IR, taxi and unknown slots dropped)"""
+    slots = []
+    for slot in roster_positions or ():
+        slot = str(slot).upper()
+        if slot in NON_STARTING_SLOTS:
+            continue
+        if slot not in SLOT_ELIGIBILITY:
+            logger.warning(f"Ignoring unknown roster slot {slot}")
+            continue
+        slots.append(slot)
+    return tuple(slots)
+
+def fill_order(slots: Sequence[str]) -> List[str]:
+    """Slots ordered most restrictive first"""
+    return sorted(slots, key=lambda slot: len(SLOT_ELIGIBILITY[slot]))
+
+def is_laminar(slots: Sequence[str]) -> bool:
+    """Whether every two slots accept nested or disjoint position sets
+
+    Then filling the narrowest slots first with the best eligible player left is optimal.
+    """
+    sets = {SLOT_ELIGIBILITY[slot] for slot in slots}
+    return all(a <= b or b <= a or not (a & b) for a in sets for b in sets)
+
+def eligibility_matrix(positions: Optional[Sequence[Position]], slots: Sequence[str]) -> np.ndarray:
+    """Slots (in fill order) x players bool matrix; without positions every player fits every slot"""
+    ordered = fill_order(slots)
+    if positions is None:
+        return np.ones((len(ordered), 0), dtype=bool)
+    return np.array([[position in SLOT_ELIGIBILITY[slot] for position in positions] for slot in ordered],
+                    dtype=bool).reshape(len(ordered), len(positions))
+
+def _fill_greedy(remaining: np.ndarray, rows: np.ndarray, total: np.ndarray) -> None:
+    """Fill slots in order with each week's best eligible player left (in place)"""
+    weeks = np.arange(remaining.shape[1])
+    for row in rows:
+        candidates = remaining if row.size == 0 else np.where(row[:, None], remaining, -np.inf)
+        best = candidates.argmax(axis=0)
+        best_points = candidates[best, weeks]
+        started = best_points > 0
+        total += np.where(started, best_points, 0.0)
+        remaining[best[started], weeks[started]] = -np.inf
+
+def optimal_lineup_points(points: np.ndarray, eligibility: np.ndarray,
+                          available: np.ndarray = None) -> np.ndarray:
+    """Optimal lineup points per week for the available players, by narrowest-slot-first fill
+
+    `points` is players x weeks and `eligibility` is slots x players from
+    eligibility_matrix(); an eligibility with no player columns accepts anyone.
+    Negative scores are never started (the slot is left empty). Exact when the slots
+    are laminar (see is_laminar); LineupSolver handles any slot set.
+    """
+    mask = np.ones(points.shape[0], dtype=bool) if available is None else available
+    remaining = np.where(mask[:, None], points, -np.inf)
+    total = np.zeros(points.shape[1])
+    _fill_greedy(remaining, eligibility, total)
+    return total
+
+class LineupSolver:
+    """Optimal lineups for one league's starting slots
+
+    Single-position slots always take the best players at their position. When the
+    flex slots are laminar (Legion's W/R/T and W/T are) the rest is a greedy fill;
+    otherwise (e.g. WRRB_FLEX next to REC_FLEX) the flex slots are assigned by a
+    dynamic program over which flex slots are filled.
+    """
+
+    def __init__(self, slots: Sequence[str] = LEGION_SLOTS):
+        self.slots = tuple(fill_order(starting_slots(slots)))
+        self.laminar = is_laminar(self.slots)
+        self._dedicated = np.array([len(SLOT_ELIGIBILITY[slot]) == 1 for slot in self.slots], dtype=bool)
+        self._flex_count = int((~self._dedicated).sum())
+
+        # For each flex slot: coalition masks without it, and the same masks with it set
+        masks = np.arange(1 << self._flex_count)
+        self._transitions = [(masks[(masks >> s) & 1 == 0], masks[(masks >> s) & 1 == 0] | (1 << s))
+                             for s in range(self._flex_count)]
+
+    @classmethod
+    def from_roster_positions(cls, roster_positions: Sequence[str]) -> 'LineupSolver':
+        """Solver for a Sleeper roster_positions list (Legion slots when empty)"""
+        slots = starting_slots(roster_positions)
+        return cls(slots if slots else LEGION_SLOTS)
+
+    @classmethod
+    def from_league_info(cls, league_info: LeagueInfo) -> 'LineupSolver':
+        """Solver for a league's roster_positions"""
+        return cls.from_roster_positions(league_info.roster_positions)
+
+    def eligibility(self, positions: Optional[Sequence[Position]]) -> np.ndarray:
+        """Slots x players bool matrix for this league (see eligibility_matrix)"""
+        return eligibility_matrix(positions, self.slots)
+
+    def lineup_points(self, points: np.ndarray, eligibility: np.ndarray,
+                      available: np.ndarray = None) -> np.ndarray:
+        """Optimal lineup points per week; `points` is players x weeks"""
+        if self.laminar or eligibility.shape[1] == 0:
+            return optimal_lineup_points(points, eligibility, available)
+
+        mask = np.ones(points.shape[0], dtype=bool) if available is None else available
+        remaining = np.where(mask[:, None], points, -np.inf)
+        total = np.zeros(points.shape[1])
+        _fill_greedy(remaining, eligibility[self._dedicated], total)
+
+        # dp[m, w]: best points with exactly the flex slots in bitmask m filled
+        flex = eligibility[~self._dedicated]
+        dp = np.full((1 << self._flex_count, points.shape[1]), -np.inf)
+        dp[0] = 0.0
+        for player in np.flatnonzero(flex.any(axis=0)):
+            player_points = np.where(remaining[player] > 0, remaining[player], -np.inf)
+            if not np.isfinite(player_points).any():
+                continue
+            updated = dp.copy()
+            for s in np.flatnonzero(flex[:, player]):
+                without, with_slot = self._transitions[s]
+                updated[with_slot] = np.maximum(updated[with_slot], dp[without] + player_points)
+            dp = updated
+        return total + dp.max(axis=0)
+
+    def solve(self, player_ids: Sequence[str], points: Sequence[float],
+              positions: Sequence[Position]) -> Dict[str, Any]:
+        """Best lineup for one week (or one set of projections)
+
+        Returns the starters as (slot, player_id) pairs in slot fill order (player_id is
+        None for a slot nobody can usefully fill), the bench and the lineup's points.
+        """
+        eligibility = self.eligibility(positions)
+        used = set()
+        lineup: List[Tuple[str, Optional[str]]] = [None] * len(self.slots)
+        order = sorted(range(len(player_ids)), key=lambda i: -points[i])
+
+        def best_for(slot_index: int) -> Optional[int]:
+            return next((i for i in order if i not in used and points[i] > 0 and eligibility[slot_index, i]), None)
+
+        slot_indexes = list(range(len(self.slots)))
+        greedy = slot_indexes if self.laminar else [s for s in slot_indexes if self._dedicated[s]]
+        for s in greedy:
+            pick = best_for(s)
+            if pick is not None:
+                used.add(pick)
+            lineup[s] = (self.slots[s], None if pick is None else player_ids[pick])
+
+        if not self.laminar:
+            flex_slots = [s for s in slot_indexes if not self._dedicated[s]]
+            # mask over flex_slots -> (points, ((slot, player index), ...))
+            states: Dict[int, Tuple[float, Tuple[Tuple[int, int], ...]]] = {0: (0.0, ())}
+            for i in order:
+                if i in used or points[i] <= 0:
+                    continue
+                for mask, (value, assigned) in list(states.items()):
+                    for bit, s in enumerate(flex_slots):
+                        if mask >> bit & 1 or not eligibility[s, i]:
+                            continue
+                        new_mask = mask | (1 << bit)
+                        if value + points[i] > states.get(new_mask, (-np.inf,))[0]:
+                            states[new_mask] = (value + points[i], assigned + ((s, i),))
+            _, assigned = max(states.values(), key=lambda state: state[0])
+            picks = dict(assigned)
+            for s in flex_slots:
+                pick = picks.get(s)
+                if pick is not None:
+                    used.add(pick)
+                lineup[s] = (self.slots[s], None if pick is None else player_ids[pick])
+
+        starters = {player_id for _, player_id in lineup if player_id is not None}
+        return {
+            'lineup': lineup,
+            'bench': [player_id for player_id in player_ids if player_id not in starters],
+            'points': float(sum(points[i] for i in used))
+        }
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+MATCHUP STORE
+League-scoped weekly matchup store shared by all CPR calculators
+"""
+
+import math
+import threading
+import logging
+from typing import Dict, List, Any, Optional, Iterable
+
+try:
+    from .utils import make_sleeper_request
+    from .sleeper_client import fetch_many, DEFAULT_MAX_CONCURRENT
+except ImportError:
+    from utils import make_sleeper_request
+    from sleeper_client import fetch_many, DEFAULT_MAX_CONCURRENT
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WEEKS = list(range(1, 9))  # Weeks 1-8 (current)
+DEFAULT_PLAYOFF_WEEK_START = 15
+DEFAULT_PLAYOFF_TEAMS = 6
+
+def season_weeks(league: Optional[Dict[str, Any]]) -> List[int]:
+    """Every regular-season and playoff week of a Sleeper league, from its settings
+
+    Playoffs start at playoff_week_start and last one week per bracket round;
+    playoff_round_type 1 makes the championship two weeks and 2 makes every round two.
+    """
+    settings = (league or {}).get('settings') or {}
+    start = int(settings.get('playoff_week_start') or DEFAULT_PLAYOFF_WEEK_START)
+    teams = int(settings.get('playoff_teams') or DEFAULT_PLAYOFF_TEAMS)
+    rounds = max(1, math.ceil(math.log2(max(teams, 2))))
+    round_type = int(settings.get('playoff_round_type') or 0)
+    playoff_weeks = rounds * 2 if round_type == 2 else rounds + 1 if round_type == 1 else rounds
+    return list(range(1, start + playoff_weeks))
+
+class MatchupStore:
+    """Load each week's matchups once per run and index them by roster_id and matchup_id"""
+
+    def __init__(self, league_id: str = "1267325171853701120", weeks: Iterable[int] = None,
+                 max_concurrent: int = DEFAULT_MAX_CONCURRENT):
+        self.league_id = league_id
+        self.weeks = list(weeks) if weeks is not None else list(DEFAULT_WEEKS)
+        self.max_concurrent = max_concurrent
+        self.fetch_count = 0
+        self._lock = threading.Lock()
+        self._matchups: Dict[int, List[Dict[str, Any]]] = {}
+        self._by_roster: Dict[int, Dict[int, Dict[str, Any]]] = {}
+        self._by_matchup: Dict[int, Dict[int, List[Dict[str, Any]]]] = {}
+
+    def _endpoint(self, week: int) -> str:
+        """Sleeper endpoint for a week's matchups"""
+        return f"league/{self.league_id}/matchups/{week}"
+
+    def _load_week(self, week: int) -> None:
+        """Fetch and index a single week (caller holds the lock)"""
+        self.fetch_count += 1
+        self._index_week(week, make_sleeper_request(self._endpoint(week)))
+
+    def _index_week(self, week: int, matchups: Optional[List[Dict[str, Any]]]) -> None:
+        """Index a fetched week (caller holds the lock)"""
+        if not matchups:
+            logger.warning(f"No matchups returned for week {week}")
+            matchups = []
+
+        by_roster = {}
+        by_matchup = {}
+        for matchup in matchups:
+            roster_id = matchup.get('roster_id')
+            if roster_id is None:
+                continue
+            by_roster[int(roster_id)] = matchup
+
+            matchup_id = matchup.get('matchup_id')
+            if matchup_id is not None:
+                by_matchup.setdefault(int(matchup_id), []).append(matchup)
+
+        self._matchups[week] = matchups
+        self._by_roster[week] = by_roster
+        self._by_matchup[week] = by_matchup
+
+    def _ensure_week(self, week: int) -> None:
+        """Load a week on first access"""
+        if week in self._matchups:
+            return
+        with self._lock:
+            if week not in self._matchups:
+                self._load_week(week)
+
+    def load(self, weeks: Iterable[int] = None) -> 'MatchupStore':
+        """Eagerly load the given weeks concurrently (defaults to the store's weeks)"""
+        weeks = list(weeks if weeks is not None else self.weeks)
+
+        with self._lock:
+            missing = [week for week in weeks if week not in self._matchups]
+            if len(missing) == 1 or self.max_concurrent <= 1:
+                for week in missing:
+                    self._load_week(week)
+            elif missing:
+                responses = fetch_many([self._endpoint(week) for week in missing], self.max_concurrent,
+                                       make_sleeper_request)
+                self.fetch_count += len(missing)
+                for week in missing:
+                    self._index_week(week, responses.get(self._endpoint(week)))
+        return self
+
+    def prime(self, matchups: Dict[int, List[Dict[str, Any]]]) -> None:
+        """Replace loaded weeks with already-synced matchups (no fetches); primed weeks
+        beyond the store's week range extend it"""
+        with self._lock:
+            self._matchups.clear()
+            self._by_roster.clear()
+            self._by_matchup.clear()
+            for week, week_matchups in matchups.items():
+                self._index_week(int(week), week_matchups)
+            self.weeks = sorted(set(self.weeks) | set(self._matchups))
+
+    def refresh(self) -> None:
+        """Drop all loaded weeks so the next run fetches fresh data"""
+        with self._lock:
+            self._matchups.clear()
+            self._by_roster.clear()
+            self._by_matchup.clear()
+
+    def get_week(self, week: int) -> List[Dict[str, Any]]:
+        """Get raw matchup entries for a week"""
+        self._ensure_week(week)
+        return self._matchups[week]
+
+    def get_all_matchups(self, weeks: Iterable[int] = None) -> Dict[int, List[Dict[str, Any]]]:
+        """Get raw matchups for every week that returned data"""
+        all_matchups = {}
+        for week in (weeks if weeks is not None else self.weeks):
+            matchups = self.get_week(week)
+            if matchups:
+                all_matchups[week] = matchups
+        return all_matchups
+
+    def get_team_matchup(self, week: int, roster_id: Any) -> Optional[Dict[str, Any]]:
+        """Get a team's matchup entry for a week"""
+        self._ensure_week(week)
+        return self._by_roster[week].get(int(roster_id))
+
+    def get_matchup_entries(self, week: int, matchup_id: Any) -> List[Dict[str, Any]]:
+        """Get both sides of a matchup for a week"""
+        self._ensure_week(week)
+        return self._by_matchup[week].get(int(matchup_id), [])
+
+    def get_opponent_matchup(self, week: int, roster_id: Any) -> Optional[Dict[str, Any]]:
+        """Get the opponent's matchup entry for a team in a week"""
+        team_matchup = self.get_team_matchup(week, roster_id)
+        if not team_matchup or team_matchup.get('matchup_id') is None:
+            return None
+
+        for entry in self.get_matchup_entries(week, team_matchup['matchup_id']):
+            if int(entry['roster_id']) != int(roster_id):
+                return entry
+        return None
+
+    def get_team_scores(self, roster_id: Any, weeks: Iterable[int] = None) -> List[float]:
+        """Get a team's weekly points in week order (weeks without a matchup are skipped)"""
+        scores = []
+        for week in (weeks if weeks is not None else self.weeks):
+            team_matchup = self.get_team_matchup(week, roster_id)
+            if team_matchup:
+                scores.append(team_matchup.get('points', 0.0))
+        return scores
@@ -16,6 +16,21 @@ class Position(Enum):
     SUPER_FLEX = "SUPER_FLEX"
     IDP = "IDP"
 
+IDP_POSITIONS = {"DL", "DE", "DT", "LB", "OLB", "ILB", "DB", "CB", "S"}
+
+def position_from_sleeper(pos_str: Optional[str]) -> Position:
+    """Map a Sleeper position string onto Position (IDP roles grouped, FLEX fallback)"""
+    if not pos_str:
+        return Position.FLEX
+    pos_upper = pos_str.upper()
+    if pos_upper in Position.__members__:
+        return Position[pos_upper]
+    if pos_upper in IDP_POSITIONS:
+        return Position.IDP
+    if pos_upper == "DST":
+        return Position.DEF
+    return Position.FLEX
+
 class InjuryStatus(Enum):
     """Injury status enum"""
     ACTIVE = "Active"
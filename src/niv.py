@@ -1,14 +1,141 @@
 """NIV (Net Impact Value) Engine for CPR-NFL system"""
 import logging
 import numpy as np
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple, Iterable
 from datetime import datetime
 import statistics
 
-from .models import Player, Team, NIVMetrics, Position
+try:
+    from .models import Player, Team, NIVMetrics, Position, position_from_sleeper
+    from .points_matrix import PointsMatrix, masked_stats
+except ImportError:
+    from models import Player, Team, NIVMetrics, Position, position_from_sleeper
+    from points_matrix import PointsMatrix, masked_stats
 
 logger = logging.getLogger(__name__)
 
+# Position scarcity multipliers for positional NIV
+POSITION_MULTIPLIERS = {
+    Position.QB: 0.8,   # Less scarce
+    Position.RB: 1.2,   # More scarce
+    Position.WR: 1.0,   # Baseline
+    Position.TE: 1.3,   # Most scarce
+    Position.K: 0.6,    # Least valuable
+    Position.DEF: 0.7,  # Low value
+    Position.IDP: 1.1   # Moderately scarce
+}
+
+EXPLOSIVE_MULTIPLE = 1.5  # an explosive game beats the player's weekly average by 1.5x
+
+def steady_players(stats: Dict[str, np.ndarray]) -> np.ndarray:
+    """Players whose weekly scores rate them, from masked_stats(): two or more counted
+    games and a positive average; everyone else keeps the season-total estimate"""
+    return (stats['games'] > 1) & (np.nan_to_num(stats['mean']) > 0)
+
+def weekly_niv_arrays(points: np.ndarray, played: np.ndarray,
+                      stats: Dict[str, np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Consistency and explosive NIV (0-100) from players x weeks scores, every player at once
+    
+    `played` marks the weeks that count for each player; `stats` is masked_stats() over
+    the same mask when the caller already has it. Consistency is the inverse coefficient
+    of variation (mean / std) mapped onto 0-100 as mean / (mean + std); it needs two
+    games and a positive average (see steady_players, which callers use to fall back to
+    the season estimate). Explosive is the share of counted weeks scoring more than
+    EXPLOSIVE_MULTIPLE x the player's average.
+    """
+    stats = stats if stats is not None else masked_stats(points, played)
+    games = stats['games']
+    mean = np.nan_to_num(stats['mean'])
+    std = np.nan_to_num(stats['std'])
+    
+    steady = steady_players(stats)
+    consistency = np.divide(mean, mean + std, out=np.zeros(len(games)), where=steady) * 100
+    explosive_games = (played & (points > EXPLOSIVE_MULTIPLE * mean[:, None])).sum(axis=1)
+    explosive = np.divide(explosive_games, games, out=np.zeros(len(games)), where=mean > 0) * 100
+    return consistency, explosive
+
+def weekly_stats_matrix(player_ids: List[str],
+                        weekly_stats: Dict[int, Dict[str, Dict[str, Any]]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Players x weeks pts_ppr and played mask from stats/nfl/regular/<season>/<week> payloads
+    
+    A week counts as played when its gp is positive (or, without gp, when it scored).
+    """
+    weeks = sorted(weekly_stats)
+    points = np.zeros((len(player_ids), len(weeks)))
+    played = np.zeros((len(player_ids), len(weeks)), dtype=bool)
+    for w, week in enumerate(weeks):
+        stats = weekly_stats[week] or {}
+        rows = [stats.get(pid) or {} for pid in player_ids]
+        points[:, w] = np.fromiter((row.get('pts_ppr') or 0.0 for row in rows), dtype=np.float64, count=len(rows))
+        played[:, w] = np.fromiter(((row.get('gp') if 'gp' in row else row.get('pts_ppr')) or 0 for row in rows),
+                                   dtype=np.float64, count=len(rows)) != 0
+    return points, played
+
+def niv_arrays(position_codes: np.ndarray, multipliers: np.ndarray, points: np.ndarray,
+               games: np.ndarray, weights: Dict[str, float],
+               weekly: Tuple[np.ndarray, np.ndarray] = None) -> Dict[str, np.ndarray]:
+    """NIV components for many players at once from columnar arrays
+    
+    `position_codes` groups players for the positional percentile and indexes
+    `multipliers`; `points` and `games` are current-season totals (0 without stats).
+    `weekly` is (players x weeks scores, played mask) for weekly_niv_arrays; without
+    it, and for players it doesn't rate (see steady_players), consistency and explosive
+    are estimated from the season totals.
+    Mirrors NIVEngine._calculate_player_niv element-wise, before rounding.
+    """
+    count = len(points)
+    
+    # Positional: share of same-position peers scoring strictly fewer points
+    positional = np.full(count, 50.0)
+    order = np.argsort(position_codes, kind='stable')
+    codes_sorted = position_codes[order]
+    starts = np.flatnonzero(np.r_[True, codes_sorted[1:] != codes_sorted[:-1]]) if count else np.array([], dtype=int)
+    for start, end in zip(starts, np.r_[starts[1:], count]):
+        members = order[start:end]
+        peers = np.sort(points[members])
+        if peers[-1] == 0:
+            continue
+        percentile = np.searchsorted(peers, points[members], side='left') / len(peers) * 100
+        positional[members] = np.minimum(percentile * multipliers[position_codes[members]], 100.0)
+    
+    played = games > 0
+    avg_points = np.divide(points, games, out=np.zeros(count), where=played)
+    
+    market = np.where(points > 0, np.minimum(points / 300.0 * 100, 100.0), 0.0)
+    explosive_games = np.maximum(0.0, np.trunc(games * (avg_points / 15.0) * 0.3))
+    explosive = np.where(played, np.minimum(np.divide(explosive_games, games, out=np.zeros(count),
+                                                      where=played) * 100, 100.0), 0.0)
+    consistency = np.where(played, np.minimum(avg_points / 20.0, 1.0), 0.0) * 100
+    if weekly is not None:
+        stats = masked_stats(*weekly)
+        steady = steady_players(stats)
+        weekly_consistency, weekly_explosive = weekly_niv_arrays(*weekly, stats)
+        consistency = np.where(steady, weekly_consistency, consistency)
+        explosive = np.where(steady, weekly_explosive, explosive)
+    
+    niv = (weights['positional_niv'] * positional + weights['market_niv'] * market +
+           weights['explosive_niv'] * explosive + weights['consistency_niv'] * consistency)
+    return {
+        'niv': niv,
+        'positional_niv': positional,
+        'market_niv': market,
+        'explosive_niv': explosive,
+        'consistency_niv': consistency
+    }
+
+def rank_arrays(niv: np.ndarray, position_codes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Overall and positional ranks (1 = best; ties keep input order)"""
+    order = np.argsort(-niv, kind='stable')
+    ranks = np.empty(len(niv), dtype=np.int64)
+    ranks[order] = np.arange(1, len(niv) + 1)
+    
+    positional_ranks = np.empty(len(niv), dtype=np.int64)
+    codes_in_order = position_codes[order]
+    for code in np.unique(position_codes):
+        members = order[codes_in_order == code]
+        positional_ranks[members] = np.arange(1, len(members) + 1)
+    return ranks, positional_ranks
+
 class NIVEngine:
     """Net Impact Value calculation engine"""
     
@@ -26,8 +153,15 @@ class NIVEngine:
         logger.info(f"NIV Engine initialized for league {league_id}")
         logger.info(f"NIV weights: {self.niv_weights}")
     
-    def calculate_league_niv(self, teams: List[Team], players: Dict[str, Player]) -> Dict[str, Any]:
-        """Calculate NIV rankings for all players in the league"""
+    def calculate_league_niv(self, teams: List[Team], players: Dict[str, Player],
+                             points_matrix: PointsMatrix = None, current_week: int = None) -> Dict[str, Any]:
+        """Calculate NIV rankings for all players in the league
+        
+        With the league's `points_matrix`, consistency and explosive NIV come from each
+        player's weekly scores in the league's matchups (every player in one pass), counting
+        the weeks they played before the NFL `current_week` (see PointsMatrix.played);
+        without it, or with under two played weeks, they are estimated from season totals.
+        """
         logger.info("Starting NIV calculations for league...")
         
         try:
@@ -42,30 +176,24 @@ class NIVEngine:
                     'calculation_timestamp': datetime.now().isoformat()
                 }
             
-            # Calculate NIV components for each player
+            # Calculate NIV components for each player (position peers sorted once)
             niv_rankings = []
+            position_points = self._position_points(rostered_players)
+            weekly = self._weekly_components(list(rostered_players), points_matrix, current_week)
+            team_ids = self._roster_team_ids(teams)
             
             for player_id, player in rostered_players.items():
                 try:
-                    niv_metrics = self._calculate_player_niv(player, rostered_players)
+                    niv_metrics = self._calculate_player_niv(player, rostered_players, position_points,
+                                                             weekly.get(player_id) if weekly else None,
+                                                             team_ids.get(player_id, ''))
                     niv_rankings.append(niv_metrics)
                 except Exception as e:
                     logger.warning(f"Failed to calculate NIV for player {player.name}: {e}")
                     continue
             
-            # Sort by NIV score (highest first)
-            niv_rankings.sort(key=lambda x: x.niv, reverse=True)
-            
-            # Assign ranks
-            for i, metrics in enumerate(niv_rankings):
-                metrics.rank = i + 1
-                # Assign positional ranks
-                position_players = [m for m in niv_rankings if m.position == metrics.position]
-                position_players.sort(key=lambda x: x.niv, reverse=True)
-                metrics.positional_rank = next(
-                    (i + 1 for i, m in enumerate(position_players) if m.player_id == metrics.player_id), 
-                    1
-                )
+            # Sort by NIV score (highest first) and assign overall and positional ranks
+            self._assign_ranks(niv_rankings)
             
             # Assign NIV tiers
             self._assign_niv_tiers(niv_rankings)
@@ -86,24 +214,148 @@ class NIVEngine:
             logger.error(f"NIV calculation failed: {e}")
             raise
     
+    def calculate_universe_niv(self, season_stats: Dict[str, Dict[str, Any]], snapshot: Any = None,
+                               players_db: Dict[str, Dict[str, Any]] = None,
+                               weekly_stats: Dict[int, Dict[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """Calculate NIV for every player in players/nfl, rostered or not
+        
+        Players come from a PlayerSnapshot (position codes read straight from its
+        columns) or a raw players/nfl dict; `season_stats` is the
+        stats/nfl/regular/<season> payload and `weekly_stats` (week -> the
+        stats/nfl/regular/<season>/<week> payload) gives consistency and explosive NIV
+        from real weekly scores. Positional percentiles are taken over the whole
+        universe, and results are returned as arrays aligned with 'player_ids'.
+        """
+        if snapshot is not None:
+            player_ids = snapshot.player_ids()
+            vocabulary = snapshot.vocabulary('position')
+            raw_codes = np.asarray(snapshot.column('position'), dtype=np.int64)
+        else:
+            players_db = players_db or {}
+            player_ids = list(players_db)
+            vocabulary, raw_codes = np.unique(
+                np.array([players_db[pid].get('position') or '' for pid in player_ids], dtype=object).astype(str),
+                return_inverse=True)
+            vocabulary = list(vocabulary)
+        
+        # Collapse Sleeper position strings onto Position groups (DL/LB/DB -> IDP, ...)
+        groups = [position_from_sleeper(value) for value in vocabulary]
+        group_list = list(dict.fromkeys(groups))
+        code_map = np.array([group_list.index(group) for group in groups], dtype=np.int64)
+        position_codes = code_map[raw_codes] if len(raw_codes) else np.zeros(0, dtype=np.int64)
+        multipliers = np.array([POSITION_MULTIPLIERS.get(group, 1.0) for group in group_list])
+        
+        points = np.fromiter(((season_stats.get(pid) or {}).get('pts_ppr') or 0.0 for pid in player_ids),
+                             dtype=np.float64, count=len(player_ids))
+        games = np.fromiter(((season_stats.get(pid) or {}).get('gp') or 0 for pid in player_ids),
+                            dtype=np.float64, count=len(player_ids))
+        
+        weekly = weekly_stats_matrix(player_ids, weekly_stats) if weekly_stats else None
+        components = {key: np.round(values, 2) for key, values in
+                      niv_arrays(position_codes, multipliers, points, games, self.niv_weights, weekly).items()}
+        ranks, positional_ranks = rank_arrays(components['niv'], position_codes)
+        
+        logger.info(f"Universe NIV calculated for {len(player_ids)} players")
+        return {
+            'player_ids': player_ids,
+            'position': [group_list[code].value for code in position_codes],
+            **components,
+            'rank': ranks,
+            'positional_rank': positional_ranks,
+            'total_players': len(player_ids),
+            'algorithm_version': 'NIV_v1.0',
+            'calculation_timestamp': datetime.now().isoformat(),
+            'season': self.current_season
+        }
+    
+    def universe_records(self, universe: Dict[str, Any], player_ids: Iterable[str] = None,
+                         position: str = None, limit: int = None) -> List[Dict[str, Any]]:
+        """Per-player NIV dicts from a universe result, best first (optionally filtered)"""
+        wanted = set(player_ids) if player_ids is not None else None
+        rows = [row for row in np.argsort(universe['rank'], kind='stable')
+                if (wanted is None or universe['player_ids'][row] in wanted)
+                and (position is None or universe['position'][row] == position)]
+        if limit is not None:
+            rows = rows[:limit]
+        return [{
+            'player_id': universe['player_ids'][row],
+            'position': universe['position'][row],
+            'niv': float(universe['niv'][row]),
+            'positional_niv': float(universe['positional_niv'][row]),
+            'market_niv': float(universe['market_niv'][row]),
+            'explosive_niv': float(universe['explosive_niv'][row]),
+            'consistency_niv': float(universe['consistency_niv'][row]),
+            'rank': int(universe['rank'][row]),
+            'positional_rank': int(universe['positional_rank'][row])
+        } for row in rows]
+    
+    def _roster_team_ids(self, teams: List[Team]) -> Dict[str, str]:
+        """player_id -> team_id of the roster the player is on"""
+        return {player_id: team.team_id for team in teams
+                if getattr(team, 'roster', None) for player_id in team.roster}
+    
     def _get_rostered_players(self, teams: List[Team], players: Dict[str, Player]) -> Dict[str, Player]:
-        """Get all players that are on team rosters"""
-        rostered_players = {}
+        """Get all players that are on team rosters
         
-        for team in teams:
-            if hasattr(team, 'roster') and team.roster:
-                for player_id in team.roster:
-                    if player_id in players:
-                        player = players[player_id]
-                        # Add team context to player
-                        player.team_id = team.team_id
-                        rostered_players[player_id] = player
+        Players are not modified (they may be shared with other leagues); see
+        _roster_team_ids for each player's team.
+        """
+        rostered_players = {player_id: players[player_id] for player_id in self._roster_team_ids(teams)
+                            if player_id in players}
         
         logger.info(f"Found {len(rostered_players)} rostered players")
         return rostered_players
     
-    def _calculate_player_niv(self, player: Player, all_players: Dict[str, Player]) -> NIVMetrics:
-        """Calculate NIV metrics for a single player"""
+    def _season_points(self, player: Player) -> float:
+        """Current-season fantasy points (0.0 without stats)"""
+        stats = player.stats.get(self.current_season) if player.stats else None
+        return stats.fantasy_points if stats and stats.fantasy_points else 0.0
+    
+    def _position_points(self, players: Dict[str, Player]) -> Dict[Position, np.ndarray]:
+        """Sorted current-season points per position, built in one pass"""
+        grouped: Dict[Position, List[float]] = {}
+        for player in players.values():
+            grouped.setdefault(player.position, []).append(self._season_points(player))
+        return {position: np.sort(np.array(points, dtype=np.float64)) for position, points in grouped.items()}
+    
+    def _weekly_components(self, player_ids: List[str], points_matrix: Optional[PointsMatrix],
+                           current_week: int = None) -> Optional[Dict[str, Tuple[float, float]]]:
+        """player_id -> (consistency NIV, explosive NIV) from the league's weekly scores
+        
+        Only weeks a player played count (PointsMatrix.played: byes, unplayed and open
+        weeks score 0.0 but aren't games), like gp in the universe path. Players
+        steady_players doesn't rate are left out (their NIV uses the season-total
+        estimate), as in the universe path.
+        """
+        if points_matrix is None:
+            return None
+        rows = points_matrix.rows(player_ids)
+        rows = rows[rows >= 0]
+        played = points_matrix.played(current_week)[rows]
+        points = points_matrix.points[rows]
+        stats = masked_stats(points, played)
+        consistency, explosive = weekly_niv_arrays(points, played, stats)
+        steady = steady_players(stats)
+        return {points_matrix.player_ids[row]: (float(consistency[i]), float(explosive[i]))
+                for i, row in enumerate(rows.tolist()) if steady[i]}
+    
+    def _assign_ranks(self, niv_rankings: List[NIVMetrics]) -> None:
+        """Sort by NIV (highest first) and assign overall and positional ranks in one pass"""
+        niv_rankings.sort(key=lambda x: x.niv, reverse=True)
+        position_counts: Dict[Position, int] = {}
+        for i, metrics in enumerate(niv_rankings):
+            metrics.rank = i + 1
+            position_counts[metrics.position] = position_counts.get(metrics.position, 0) + 1
+            metrics.positional_rank = position_counts[metrics.position]
+    
+    def _calculate_player_niv(self, player: Player, all_players: Dict[str, Player],
+                              position_points: Dict[Position, np.ndarray] = None,
+                              weekly: Tuple[float, float] = None, team_id: str = '') -> NIVMetrics:
+        """Calculate NIV metrics for a single player on team `team_id`
+        
+        `weekly` is the player's (consistency NIV, explosive NIV) from weekly scores
+        (see weekly_niv_arrays); without it both are estimated from season totals.
+        """
         
         # Get player stats for current season
         current_stats = player.stats.get(self.current_season) if player.stats else None
@@ -118,28 +370,24 @@ class NIVEngine:
             fantasy_points = current_stats.fantasy_points or 0.0
             games_played = current_stats.games_played or 0
             
-            # Calculate consistency (inverse of standard deviation of weekly scores)
-            # For now, use a simple approximation based on total points and games
+            # Season totals only: scale average points for consistency and estimate
+            # explosive games (>1.5x average) as a share of games
             if games_played > 0:
                 avg_points = fantasy_points / games_played
                 consistency = min(avg_points / 20.0, 1.0)
-            else:
-                avg_points = 0.0
-                consistency = 0.0
-            
-            # Count explosive games (games with >1.5x average)
-            if games_played > 0:
-                avg_points = fantasy_points / games_played
-                # Estimate explosive games as percentage of total games
                 explosive_games = max(0, int(games_played * (avg_points / 15.0) * 0.3))
             else:
+                consistency = 0.0
                 explosive_games = 0
         
         # Calculate NIV components
-        positional_niv = self._calculate_positional_niv(player, all_players)
+        positional_niv = self._calculate_positional_niv(player, all_players, position_points)
         market_niv = self._calculate_market_niv(player, fantasy_points)
-        explosive_niv = self._calculate_explosive_niv(explosive_games, games_played)
-        consistency_niv = self._calculate_consistency_niv(consistency)
+        if weekly is not None:
+            consistency_niv, explosive_niv = weekly
+        else:
+            explosive_niv = self._calculate_explosive_niv(explosive_games, games_played)
+            consistency_niv = self._calculate_consistency_niv(consistency)
         
         # Calculate overall NIV
         niv = (
@@ -153,7 +401,7 @@ class NIVEngine:
             player_id=player.player_id,
             name=player.name,
             position=player.position,
-            team_id=getattr(player, 'team_id', ''),
+            team_id=team_id,
             niv=round(niv, 2),
             positional_niv=round(positional_niv, 2),
             market_niv=round(market_niv, 2),
@@ -164,40 +412,30 @@ class NIVEngine:
             # niv_tier is a property, not a field
         )
     
-    def _calculate_positional_niv(self, player: Player, all_players: Dict[str, Player]) -> float:
-        """Calculate positional NIV based on scarcity and value at position"""
-        position_players = [p for p in all_players.values() if p.position == player.position]
+    def _calculate_positional_niv(self, player: Player, all_players: Dict[str, Player],
+                                  position_points: Dict[Position, np.ndarray] = None) -> float:
+        """Calculate positional NIV based on scarcity and value at position
         
-        if not position_players:
+        `position_points` (sorted points per position) lets a league run share the peer
+        arrays; the percentile is then a binary search instead of a scan.
+        """
+        if position_points is None:
+            position_points = self._position_points(
+                {pid: p for pid, p in all_players.items() if p.position == player.position})
+        peers = position_points.get(player.position)
+        
+        if peers is None or len(peers) == 0:
             return 50.0  # Default value
         
-        current_stats = player.stats.get(self.current_season) if player.stats else None
-        player_points = current_stats.fantasy_points if current_stats and current_stats.fantasy_points else 0.0
-
-        position_points = []
-        for p in position_players:
-            p_stats = p.stats.get(self.current_season) if p.stats else None
-            points = p_stats.fantasy_points if p_stats and p_stats.fantasy_points else 0.0
-            position_points.append(points)
-
-        if not position_points or max(position_points) == 0:
+        if peers[-1] == 0:
             return 50.0
 
-        # Use numpy for safe percentile calculation
-        percentile = (np.sum(np.array(position_points) < player_points) / len(position_points)) * 100
+        # Share of position peers scoring strictly fewer points
+        below = np.searchsorted(peers, self._season_points(player), side='left')
+        percentile = (below / len(peers)) * 100
         
         # Apply position scarcity multipliers
-        position_multipliers = {
-            Position.QB: 0.8,   # Less scarce
-            Position.RB: 1.2,   # More scarce
-            Position.WR: 1.0,   # Baseline
-            Position.TE: 1.3,   # Most scarce
-            Position.K: 0.6,    # Least valuable
-            Position.DEF: 0.7,  # Low value
-            Position.IDP: 1.1   # Moderately scarce
-        }
-        
-        multiplier = position_multipliers.get(player.position, 1.0)
+        multiplier = POSITION_MULTIPLIERS.get(player.position, 1.0)
         return min(percentile * multiplier, 100.0)
     
     def _calculate_market_niv(self, player: Player, fantasy_points: float) -> float:
@@ -254,8 +492,8 @@ NIV measures a player's overall fantasy impact through four key components:
 ### Components (25% each):
 1. **Positional NIV**: Value relative to position scarcity and peer performance
 2. **Market NIV**: Overall fantasy production and scoring ability  
-3. **Explosive NIV**: Big game potential and ceiling outcomes
-4. **Consistency NIV**: Week-to-week reliability and floor outcomes
+3. **Explosive NIV**: Share of weeks scoring over 1.5x the player's weekly average
+4. **Consistency NIV**: Inverse coefficient of variation of weekly scores, as mean / (mean + std)
 
 ### Tiers:
 - **S Tier**: Elite (Top 10%) - Game-changing players
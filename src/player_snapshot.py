@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""
+PLAYER SNAPSHOT
+Compact columnar, memory-mapped snapshot of the players/nfl database
+with a daily refresh that reports status, team and injury changes
+"""
+
+import os
+import json
+import time
+import struct
+import tempfile
+import logging
+from typing import Dict, List, Any, Optional, Iterable, Tuple
+
+import numpy as np
+
+try:
+    from .player_stream import stream_players
+    from .cassette import get_cassette
+    from .models import Player, InjuryStatus, position_from_sleeper
+except ImportError:
+    from player_stream import stream_players
+    from cassette import get_cassette
+    from models import Player, InjuryStatus, position_from_sleeper
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SNAPSHOT_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'cache', 'players.snapshot')
+DEFAULT_MAX_AGE = 86400  # players/nfl should be pulled at most once a day
+
+MAGIC = b'CPRSNAP1'
+ALIGNMENT = 64
+
+# (field, kind): str = offsets + utf-8 blob, cat = uint16 codes + vocabulary, i4/f4 = numeric
+SNAPSHOT_COLUMNS: List[Tuple[str, str]] = [
+    ('player_id', 'str'),
+    ('full_name', 'str'),
+    ('position', 'cat'),
+    ('team', 'cat'),
+    ('status', 'cat'),
+    ('injury_status', 'cat'),
+    ('fantasy_positions', 'cat'),
+    ('age', 'f4'),
+    ('years_exp', 'i4'),
+    ('search_rank', 'i4'),
+]
+SOURCE_FIELDS = ['full_name', 'first_name', 'last_name', 'position', 'team', 'status',
+                 'injury_status', 'fantasy_positions', 'age', 'years_exp', 'search_rank']
+DELTA_FIELDS = ('status', 'team', 'injury_status')
+INT_MISSING = -1
+
+def _full_name(data: Dict[str, Any]) -> str:
+    """Sleeper full_name, falling back to first + last (team defenses have no full_name)"""
+    return data.get('full_name') or f"{data.get('first_name') or ''} {data.get('last_name') or ''}".strip()
+
+def _source_value(data: Dict[str, Any], field: str) -> Any:
+    """Normalize a players/nfl field for storage"""
+    if field == 'full_name':
+        return _full_name(data)
+    if field == 'fantasy_positions':
+        positions = data.get('fantasy_positions')
+        return ','.join(positions) if positions else None
+    return data.get(field)
+
+def _to_number(value: Any, missing: Any) -> Any:
+    """Numeric field value, or the column's missing marker"""
+    try:
+        return float(value) if value is not None and value != '' else missing
+    except (TypeError, ValueError):
+        return missing
+
+def _aligned(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+def write_snapshot(players_db: Dict[str, Dict[str, Any]], path: str = DEFAULT_SNAPSHOT_PATH) -> str:
+    """Write players/nfl records as a columnar snapshot (atomic temp file + rename)"""
+    player_ids = sorted(players_db)
+    records = [players_db[pid] for pid in player_ids]
+    blocks: List[bytes] = []
+    header: Dict[str, Any] = {'created_at': time.time(), 'rows': len(player_ids), 'columns': {}}
+
+    def add_block(data: bytes) -> Dict[str, int]:
+        blocks.append(data)
+        return {'block': len(blocks) - 1, 'nbytes': len(data)}
+
+    for field, kind in SNAPSHOT_COLUMNS:
+        values = player_ids if field == 'player_id' else [_source_value(r, field) for r in records]
+
+        if kind == 'str':
+            encoded = [(value or '').encode('utf-8') for value in values]
+            offsets = np.zeros(len(encoded) + 1, dtype='<u4')
+            np.cumsum([len(value) for value in encoded], out=offsets[1:])
+            header['columns'][field] = {'kind': kind, 'offsets': add_block(offsets.tobytes()),
+                                        'data': add_block(b''.join(encoded))}
+        elif kind == 'cat':
+            vocab = [None] + sorted({str(value) for value in values if value is not None})
+            index = {value: code for code, value in enumerate(vocab)}
+            codes = np.array([index[str(v)] if v is not None else 0 for v in values], dtype='<u2')
+            header['columns'][field] = {'kind': kind, 'vocab': vocab, 'codes': add_block(codes.tobytes())}
+        else:
+            missing = np.nan if kind == 'f4' else INT_MISSING
+            array = np.array([_to_number(v, missing) for v in values], dtype=f'<{kind}')
+            header['columns'][field] = {'kind': kind, 'values': add_block(array.tobytes())}
+
+    # Lay blocks out after the header at aligned offsets so every column maps as a typed view
+    header_bytes = json.dumps(header, separators=(',', ':')).encode('utf-8')
+    offset = _aligned(len(MAGIC) + 8 + len(header_bytes) + 1024)
+    block_offsets = []
+    for block in blocks:
+        block_offsets.append(offset)
+        offset = _aligned(offset + len(block))
+    header['block_offsets'] = block_offsets
+    header_bytes = json.dumps(header, separators=(',', ':')).encode('utf-8')
+    if len(MAGIC) + 8 + len(header_bytes) > block_offsets[0]:
+        raise ValueError("snapshot header outgrew its reserved space")
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(MAGIC + struct.pack('<Q', len(header_bytes)) + header_bytes)
+            for block, block_offset in zip(blocks, block_offsets):
+                f.seek(block_offset)
+                f.write(block)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    logger.info(f"Wrote player snapshot with {len(player_ids)} players to {path}")
+    return path
+
+class PlayerSnapshot:
+    """Read-only, memory-mapped view of a player snapshot
+
+    Opening reads only the small JSON header; columns are typed views over the
+    mapping and rows are found by binary search on the sorted player_id column.
+    """
+
+    def __init__(self, path: str = DEFAULT_SNAPSHOT_PATH):
+        self.path = path
+        with open(path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a player snapshot")
+            (header_len,) = struct.unpack('<Q', f.read(8))
+            header = json.loads(f.read(header_len))
+
+        self.created_at: float = header['created_at']
+        self.rows: int = header['rows']
+        self._columns: Dict[str, Dict[str, Any]] = header['columns']
+        self._block_offsets: List[int] = header['block_offsets']
+        self._map = np.memmap(path, dtype=np.uint8, mode='r')
+        self._views = {field: self._view(spec) for field, spec in self._columns.items()}
+        self._ids = self._views['player_id']
+        self._index: Optional[Dict[str, int]] = None
+
+    def __len__(self) -> int:
+        return self.rows
+
+    @property
+    def age_seconds(self) -> float:
+        return time.time() - self.created_at
+
+    def _block(self, ref: Dict[str, int], dtype: str) -> np.ndarray:
+        start = self._block_offsets[ref['block']]
+        return self._map[start:start + ref['nbytes']].view(dtype)
+
+    def _view(self, spec: Dict[str, Any]) -> Any:
+        """Typed view(s) over a column's blocks"""
+        if spec['kind'] == 'str':
+            return self._block(spec['offsets'], '<u4'), self._block(spec['data'], np.uint8)
+        if spec['kind'] == 'cat':
+            return self._block(spec['codes'], '<u2')
+        return self._block(spec['values'], f"<{spec['kind']}")
+
+    @staticmethod
+    def _str_at(column: Tuple[np.ndarray, np.ndarray], row: int) -> str:
+        offsets, data = column
+        return data[offsets[row]:offsets[row + 1]].tobytes().decode('utf-8')
+
+    def _strings(self, field: str) -> List[str]:
+        """Decode a whole string column in one pass"""
+        offsets, data = self._views[field]
+        raw = data.tobytes()
+        bounds = offsets.tolist()
+        return [raw[start:end].decode('utf-8') for start, end in zip(bounds, bounds[1:])]
+
+    def player_ids(self) -> List[str]:
+        """Every player_id in row (sorted) order"""
+        return self._strings('player_id')
+
+    def column(self, field: str) -> np.ndarray:
+        """Whole column as an array (category codes and numbers are zero-copy views)"""
+        if self._columns[field]['kind'] == 'str':
+            return np.array(self._strings(field), dtype=object)
+        return self._views[field]
+
+    def vocabulary(self, field: str) -> List[Optional[str]]:
+        """Category values indexed by code (code 0 is missing)"""
+        return self._columns[field]['vocab']
+
+    def row_of(self, player_id: Any) -> Optional[int]:
+        """Row index of a player (binary search over the sorted player_id column)"""
+        player_id = str(player_id)
+        lo, hi = 0, self.rows
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._str_at(self._ids, mid) < player_id:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.rows and self._str_at(self._ids, lo) == player_id:
+            return lo
+        return None
+
+    def record(self, row: int) -> Dict[str, Any]:
+        """Decode one row into a players/nfl-style dict"""
+        record = {}
+        for field, spec in self._columns.items():
+            kind, view = spec['kind'], self._views[field]
+            if kind == 'str':
+                record[field] = self._str_at(view, row)
+            elif kind == 'cat':
+                value = spec['vocab'][int(view[row])]
+                record[field] = value.split(',') if field == 'fantasy_positions' and value else value
+            else:
+                value = view[row]
+                missing = np.isnan(value) if kind == 'f4' else value == INT_MISSING
+                record[field] = None if missing else value.item()
+        return record
+
+    def get(self, player_id: Any) -> Optional[Dict[str, Any]]:
+        """Get one player's record"""
+        row = self.row_of(player_id)
+        return self.record(row) if row is not None else None
+
+    def get_many(self, player_ids: Optional[Iterable[Any]] = None) -> Dict[str, Dict[str, Any]]:
+        """Get records keyed by player_id (every player when None)"""
+        if player_ids is None:
+            rows = range(self.rows)
+        else:
+            # Batch lookups decode the id column once instead of binary searching per player
+            if self._index is None:
+                self._index = {player_id: row for row, player_id in enumerate(self.player_ids())}
+            rows = (self._index.get(pid) for pid in set(map(str, player_ids)))
+        return {record['player_id']: record
+                for record in (self.record(row) for row in rows if row is not None)}
+
+    def close(self) -> None:
+        """Drop the mapping (unmapped once no column views are still referenced)"""
+        self._views = {}
+        self._ids = None
+        self._index = None
+        self._map = None
+
+def diff_snapshots(old: PlayerSnapshot, new: PlayerSnapshot,
+                   fields: Iterable[str] = DELTA_FIELDS) -> Dict[str, Any]:
+    """Players added/removed and per-field changes between two snapshots"""
+    fields = list(fields)
+    old_ids = {player_id: row for row, player_id in enumerate(old.player_ids())}
+    new_ids = {player_id: row for row, player_id in enumerate(new.player_ids())}
+
+    # Compare decoded category values; vocabularies differ between snapshots
+    def values(snapshot: PlayerSnapshot, field: str) -> List[Optional[str]]:
+        vocab = snapshot.vocabulary(field)
+        return [vocab[code] for code in snapshot.column(field).tolist()]
+
+    old_values = {field: values(old, field) for field in fields}
+    new_values = {field: values(new, field) for field in fields}
+
+    changed: Dict[str, Dict[str, List[Optional[str]]]] = {}
+    for player_id, new_row in new_ids.items():
+        old_row = old_ids.get(player_id)
+        if old_row is None:
+            continue
+        for field in fields:
+            before, after = old_values[field][old_row], new_values[field][new_row]
+            if before != after:
+                changed.setdefault(player_id, {})[field] = [before, after]
+
+    added = sorted(set(new_ids) - set(old_ids))
+    removed = sorted(set(old_ids) - set(new_ids))
+    summary = {'added': len(added), 'removed': len(removed), 'changed': len(changed)}
+    for field in fields:
+        summary[f'{field}_changes'] = sum(1 for change in changed.values() if field in change)
+
+    return {'from': old.created_at, 'to': new.created_at, 'summary': summary,
+            'added': added, 'removed': removed, 'changed': changed}
+
+def open_snapshot(path: str = DEFAULT_SNAPSHOT_PATH) -> Optional[PlayerSnapshot]:
+    """Open a snapshot if one exists"""
+    if not os.path.exists(path):
+        return None
+    try:
+        return PlayerSnapshot(path)
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning(f"Ignoring unreadable player snapshot {path}: {e}")
+        return None
+
+def refresh_snapshot(path: str = DEFAULT_SNAPSHOT_PATH, max_age: float = DEFAULT_MAX_AGE,
+                     force: bool = False) -> Tuple[Optional[PlayerSnapshot], Optional[Dict[str, Any]]]:
+    """Rebuild the snapshot from players/nfl when stale; returns (snapshot, delta vs previous)
+
+    The delta is also written next to the snapshot as <path>.delta.json.
+    """
+    previous = open_snapshot(path)
+    if previous is not None and not force and previous.age_seconds < max_age:
+        return previous, None
+
+    players_db = stream_players(fields=SOURCE_FIELDS)
+    if not players_db:
+        logger.error("players/nfl returned no players; keeping the previous snapshot")
+        return previous, None
+
+    write_snapshot(players_db, path)
+    snapshot = PlayerSnapshot(path)
+    if previous is None:
+        return snapshot, None
+
+    delta = diff_snapshots(previous, snapshot)
+    previous.close()
+    with open(f"{path}.delta.json", 'w') as f:
+        json.dump(delta, f, indent=2)
+
+    summary = delta['summary']
+    logger.info(f"Player snapshot delta: {summary['added']} added, {summary['removed']} removed, "
+                f"{summary['changed']} changed (status {summary['status_changes']}, "
+                f"team {summary['team_changes']}, injury {summary['injury_status_changes']})")
+    return snapshot, delta
+
+def load_players(player_ids: Optional[Iterable[Any]] = None, path: str = DEFAULT_SNAPSHOT_PATH,
+                 max_age: float = DEFAULT_MAX_AGE) -> Dict[str, Dict[str, Any]]:
+    """Player records from the snapshot, refreshing it at most once per max_age
+
+    Record/replay runs read players/nfl through the cassette instead.
+    """
+    if get_cassette() is not None:
+        return stream_players(player_ids)
+
+    snapshot, _ = refresh_snapshot(path, max_age)
+    if snapshot is None:
+        return stream_players(player_ids)
+    return snapshot.get_many(player_ids)
+
+def _injury_status(value: Optional[str]) -> InjuryStatus:
+    """Map Sleeper injury_status strings onto InjuryStatus"""
+    if not value:
+        return InjuryStatus.ACTIVE
+    for status in InjuryStatus:
+        if status.value.lower() == value.lower():
+            return status
+    if value.upper() in ('IR', 'PUP', 'NFI'):
+        return InjuryStatus.INJURED_RESERVE
+    if value.upper() in ('SUS', 'SUSPENDED'):
+        return InjuryStatus.SUSPENDED
+    return InjuryStatus.OUT
+
+def snapshot_player(record: Dict[str, Any]) -> Player:
+    """Build a Player model from a snapshot record"""
+    position = position_from_sleeper(record.get('position'))
+    return Player(
+        player_id=record['player_id'],
+        name=record.get('full_name') or record['player_id'],
+        position=position,
+        team=record.get('team') or 'FA',
+        status=record.get('status') or 'Active',
+        injury_status=_injury_status(record.get('injury_status')),
+        fantasy_positions=[position_from_sleeper(pos) for pos in record.get('fantasy_positions') or []] or [position]
+    )
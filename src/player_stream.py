@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+PLAYER STREAM
+Incremental players/nfl parser that keeps only the players a run needs
+"""
+
+import re
+import json
+import codecs
+import logging
+from typing import Dict, Any, Optional, Iterable, Iterator, Tuple, Union
+
+import requests
+
+try:
+    from .utils import make_sleeper_request
+    from .sleeper_client import sleeper_get, SLEEPER_BASE_URL
+    from .response_cache import get_response_cache
+    from .cassette import get_cassette
+except ImportError:
+    from utils import make_sleeper_request
+    from sleeper_client import sleeper_get, SLEEPER_BASE_URL
+    from response_cache import get_response_cache
+    from cassette import get_cassette
+
+logger = logging.getLogger(__name__)
+
+PLAYERS_ENDPOINT = "players/nfl"
+CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_NUMBER_START = set('-0123456789')
+
+def _project(value: Any, fields: Optional[Iterable[str]]) -> Any:
+    """Keep only the requested fields of a player record"""
+    if fields is None or not isinstance(value, dict):
+        return value
+    return {field: value[field] for field in fields if field in value}
+
+def iter_object_items(chunks: Iterable[Union[bytes, str]], wanted: Optional[set] = None,
+                      fields: Optional[Iterable[str]] = None) -> Iterator[Tuple[str, Any]]:
+    """Incrementally decode a top-level JSON object, yielding (key, value) for wanted keys
+
+    Only the current chunk and the value being decoded are held in memory; values
+    for keys outside `wanted` are decoded and dropped immediately.
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder('utf-8')()
+    source = iter(chunks)
+    fields = list(fields) if fields is not None else None
+    buf, pos, exhausted = '', 0, False
+
+    def fill() -> None:
+        nonlocal buf, pos, exhausted
+        if exhausted:
+            raise ValueError("players payload ended before the top-level object closed")
+        chunk = next(source, None)
+        if chunk is None:
+            exhausted = True
+            chunk = utf8.decode(b'', final=True)
+        elif isinstance(chunk, bytes):
+            chunk = utf8.decode(chunk)
+        buf, pos = buf[pos:] + chunk, 0
+
+    def skip_ws() -> None:
+        nonlocal pos
+        while True:
+            pos = _WHITESPACE.match(buf, pos).end()
+            if pos < len(buf):
+                return
+            fill()
+
+    def decode() -> Any:
+        nonlocal pos
+        while True:
+            try:
+                value, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                fill()
+                continue
+            # A number at the end of the buffer may continue in the next chunk
+            if end == len(buf) and buf[pos] in _NUMBER_START and not exhausted:
+                fill()
+                continue
+            pos = end
+            return value
+
+    def expect(char: str) -> None:
+        nonlocal pos
+        skip_ws()
+        if buf[pos] != char:
+            raise ValueError(f"Expected {char!r} in players payload, found {buf[pos]!r}")
+        pos += 1
+
+    def finish() -> None:
+        # Drain trailing chunks so tee'd consumers (the raw cache) see the whole payload
+        for _ in source:
+            pass
+
+    expect('{')
+    skip_ws()
+    if buf[pos] == '}':
+        finish()
+        return
+
+    while True:
+        skip_ws()
+        key = decode()
+        expect(':')
+        skip_ws()
+        value = decode()
+        if wanted is None or key in wanted:
+            yield key, _project(value, fields)
+
+        skip_ws()
+        if buf[pos] == '}':
+            finish()
+            return
+        expect(',')
+
+def filter_players(players_db: Optional[Dict[str, Any]], wanted: Optional[set] = None,
+                   fields: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """Filter an already-decoded players/nfl payload"""
+    if not players_db:
+        return {}
+    fields = list(fields) if fields is not None else None
+    if wanted is None:
+        return {pid: _project(data, fields) for pid, data in players_db.items()}
+    return {pid: _project(players_db[pid], fields) for pid in wanted if pid in players_db}
+
+def stream_players(player_ids: Optional[Iterable[Any]] = None, fields: Optional[Iterable[str]] = None,
+                   chunk_size: int = CHUNK_SIZE) -> Dict[str, Dict[str, Any]]:
+    """Fetch players/nfl keeping only the given player IDs (every player when None)
+
+    The payload is decoded as it arrives from the network or the on-disk cache, so the
+    full 11k-player dict is never built. Record/replay runs use the full payload so
+    cassettes stay faithful.
+    """
+    wanted = {str(pid) for pid in player_ids} if player_ids is not None else None
+
+    if get_cassette() is not None:
+        return filter_players(make_sleeper_request(PLAYERS_ENDPOINT), wanted, fields)
+
+    cache = get_response_cache()
+    raw = cache.open_raw(PLAYERS_ENDPOINT) if cache is not None else None
+    if raw is not None:
+        with raw:
+            try:
+                return dict(iter_object_items(iter(lambda: raw.read(chunk_size), b''), wanted, fields))
+            except ValueError as e:
+                logger.warning(f"Discarding unreadable cached players payload: {e}")
+                cache.invalidate(PLAYERS_ENDPOINT)
+
+    try:
+        response = sleeper_get(f"{SLEEPER_BASE_URL}/{PLAYERS_ENDPOINT}", stream=True)
+    except requests.exceptions.RequestException as e:
+        logger.error(f"Sleeper API request failed: {PLAYERS_ENDPOINT} - {e}")
+        return {}
+
+    try:
+        response.raise_for_status()
+        chunks = response.iter_content(chunk_size)
+        if cache is not None:
+            chunks = cache.tee_raw(PLAYERS_ENDPOINT, chunks)
+        return dict(iter_object_items(chunks, wanted, fields))
+    except (requests.exceptions.RequestException, ValueError) as e:
+        logger.error(f"Failed to stream {PLAYERS_ENDPOINT}: {e}")
+        return {}
+    finally:
+        response.close()
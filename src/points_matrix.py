@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+POINTS MATRIX
+Dense players x weeks fantasy points from matchup players_points, with the roster
+each player was on and starter/bench masks, persisted locally for completed weeks
+"""
+
+import os
+import tempfile
+import logging
+from typing import Dict, List, Any, Optional, Iterable, Sequence
+
+import numpy as np
+
+try:
+    from .immutable_store import STAT_CORRECTION_WEEKS
+except ImportError:
+    from immutable_store import STAT_CORRECTION_WEEKS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POINTS_DIR = os.path.join(os.path.dirname(__file__), '..', 'data', 'cache', 'points_matrix')
+NOT_ROSTERED = -1
+
+def _player_list(values: Any) -> List[str]:
+    """Player IDs from a matchup entry list ('0' marks an empty slot)"""
+    return [str(p) for p in values or [] if p and p != '0']
+
+def completed_weeks(matchups: Dict[int, List[Dict[str, Any]]], current_week: Optional[int]) -> List[int]:
+    """Weeks whose scores are final
+
+    Scored weeks more than STAT_CORRECTION_WEEKS before the NFL `current_week` (later
+    weeks may still get stat corrections); none without the current week.
+    """
+    if current_week is None:
+        return []
+    scored = sorted(int(week) for week, entries in matchups.items()
+                    if any((entry.get('points') or 0) > 0 for entry in entries or []))
+    return [week for week in scored if week < current_week - STAT_CORRECTION_WEEKS]
+
+def masked_stats(points: np.ndarray, mask: np.ndarray, ddof: int = 1) -> Dict[str, np.ndarray]:
+    """Per-row games, total, mean and standard deviation of a players x weeks matrix over
+    the weeks in `mask`, reduced over the week axis for every player at once
+
+    Mean is NaN without games and the deviation NaN with ddof or fewer.
+    """
+    values = np.where(mask, points, 0.0)
+    games = mask.sum(axis=1)
+    total = values.sum(axis=1)
+    mean = np.divide(total, games, out=np.full(len(games), np.nan), where=games > 0)
+    squares = np.where(mask, (points - np.nan_to_num(mean)[:, None]) ** 2, 0.0).sum(axis=1)
+    std = np.sqrt(np.divide(squares, games - ddof, out=np.full(len(games), np.nan), where=games > ddof))
+    return {'games': games, 'total': total, 'mean': mean, 'std': std}
+
+class PointsMatrix:
+    """Players x weeks points for one league
+
+    `points[i, w]` is player i's score in weeks[w] (0.0 when they weren't on a roster),
+    `roster_ids[i, w]` the roster they were on (NOT_ROSTERED otherwise) and
+    `starter[i, w]` whether they were in that week's starting lineup.
+    """
+
+    def __init__(self, player_ids: Sequence[str], weeks: Sequence[int], points: np.ndarray,
+                 roster_ids: np.ndarray, starter: np.ndarray):
+        self.player_ids = [str(p) for p in player_ids]
+        self.weeks = tuple(int(week) for week in weeks)
+        self.index = {player_id: i for i, player_id in enumerate(self.player_ids)}
+        self.week_index = {week: w for w, week in enumerate(self.weeks)}
+        shape = (len(self.player_ids), len(self.weeks))
+        self.points = np.asarray(points, dtype=np.float64).reshape(shape)
+        self.roster_ids = np.asarray(roster_ids, dtype=np.int32).reshape(shape)
+        self.starter = np.asarray(starter, dtype=bool).reshape(shape)
+
+    @classmethod
+    def from_matchups(cls, matchups: Dict[int, Iterable[Dict[str, Any]]],
+                      weeks: Iterable[int] = None) -> 'PointsMatrix':
+        """Build the matrix in one pass over every week's matchup entries
+
+        A player is on a roster in a week when the entry lists them in `players` or
+        `players_points`; starters come from the entry's `starters`.
+        """
+        weeks = sorted(int(week) for week in (matchups if weeks is None else weeks))
+        index: Dict[str, int] = {}
+        rows: List[int] = []
+        cols: List[int] = []
+        values: List[float] = []
+        rosters: List[int] = []
+        starts: List[bool] = []
+        for w, week in enumerate(weeks):
+            for entry in matchups.get(week) or []:
+                if entry.get('roster_id') is None:
+                    continue
+                roster_id = int(entry['roster_id'])
+                players_points = entry.get('players_points') or {}
+                starters = set(_player_list(entry.get('starters')))
+                for player_id in dict.fromkeys(_player_list(entry.get('players')) + _player_list(players_points)):
+                    rows.append(index.setdefault(player_id, len(index)))
+                    cols.append(w)
+                    values.append(players_points.get(player_id) or 0.0)
+                    rosters.append(roster_id)
+                    starts.append(player_id in starters)
+
+        shape = (len(index), len(weeks))
+        points = np.zeros(shape)
+        roster_ids = np.full(shape, NOT_ROSTERED, dtype=np.int32)
+        starter = np.zeros(shape, dtype=bool)
+        if rows:
+            cells = (np.array(rows, dtype=np.intp), np.array(cols, dtype=np.intp))
+            points[cells] = values
+            roster_ids[cells] = rosters
+            starter[cells] = starts
+        return cls(list(index), weeks, points, roster_ids, starter)
+
+    @property
+    def rostered(self) -> np.ndarray:
+        """Players x weeks: on any roster"""
+        return self.roster_ids != NOT_ROSTERED
+
+    def played(self, current_week: Optional[int] = None) -> np.ndarray:
+        """Players x weeks: weeks a player actually played for a roster
+
+        Rostered with a nonzero score in a week whose scores are final (before the NFL
+        `current_week`, less STAT_CORRECTION_WEEKS, as in completed_weeks; every week
+        without it). Byes, unplayed and still-open weeks don't count.
+        """
+        played = self.rostered & (self.points != 0)
+        if current_week is not None:
+            played &= (np.array(self.weeks, dtype=np.int64) < current_week - STAT_CORRECTION_WEEKS)[None, :]
+        return played
+
+    @property
+    def bench(self) -> np.ndarray:
+        """Players x weeks: rostered but not started"""
+        return self.rostered & ~self.starter
+
+    def rows(self, player_ids: Iterable[str]) -> np.ndarray:
+        """Row of each player (-1 for players not in the matrix)"""
+        return np.array([self.index.get(str(p), -1) for p in player_ids], dtype=np.intp)
+
+    def take(self, player_ids: Sequence[str], weeks: Iterable[int] = None, roster_id: int = None) -> np.ndarray:
+        """len(player_ids) x weeks points, 0.0 for players or weeks not in the matrix
+        (and, with `roster_id`, for weeks the player wasn't on that roster)"""
+        weeks = self.weeks if weeks is None else list(weeks)
+        rows = self.rows(player_ids)
+        cols = np.array([self.week_index.get(int(week), -1) for week in weeks], dtype=np.intp)
+        keep = (rows >= 0)[:, None] & (cols >= 0)[None, :]
+        if not self.points.size:
+            return np.zeros(keep.shape)
+        cells = np.ix_(np.maximum(rows, 0), np.maximum(cols, 0))
+        if roster_id is not None:
+            keep &= self.roster_ids[cells] == int(roster_id)
+        return np.where(keep, self.points[cells], 0.0)
+
+    def select_weeks(self, weeks: Iterable[int]) -> 'PointsMatrix':
+        """Matrix over `weeks`, in that order (weeks not in the matrix come back empty)"""
+        weeks = [int(week) for week in weeks]
+        cols = np.array([self.week_index.get(week, -1) for week in weeks], dtype=np.intp)
+        known = cols >= 0
+        shape = (len(self.player_ids), len(weeks))
+        points = np.zeros(shape)
+        roster_ids = np.full(shape, NOT_ROSTERED, dtype=np.int32)
+        starter = np.zeros(shape, dtype=bool)
+        points[:, known] = self.points[:, cols[known]]
+        roster_ids[:, known] = self.roster_ids[:, cols[known]]
+        starter[:, known] = self.starter[:, cols[known]]
+        return PointsMatrix(self.player_ids, weeks, points, roster_ids, starter)
+
+    def merge(self, other: 'PointsMatrix') -> 'PointsMatrix':
+        """Union of two matrices' players and weeks; `other` wins for weeks in both"""
+        new_ids = [p for p in other.player_ids if p not in self.index]
+        player_ids = self.player_ids + new_ids
+        row_of = {**self.index, **{p: len(self.player_ids) + i for i, p in enumerate(new_ids)}}
+        weeks = sorted(set(self.weeks) | set(other.weeks))
+        col_of = {week: w for w, week in enumerate(weeks)}
+        shape = (len(player_ids), len(weeks))
+        points = np.zeros(shape)
+        roster_ids = np.full(shape, NOT_ROSTERED, dtype=np.int32)
+        starter = np.zeros(shape, dtype=bool)
+        for source in (self, other):
+            cols = np.array([col_of[week] for week in source.weeks], dtype=np.intp)
+            cells = np.ix_(np.array([row_of[p] for p in source.player_ids], dtype=np.intp), cols)
+            # Whole week columns are replaced, so players dropped from a week don't linger
+            points[:, cols] = 0.0
+            roster_ids[:, cols] = NOT_ROSTERED
+            starter[:, cols] = False
+            points[cells] = source.points
+            roster_ids[cells] = source.roster_ids
+            starter[cells] = source.starter
+        return PointsMatrix(player_ids, weeks, points, roster_ids, starter)
+
+    def weekly_stats(self, mask: np.ndarray = None, ddof: int = 1) -> Dict[str, np.ndarray]:
+        """Per-player weekly statistics over the weeks in `mask` (default: rostered weeks);
+        see masked_stats"""
+        return masked_stats(self.points, self.rostered if mask is None else mask, ddof)
+
+    def save(self, path: str) -> str:
+        """Write the matrix atomically (temp file + rename) as an uncompressed .npz"""
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(f, player_ids=np.array(self.player_ids, dtype=str),
+                         weeks=np.array(self.weeks, dtype=np.int32), points=self.points,
+                         roster_ids=self.roster_ids, starter=self.starter)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return path
+
+    @classmethod
+    def load(cls, path: str) -> 'PointsMatrix':
+        """Read a matrix written by save()"""
+        with np.load(path, allow_pickle=False) as data:
+            return cls(data['player_ids'].tolist(), data['weeks'].tolist(), data['points'],
+                       data['roster_ids'], data['starter'])
+
+class PointsMatrixStore:
+    """Per-league points matrix persisted for completed weeks
+
+    Completed weeks are final, so they are read back from disk instead of being
+    re-parsed from matchups on every run; open weeks are always rebuilt.
+    """
+
+    def __init__(self, league_id: str, path: str = None):
+        self.league_id = league_id
+        self.path = path or os.path.join(DEFAULT_POINTS_DIR, f"{league_id}.npz")
+
+    def load(self) -> Optional[PointsMatrix]:
+        """The persisted matrix, if there is a readable one"""
+        if not os.path.exists(self.path):
+            return None
+        try:
+            return PointsMatrix.load(self.path)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable points matrix {self.path}: {e}")
+            return None
+
+    def update(self, matchups: Dict[int, Iterable[Dict[str, Any]]], weeks: Iterable[int] = None,
+               current_week: int = None) -> PointsMatrix:
+        """Matrix for `weeks` (default: every week in `matchups`)
+
+        Stored completed weeks are reused; the other weeks are built from `matchups`.
+        Newly completed weeks (see completed_weeks) are added to the stored matrix;
+        without the NFL `current_week` nothing new is stored.
+        """
+        weeks = sorted(int(week) for week in (matchups if weeks is None else weeks))
+        stored = self.load()
+        cached = set(stored.weeks) & set(weeks) if stored is not None else set()
+        built = PointsMatrix.from_matchups(matchups, [week for week in weeks if week not in cached])
+        matrix = stored.select_weeks(sorted(cached)).merge(built) if cached else built
+
+        final = set(completed_weeks({week: matchups.get(week) or [] for week in weeks}, current_week))
+        if current_week is None:
+            logger.debug(f"Points matrix for league {self.league_id}: no NFL week, not storing weeks")
+        new_weeks = sorted(final - cached)
+        if new_weeks:
+            persisted = built.select_weeks(new_weeks)
+            persisted = stored.merge(persisted) if stored is not None else persisted
+            persisted.save(self.path)
+            logger.info(f"Points matrix for league {self.league_id}: stored weeks {new_weeks} "
+                        f"({len(persisted.player_ids)} players, {len(persisted.weeks)} weeks)")
+        logger.debug(f"Points matrix: {len(cached)} stored weeks reused, {len(built.weeks)} built")
+        return matrix
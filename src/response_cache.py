@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+RESPONSE CACHE
+Persistent on-disk TTL cache for Sleeper API responses, keyed by endpoint
+"""
+
+import os
+import json
+import time
+import hashlib
+import tempfile
+import threading
+import logging
+from fnmatch import fnmatch
+from typing import Dict, List, Any, Optional, Tuple, Iterable, Iterator, BinaryIO
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(__file__), '..', 'data', 'cache', 'sleeper')
+DEFAULT_TTL = 300
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_MAX_ENTRIES = 1000
+
+# First matching pattern wins; unmatched endpoints use the default TTL
+DEFAULT_TTL_POLICIES: List[Tuple[str, int]] = [
+    ("players/nfl/trending/*", 900),     # Trending adds/drops move hourly
+    ("players/nfl", 86400),              # Player database refreshes daily
+    ("stats/nfl/*", 3600),
+    ("projections/nfl/*", 3600),
+    ("league/*/drafts", 86400),
+    ("draft/*/picks", 86400),
+    ("state/nfl", 300),
+]
+
+class ResponseCache:
+    """On-disk TTL response cache with atomic writes and size-bounded LRU eviction"""
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, default_ttl: int = DEFAULT_TTL,
+                 max_bytes: int = DEFAULT_MAX_BYTES, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 ttl_policies: List[Tuple[str, int]] = None):
+        self.cache_dir = cache_dir
+        self.default_ttl = default_ttl
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.ttl_policies = list(ttl_policies if ttl_policies is not None else DEFAULT_TTL_POLICIES)
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'expired': 0, 'writes': 0, 'evictions': 0}
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def ttl_for(self, endpoint: str) -> int:
+        """Get the TTL in seconds for an endpoint"""
+        for pattern, ttl in self.ttl_policies:
+            if fnmatch(endpoint, pattern):
+                return ttl
+        return self.default_ttl
+
+    def _path(self, endpoint: str, suffix: str = '.json') -> str:
+        """Cache file path for an endpoint"""
+        digest = hashlib.sha1(endpoint.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}{suffix}")
+
+    def _count(self, key: str) -> None:
+        """Increment a counter"""
+        with self._lock:
+            self._stats[key] += 1
+
+    def get(self, endpoint: str) -> Tuple[bool, Any]:
+        """Look up an endpoint; returns (hit, data)"""
+        ttl = self.ttl_for(endpoint)
+        path = self._path(endpoint)
+
+        if ttl <= 0 or not os.path.exists(path):
+            self._count('misses')
+            return False, None
+
+        try:
+            with open(path, 'r') as f:
+                entry = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding unreadable cache entry for {endpoint}: {e}")
+            self._remove(path)
+            self._count('misses')
+            return False, None
+
+        if time.time() - entry.get('stored_at', 0) > ttl:
+            self._count('expired')
+            self._count('misses')
+            return False, None
+
+        # Touch for LRU eviction order
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        self._count('hits')
+        return True, entry.get('data')
+
+    def set(self, endpoint: str, data: Any) -> None:
+        """Store a response atomically (temp file + rename)"""
+        if data is None or self.ttl_for(endpoint) <= 0:
+            return
+
+        entry = {'endpoint': endpoint, 'stored_at': time.time(), 'data': data}
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'w') as f:
+                json.dump(entry, f, separators=(',', ':'))
+            os.replace(tmp_path, self._path(endpoint))
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Failed to cache response for {endpoint}: {e}")
+            if tmp_path and os.path.exists(tmp_path):
+                self._remove(tmp_path)
+            return
+
+        self._count('writes')
+        self._evict()
+
+    def open_raw(self, endpoint: str) -> Optional[BinaryIO]:
+        """Open a fresh raw (undecoded) payload for streaming, or None on a miss
+
+        Raw entries age from their write time, so they are not touched on read.
+        """
+        ttl = self.ttl_for(endpoint)
+        path = self._path(endpoint, '.raw')
+        try:
+            if ttl <= 0 or time.time() - os.stat(path).st_mtime > ttl:
+                raise FileNotFoundError(path)
+            f = open(path, 'rb')
+        except OSError:
+            self._count('misses')
+            return None
+
+        self._count('hits')
+        return f
+
+    def tee_raw(self, endpoint: str, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """Pass chunks through while writing them to a raw entry (stored only if fully consumed)"""
+        if self.ttl_for(endpoint) <= 0:
+            yield from chunks
+            return
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in chunks:
+                    f.write(chunk)
+                    yield chunk
+            os.replace(tmp_path, self._path(endpoint, '.raw'))
+        finally:
+            self._remove(tmp_path)
+
+        self._count('writes')
+        self._evict()
+
+    def _entries(self) -> List[Tuple[float, int, str]]:
+        """List cache files as (mtime, size, path)"""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(('.json', '.raw')):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _evict(self) -> None:
+        """Evict least recently used entries until under the size and count bounds"""
+        with self._lock:
+            entries = self._entries()
+            total_bytes = sum(size for _, size, _ in entries)
+            if total_bytes <= self.max_bytes and len(entries) <= self.max_entries:
+                return
+
+            entries.sort()
+            remaining = len(entries)
+            for _, size, path in entries:
+                if total_bytes <= self.max_bytes and remaining <= self.max_entries:
+                    break
+                if self._remove(path):
+                    total_bytes -= size
+                    remaining -= 1
+                    self._stats['evictions'] += 1
+
+    def _remove(self, path: str) -> bool:
+        """Remove a cache file, ignoring races with other processes"""
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
+
+    def invalidate(self, endpoint: str) -> None:
+        """Drop a cached endpoint"""
+        self._remove(self._path(endpoint))
+        self._remove(self._path(endpoint, '.raw'))
+
+    def clear(self) -> None:
+        """Drop every cached response"""
+        for _, _, path in self._entries():
+            self._remove(path)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and current cache size"""
+        with self._lock:
+            stats = dict(self._stats)
+        entries = self._entries()
+        lookups = stats['hits'] + stats['misses']
+        stats['entries'] = len(entries)
+        stats['bytes'] = sum(size for _, size, _ in entries)
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
+
+_ENV_DISABLED = os.getenv('CPR_CACHE_DISABLED', 'false').lower() == 'true'
+_cache: Optional[ResponseCache] = None
+_cache_enabled = not _ENV_DISABLED
+_cache_lock = threading.Lock()
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Get the shared response cache (None when caching is disabled)"""
+    global _cache
+
+    if not _cache_enabled:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResponseCache(cache_dir=os.getenv('CPR_CACHE_DIR', DEFAULT_CACHE_DIR))
+    return _cache
+
+def configure_response_cache(enabled: bool = None, cache_dir: str = None, default_ttl: int = None,
+                             max_bytes: int = None, max_entries: int = None,
+                             ttl_policies: List[Tuple[str, int]] = None) -> Optional[ResponseCache]:
+    """Reconfigure (or disable) the shared response cache"""
+    global _cache, _cache_enabled
+
+    with _cache_lock:
+        if enabled is not None:
+            _cache_enabled = enabled
+        if not _cache_enabled:
+            _cache = None
+            return None
+
+        current = _cache or ResponseCache(cache_dir=os.getenv('CPR_CACHE_DIR', DEFAULT_CACHE_DIR))
+        _cache = ResponseCache(
+            cache_dir=cache_dir or current.cache_dir,
+            default_ttl=default_ttl if default_ttl is not None else current.default_ttl,
+            max_bytes=max_bytes if max_bytes is not None else current.max_bytes,
+            max_entries=max_entries if max_entries is not None else current.max_entries,
+            ttl_policies=ttl_policies if ttl_policies is not None else current.ttl_policies
+        )
+        return _cache
+
+def configure_response_cache_from_settings(config: Dict[str, Any]) -> Optional[ResponseCache]:
+    """Apply data_sources.sleeper and performance cache settings"""
+    sleeper = config.get('data_sources', {}).get('sleeper', {})
+    performance = config.get('performance', {})
+    max_mb = sleeper.get('cache_max_mb')
+
+    return configure_response_cache(
+        enabled=bool(performance.get('enable_caching', True)) and not _ENV_DISABLED,
+        cache_dir=sleeper.get('cache_dir'),
+        default_ttl=sleeper.get('cache_ttl'),
+        max_bytes=int(max_mb * 1024 * 1024) if max_mb is not None else None,
+        max_entries=performance.get('cache_size')
+    )
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+SCHEDULE GRAPH
+Precomputed league schedule index: week -> matchup_id -> roster pairs and
+team -> opponents in week order, shared by SMI, Zion and strength-of-schedule features
+"""
+
+import logging
+from types import MappingProxyType
+from typing import Dict, List, Any, Optional, Mapping, Tuple, Iterable
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+class ScheduleGraph:
+    """Who plays whom, indexed once from weekly matchup entries
+
+    Roster and matchup IDs are stored as ints. Entries without a matchup_id (byes,
+    teams out of the playoff bracket) are left out of the graph.
+    """
+
+    def __init__(self, matchups: Dict[int, List[Dict[str, Any]]]):
+        pairs: Dict[int, Dict[int, Tuple[int, ...]]] = {}
+        games: Dict[int, List[Tuple[int, int]]] = {}
+
+        for week, entries in sorted((int(w), entries) for w, entries in matchups.items()):
+            by_matchup: Dict[int, List[int]] = {}
+            for entry in entries or []:
+                if entry.get('roster_id') is None or entry.get('matchup_id') is None:
+                    continue
+                by_matchup.setdefault(int(entry['matchup_id']), []).append(int(entry['roster_id']))
+
+            pairs[week] = MappingProxyType({mid: tuple(ids) for mid, ids in by_matchup.items()})
+            for roster_ids in by_matchup.values():
+                for roster_id in roster_ids:
+                    games.setdefault(roster_id, []).extend((week, r) for r in roster_ids if r != roster_id)
+
+        self._pairs = MappingProxyType(pairs)
+        self._games = MappingProxyType({roster_id: tuple(g) for roster_id, g in games.items()})
+        self._week_opponent = {(week, roster_id): opp for roster_id, g in self._games.items() for week, opp in g}
+
+    @property
+    def weeks(self) -> Tuple[int, ...]:
+        """Weeks in the graph, ascending"""
+        return tuple(self._pairs)
+
+    @property
+    def teams(self) -> Tuple[int, ...]:
+        """Roster IDs that appear in at least one matchup"""
+        return tuple(sorted(self._games))
+
+    def pairs(self, week: int) -> Mapping[int, Tuple[int, ...]]:
+        """matchup_id -> roster IDs for a week"""
+        return self._pairs.get(week, MappingProxyType({}))
+
+    def opponent(self, week: int, roster_id: int) -> Optional[int]:
+        """A team's opponent in a week (None on a bye or unknown week)"""
+        return self._week_opponent.get((week, roster_id))
+
+    def games(self, roster_id: int) -> Tuple[Tuple[int, int], ...]:
+        """(week, opponent) for every game of a team, in week order"""
+        return self._games.get(roster_id, ())
+
+    def opponents(self, roster_id: int, weeks: Iterable[int] = None) -> Tuple[int, ...]:
+        """A team's opponents in week order (optionally limited to some weeks)"""
+        if weeks is None:
+            return tuple(opp for _, opp in self.games(roster_id))
+        wanted = set(weeks)
+        return tuple(opp for week, opp in self.games(roster_id) if week in wanted)
+
+    def remaining_schedule(self, roster_id: int, after_week: int) -> Tuple[Tuple[int, int], ...]:
+        """(week, opponent) for a team's games after `after_week`"""
+        return tuple((week, opp) for week, opp in self.games(roster_id) if week > after_week)
+
+    def count_matrix(self, index: Dict[int, int], weeks: Iterable[int] = None) -> np.ndarray:
+        """Teams x teams matrix of games played between each pair (rows/cols from `index`)"""
+        wanted = set(weeks) if weeks is not None else None
+        counts = np.zeros((len(index), len(index)))
+        for roster_id, row in index.items():
+            for week, opp in self.games(roster_id):
+                col = index.get(opp)
+                if col is not None and (wanted is None or week in wanted):
+                    counts[row, col] += 1
+        return counts
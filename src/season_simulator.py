@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+SEASON SIMULATOR
+Monte Carlo playoff odds: samples each team's weekly score distribution over the
+remaining schedule and the playoff bracket, many seasons at a time in NumPy batches
+"""
+
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Tuple
+
+import numpy as np
+
+try:
+    from .schedule_graph import ScheduleGraph
+except ImportError:
+    from schedule_graph import ScheduleGraph
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SIMULATIONS = 20000
+DEFAULT_BATCH_SIZE = 5000
+DEFAULT_PLAYOFF_WEEK_START = 15
+DEFAULT_PLAYOFF_TEAMS = 6
+MIN_SCORE_STD = 5.0             # floor on a team's weekly spread when it has few games
+
+def bracket_order(size: int) -> List[int]:
+    """Standard seeded bracket slots (0-based seeds) for a power-of-two field
+
+    1v8, 4v5, 2v7, 3v6 for eight, so the top two seeds can only meet in the final.
+    """
+    order = [0]
+    while len(order) < size:
+        width = len(order) * 2
+        order = [s for seed in order for s in (seed, width - 1 - seed)]
+    return order
+
+def _bracket(playoff_teams: int) -> Tuple[np.ndarray, int]:
+    """Bracket slots with seeds past the field marked -1 (byes), and the bye count"""
+    size = 1
+    while size < playoff_teams:
+        size *= 2
+    slots = np.array([seed if seed < playoff_teams else -1 for seed in bracket_order(size)])
+    return slots, size - playoff_teams
+
+def _run_batch(simulator: 'SeasonSimulator', simulations: int, seed: Any) -> Dict[str, np.ndarray]:
+    """Module-level entry point so batches can run in worker processes"""
+    return simulator._simulate_batch(simulations, np.random.default_rng(seed))
+
+class SeasonSimulator:
+    """Vectorized season and playoff simulator for one league
+
+    Completed weeks give each team's record, points for and weekly score distribution;
+    the remaining regular-season schedule comes from the future weeks in the matchup data
+    (Sleeper returns scheduled matchups with zero points). Standings are ordered by wins
+    then points for. Playoff rounds are one week each on a standard seeded bracket, with
+    byes going to the top seeds when the field is not a power of two.
+    """
+
+    def __init__(self, matchups: Dict[int, List[Dict[str, Any]]], current_week: int = None,
+                 playoff_week_start: int = DEFAULT_PLAYOFF_WEEK_START,
+                 playoff_teams: int = DEFAULT_PLAYOFF_TEAMS, method: str = 'normal'):
+        if method not in ('normal', 'bootstrap'):
+            raise ValueError(f"Unknown score model: {method}")
+
+        matchups = {int(week): entries or [] for week, entries in matchups.items()}
+        graph = ScheduleGraph(matchups)
+        if current_week is None:
+            played = [week for week, entries in matchups.items()
+                      if any((entry.get('points') or 0) > 0 for entry in entries)]
+            current_week = max(played) + 1 if played else 1
+
+        roster_ids = sorted({int(entry['roster_id']) for entries in matchups.values()
+                             for entry in entries if entry.get('roster_id') is not None})
+        self.team_ids = roster_ids
+        self.index = {roster_id: i for i, roster_id in enumerate(roster_ids)}
+        self.current_week = current_week
+        self.playoff_week_start = playoff_week_start
+        self.playoff_teams = min(playoff_teams, len(roster_ids))
+        self.method = method
+
+        num_teams = len(roster_ids)
+        self.wins = np.zeros(num_teams)
+        self.points_for = np.zeros(num_teams)
+        history: List[List[float]] = [[] for _ in roster_ids]
+        for week in sorted(matchups):
+            if week >= current_week:
+                continue
+            points = {int(e['roster_id']): float(e.get('points') or 0.0)
+                      for e in matchups[week] if e.get('roster_id') is not None}
+            for roster_id, score in points.items():
+                history[self.index[roster_id]].append(score)
+                if week < playoff_week_start:
+                    self.points_for[self.index[roster_id]] += score
+            if week >= playoff_week_start:
+                continue
+            for a, b in self._week_pairs(graph, week):
+                if a in points and b in points:
+                    self.wins[self.index[a]] += 1.0 if points[a] > points[b] else 0.5 if points[a] == points[b] else 0.0
+                    self.wins[self.index[b]] += 1.0 if points[b] > points[a] else 0.5 if points[a] == points[b] else 0.0
+
+        self._fit_scores(history)
+
+        # Remaining regular season as (week, home index, away index) arrays
+        self.remaining = []
+        for week in graph.weeks:
+            if current_week <= week < playoff_week_start:
+                pairs = [(self.index[a], self.index[b]) for a, b in self._week_pairs(graph, week)]
+                if pairs:
+                    self.remaining.append(np.array(pairs, dtype=np.intp))
+
+        self.slots, self.byes = _bracket(self.playoff_teams)
+
+    @staticmethod
+    def _week_pairs(graph: ScheduleGraph, week: int) -> List[Tuple[int, int]]:
+        """Head-to-head roster pairs for a week"""
+        return [ids[:2] for ids in graph.pairs(week).values() if len(ids) >= 2]
+
+    def _fit_scores(self, history: List[List[float]]) -> None:
+        """Per-team weekly score model from completed weeks
+
+        Teams with fewer than two games fall back to the league's pooled mean and
+        spread; every spread is floored so a short, steady history isn't treated as certain.
+        """
+        pooled = np.array([score for scores in history for score in scores])
+        league_mean = float(pooled.mean()) if pooled.size else 100.0
+        league_std = float(pooled.std()) if pooled.size > 1 else 25.0
+
+        self.games = np.array([len(scores) for scores in history])
+        self.score_mean = np.array([np.mean(s) if len(s) >= 2 else league_mean for s in history])
+        self.score_std = np.maximum(
+            np.array([np.std(s, ddof=1) if len(s) >= 2 else league_std for s in history]), MIN_SCORE_STD)
+
+        width = max(int(self.games.max()) if self.games.size else 0, 1)
+        self.history = np.full((len(history), width), league_mean)
+        for i, scores in enumerate(history):
+            self.history[i, :len(scores)] = scores
+
+    @classmethod
+    def from_league(cls, league: Dict[str, Any], matchups: Dict[int, List[Dict[str, Any]]],
+                    current_week: int = None, method: str = 'normal') -> 'SeasonSimulator':
+        """Simulator using a Sleeper league payload's playoff settings"""
+        settings = league.get('settings') or {}
+        return cls(matchups, current_week=current_week,
+                   playoff_week_start=int(settings.get('playoff_week_start') or DEFAULT_PLAYOFF_WEEK_START),
+                   playoff_teams=int(settings.get('playoff_teams') or DEFAULT_PLAYOFF_TEAMS),
+                   method=method)
+
+    def _sample_scores(self, rng: np.random.Generator, simulations: int, weeks: int) -> np.ndarray:
+        """Simulations x weeks x teams weekly scores"""
+        shape = (simulations, weeks, len(self.team_ids))
+        if self.method == 'bootstrap' and self.games.min() >= 2:
+            picks = (rng.random(shape) * self.games).astype(np.intp)
+            return self.history[np.arange(len(self.team_ids)), picks]
+        return rng.normal(self.score_mean, self.score_std, size=shape)
+
+    def _simulate_batch(self, simulations: int, rng: np.random.Generator) -> Dict[str, np.ndarray]:
+        """Play out one batch of seasons and count outcomes per team"""
+        num_teams = len(self.team_ids)
+        wins = np.broadcast_to(self.wins, (simulations, num_teams)).copy()
+        points_for = np.broadcast_to(self.points_for, (simulations, num_teams)).copy()
+
+        if self.remaining:
+            scores = self._sample_scores(rng, simulations, len(self.remaining))
+            for w, pairs in enumerate(self.remaining):
+                week = scores[:, w]
+                home, away = week[:, pairs[:, 0]], week[:, pairs[:, 1]]
+                result = (home > away) + 0.5 * (home == away)
+                np.add.at(wins, (slice(None), pairs[:, 0]), result)
+                np.add.at(wins, (slice(None), pairs[:, 1]), 1.0 - result)
+                points_for += week
+
+        # Seed by wins, then points for; seeds[s, k] is the team holding seed k+1
+        seeds = np.lexsort((-points_for, -wins), axis=1)[:, :self.playoff_teams] if num_teams else \
+            np.zeros((simulations, 0), dtype=np.intp)
+        seed_counts = np.zeros((num_teams, num_teams))
+        np.add.at(seed_counts, (seeds, np.arange(self.playoff_teams)), 1)
+
+        rows = np.arange(simulations)[:, None]
+        field = np.where(self.slots >= 0, seeds[:, np.maximum(self.slots, 0)], -1)
+        finalists = np.zeros(num_teams)
+        while field.shape[1] > 1:
+            if field.shape[1] == 2:
+                np.add.at(finalists, field[field >= 0], 1)
+            week = self._sample_scores(rng, simulations, 1)[:, 0]
+            a, b = field[:, 0::2], field[:, 1::2]
+            score_a = np.where(a >= 0, week[rows, np.maximum(a, 0)], -np.inf)
+            score_b = np.where(b >= 0, week[rows, np.maximum(b, 0)], -np.inf)
+            field = np.where(score_a >= score_b, a, b)
+
+        champions = np.bincount(field[:, 0], minlength=num_teams) if num_teams else np.zeros(0)
+        return {
+            'simulations': np.array(simulations),
+            'wins': wins.sum(axis=0),
+            'seed_counts': seed_counts,
+            'finals': finalists,
+            'championships': champions.astype(float),
+        }
+
+    def simulate(self, simulations: int = DEFAULT_SIMULATIONS, seed: int = None,
+                 batch_size: int = DEFAULT_BATCH_SIZE, workers: int = 1) -> Dict[str, Any]:
+        """Run `simulations` seasons and return per-team playoff, bye and title odds
+
+        Seasons run in batches of `batch_size`; with `workers` > 1 the batches are spread
+        across a process pool. Each batch draws from its own spawned seed, so results for
+        a given seed are the same whatever the worker count.
+        """
+        sizes = [batch_size] * (simulations // batch_size)
+        if simulations % batch_size:
+            sizes.append(simulations % batch_size)
+        seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+        if workers > 1 and len(sizes) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                batches = list(pool.map(_run_batch, [self] * len(sizes), sizes, seeds))
+        else:
+            batches = [_run_batch(self, size, child) for size, child in zip(sizes, seeds)]
+
+        totals = {key: sum(batch[key] for batch in batches) for key in batches[0]} if batches else {}
+        return self._summarize(totals, simulations)
+
+    def _summarize(self, totals: Dict[str, np.ndarray], simulations: int) -> Dict[str, Any]:
+        """Turn outcome counts into probabilities"""
+        num_teams = len(self.team_ids)
+        if not simulations:
+            totals = {'wins': np.zeros(num_teams), 'seed_counts': np.zeros((num_teams, num_teams)),
+                      'finals': np.zeros(num_teams), 'championships': np.zeros(num_teams)}
+        scale = max(simulations, 1)
+        seed_probability = totals['seed_counts'][:, :self.playoff_teams] / scale
+
+        return {
+            'team_ids': list(self.team_ids),
+            'simulations': simulations,
+            'current_week': self.current_week,
+            'remaining_weeks': len(self.remaining),
+            'expected_wins': totals['wins'] / scale,
+            'seed_probability': seed_probability,
+            'playoff_probability': seed_probability.sum(axis=1),
+            'bye_probability': seed_probability[:, :self.byes].sum(axis=1),
+            'finals_probability': totals['finals'] / scale,
+            'championship_probability': totals['championships'] / scale,
+        }
+
+    @staticmethod
+    def team_odds(result: Dict[str, Any]) -> Dict[int, Dict[str, float]]:
+        """Per-team view of a simulate() result keyed by roster_id"""
+        odds = {}
+        for i, roster_id in enumerate(result['team_ids']):
+            odds[roster_id] = {
+                'expected_wins': float(result['expected_wins'][i]),
+                'playoff_probability': float(result['playoff_probability'][i]),
+                'bye_probability': float(result['bye_probability'][i]),
+                'finals_probability': float(result['finals_probability'][i]),
+                'championship_probability': float(result['championship_probability'][i]),
+            }
+        return odds
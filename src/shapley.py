@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+SHAPLEY ENGINE
+Shapley values of roster players where a coalition is worth the points of the
+optimal lineup it can field, exact for small rosters and permutation-sampled for large ones
+"""
+
+import math
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Optional, Sequence, Callable, Tuple
+
+import numpy as np
+
+try:
+    from .models import Position
+    from .lineup_optimizer import LEGION_SLOTS, LineupSolver
+except ImportError:
+    from models import Position
+    from lineup_optimizer import LEGION_SLOTS, LineupSolver
+
+logger = logging.getLogger(__name__)
+
+EXACT_MAX_PLAYERS = 10          # 2^10 coalitions; above this, sample permutations
+DEFAULT_TOLERANCE = 1.0         # target 95% half-width, in points per week
+DEFAULT_CONFIDENCE = 0.05
+MIN_PERMUTATIONS = 100
+PERMUTATION_CHUNK = 50
+Z_95 = 1.96
+
+def hoeffding_permutations(value_range: float, tolerance: float, num_players: int,
+                           delta: float = DEFAULT_CONFIDENCE) -> int:
+    """Permutations that bound every player's error by `tolerance` with probability 1 - delta
+
+    Each permutation gives one marginal contribution per player, lying in an interval
+    of width `value_range`; Hoeffding plus a union bound over players gives
+    m >= r^2 ln(2n/delta) / (2 tol^2).
+    """
+    if value_range <= 0 or num_players == 0:
+        return 0
+    return int(math.ceil(value_range ** 2 * math.log(2.0 * num_players / delta) / (2.0 * tolerance ** 2)))
+
+class CoalitionGame:
+    """Memoized coalition value function over player bitmasks"""
+
+    def __init__(self, value_fn: Callable[[int], float], num_players: int):
+        self.value_fn = value_fn
+        self.num_players = num_players
+        self._values: Dict[int, float] = {}
+
+    def value(self, mask: int) -> float:
+        """Value of the coalition whose members are the set bits of `mask`"""
+        cached = self._values.get(mask)
+        if cached is None:
+            cached = self._values[mask] = self.value_fn(mask)
+        return cached
+
+    @property
+    def evaluations(self) -> int:
+        """Distinct coalitions evaluated so far"""
+        return len(self._values)
+
+    def exact(self) -> np.ndarray:
+        """Exact Shapley values from all 2^n coalition values"""
+        n = self.num_players
+        masks = np.arange(1 << n)
+        values = np.array([self.value(int(mask)) for mask in masks])
+        sizes = np.zeros(1 << n, dtype=np.intp)
+        for i in range(n):
+            sizes += (masks >> i) & 1
+        # |S|! (n - |S| - 1)! / n! for coalitions S not containing the player
+        weights = np.array([math.factorial(s) * math.factorial(n - s - 1) / math.factorial(n) for s in range(n)])
+
+        phi = np.zeros(n)
+        for i in range(n):
+            without = masks[((masks >> i) & 1) == 0]
+            phi[i] = np.dot(weights[sizes[without]], values[without | (1 << i)] - values[without])
+        return phi
+
+    def sample(self, tolerance: float = DEFAULT_TOLERANCE, max_permutations: int = None,
+               seed: Any = None) -> Tuple[np.ndarray, np.ndarray, int]:
+        """Permutation-sampled Shapley values
+
+        Runs permutations in chunks until the largest 95% half-width (CLT, from the
+        running variance of each player's marginals) is within `tolerance`, or until
+        `max_permutations` (default: the Hoeffding bound; lineup values only grow as players
+        join, so every marginal lies in [0, v(N) - v(empty)]).
+        Returns (values, half_widths, permutations).
+        """
+        n = self.num_players
+        rng = np.random.default_rng(seed)
+        if max_permutations is None:
+            max_permutations = max(hoeffding_permutations(abs(self.value((1 << n) - 1) - self.value(0)),
+                                                          tolerance, n), MIN_PERMUTATIONS)
+
+        count = 0
+        mean = np.zeros(n)
+        m2 = np.zeros(n)
+        half_width = np.full(n, np.inf)
+        while count < max_permutations:
+            for _ in range(min(PERMUTATION_CHUNK, max_permutations - count)):
+                marginal = np.empty(n)
+                mask = 0
+                previous = self.value(0)
+                for player in rng.permutation(n):
+                    mask |= 1 << int(player)
+                    current = self.value(mask)
+                    marginal[player] = current - previous
+                    previous = current
+                # Welford update of the per-player mean and variance
+                count += 1
+                delta = marginal - mean
+                mean += delta / count
+                m2 += delta * (marginal - mean)
+            if count >= 2:
+                half_width = Z_95 * np.sqrt(m2 / (count - 1) / count)
+                if count >= MIN_PERMUTATIONS and half_width.max() <= tolerance:
+                    break
+        return mean, half_width, count
+
+class LineupGame(CoalitionGame):
+    """Coalition value = average weekly points of the optimal lineup the coalition can field"""
+
+    def __init__(self, points: np.ndarray, positions: Sequence[Position] = None,
+                 slots: Sequence[str] = LEGION_SLOTS):
+        self.points = np.asarray(points, dtype=np.float64)
+        self.solver = LineupSolver(slots)
+        self.eligibility = self.solver.eligibility(positions)
+        num_players = self.points.shape[0]
+        self._bits = 1 << np.arange(num_players)
+        super().__init__(self._lineup_value, num_players)
+
+    def _lineup_value(self, mask: int) -> float:
+        if not mask or not self.points.shape[1]:
+            return 0.0
+        available = (mask & self._bits) != 0
+        return float(self.solver.lineup_points(self.points, self.eligibility, available).mean())
+
+def team_shapley(player_ids: Sequence[str], points: np.ndarray, positions: Sequence[Position] = None,
+                 slots: Sequence[str] = LEGION_SLOTS, exact_max_players: int = EXACT_MAX_PLAYERS,
+                 tolerance: float = DEFAULT_TOLERANCE, seed: Any = None) -> Dict[str, Any]:
+    """Shapley value of each player in points per week of optimal lineup
+
+    `points` is players x weeks. Players who never score above zero can't add to any
+    lineup, so they get 0 and are left out of the game; exact Shapley is used when the
+    remaining players number at most `exact_max_players`, permutation sampling otherwise.
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(len(player_ids), -1)
+    active = np.flatnonzero((points > 0).any(axis=1))
+    game = LineupGame(points[active], None if positions is None else [positions[i] for i in active], slots)
+
+    values = np.zeros(len(player_ids))
+    half_width = np.zeros(len(player_ids))
+    permutations = 0
+    if len(active) <= exact_max_players:
+        method = 'exact'
+        values[active] = game.exact()
+    else:
+        method = 'sampled'
+        values[active], half_width[active], permutations = game.sample(tolerance, seed=seed)
+
+    return {
+        'values': dict(zip(player_ids, values.tolist())),
+        'half_width': dict(zip(player_ids, half_width.tolist())),
+        'total': game.value((1 << len(active)) - 1),
+        'method': method,
+        'permutations': permutations,
+        'coalitions': game.evaluations
+    }
+
+def _team_shapley_job(args: Tuple) -> Dict[str, Any]:
+    """Module-level entry point so teams can run in worker processes"""
+    player_ids, points, positions, seed, kwargs = args
+    return team_shapley(player_ids, points, positions, seed=seed, **kwargs)
+
+def league_shapley(teams: Dict[Any, Tuple[Sequence[str], np.ndarray, Optional[Sequence[Position]]]],
+                   workers: int = 1, seeds: Dict[Any, Any] = None, **kwargs) -> Dict[Any, Dict[str, Any]]:
+    """team_shapley() for every team, spread over a process pool when `workers` > 1
+
+    `teams` maps a team key to (player_ids, points, positions); `seeds` optionally maps
+    the same keys to each team's sampling seed.
+    """
+    keys = list(teams)
+    seeds = seeds or {}
+    jobs = [(*teams[key], seeds.get(key), kwargs) for key in keys]
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_team_shapley_job, jobs))
+    else:
+        results = [_team_shapley_job(job) for job in jobs]
+    return dict(zip(keys, results))
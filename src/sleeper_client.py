@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+SLEEPER CLIENT
+Process-wide pooled HTTP session layer, shared rate limiter with adaptive backoff,
+and bounded-concurrency asyncio client for Sleeper API requests
+"""
+
+import os
+import time
+import random
+import asyncio
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, Iterable, Callable
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+SLEEPER_BASE_URL = "https://api.sleeper.app/v1"
+DEFAULT_TIMEOUT = 10
+DEFAULT_POOL_SIZE = 10
+DEFAULT_MAX_CONCURRENT = 5
+DEFAULT_RATE_LIMIT = 10.0    # Sustained requests per second (Sleeper asks for < 1000/min)
+DEFAULT_RATE_BURST = 20
+DEFAULT_MAX_RETRIES = 3
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 30.0
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+_session_config: Dict[str, Any] = {
+    'pool_size': int(os.getenv('SLEEPER_POOL_SIZE', DEFAULT_POOL_SIZE)),
+    'keep_alive': os.getenv('SLEEPER_KEEP_ALIVE', 'true').lower() != 'false',
+    'timeout': DEFAULT_TIMEOUT,
+}
+
+def _build_session(pool_size: int, keep_alive: bool) -> requests.Session:
+    """Build a requests session with a per-host connection pool"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    if not keep_alive:
+        session.headers['Connection'] = 'close'
+
+    return session
+
+def get_session() -> requests.Session:
+    """Get the shared Sleeper session, creating it on first use"""
+    global _session
+
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session(_session_config['pool_size'], _session_config['keep_alive'])
+                logger.debug(f"Sleeper session created (pool_size={_session_config['pool_size']}, "
+                             f"keep_alive={_session_config['keep_alive']})")
+    return _session
+
+def configure_session(pool_size: int = None, keep_alive: bool = None, timeout: float = None) -> None:
+    """Reconfigure the shared session; a pool or keep-alive change opens a fresh pool on
+    the next request, a new request timeout applies to the current one"""
+    if pool_size is not None and pool_size < 1:
+        raise ValueError("pool_size must be at least 1")
+    if timeout is not None and timeout <= 0:
+        raise ValueError("timeout must be positive")
+    if timeout is not None:
+        _session_config['timeout'] = timeout
+    if pool_size is None and keep_alive is None:
+        return
+    if pool_size is not None:
+        _session_config['pool_size'] = pool_size
+    if keep_alive is not None:
+        _session_config['keep_alive'] = keep_alive
+    close_session()
+
+def configure_session_from_settings(config: Dict[str, Any]) -> None:
+    """Apply data_sources.sleeper.pool_size / keep_alive / timeout
+
+    SLEEPER_POOL_SIZE / SLEEPER_KEEP_ALIVE take precedence when set. The session is
+    only replaced when the pool configuration actually changes.
+    """
+    sleeper = config.get('data_sources', {}).get('sleeper', {})
+    settings = {}
+    if sleeper.get('pool_size') is not None and 'SLEEPER_POOL_SIZE' not in os.environ:
+        settings['pool_size'] = int(sleeper['pool_size'])
+    if sleeper.get('keep_alive') is not None and 'SLEEPER_KEEP_ALIVE' not in os.environ:
+        settings['keep_alive'] = bool(sleeper['keep_alive'])
+    if sleeper.get('timeout') is not None:
+        settings['timeout'] = float(sleeper['timeout'])
+
+    changed = {key: value for key, value in settings.items() if _session_config[key] != value}
+    if changed:
+        configure_session(**changed)
+
+def ensure_pool_size(pool_size: int) -> None:
+    """Grow the shared session's pool to at least `pool_size` connections
+
+    Resizing replaces the session, so call this once before requests start
+    (e.g. with the run's max_concurrent); a large enough pool is left alone.
+    """
+    if _session_config['pool_size'] < pool_size:
+        configure_session(pool_size=pool_size)
+
+def get_session_config() -> Dict[str, Any]:
+    """Get the current session configuration"""
+    return dict(_session_config)
+
+def close_session() -> None:
+    """Close the shared session and release its pooled connections"""
+    global _session
+
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+class TokenBucket:
+    """Thread-safe token bucket; callers reserve a token and sleep off any deficit"""
+
+    def __init__(self, rate: float = DEFAULT_RATE_LIMIT, capacity: int = DEFAULT_RATE_BURST):
+        if rate <= 0 or capacity < 1:
+            raise ValueError("rate must be positive and capacity at least 1")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take one token and return how long the caller must wait for it"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self.rate)
+
+    def acquire(self) -> float:
+        """Block until a token is available; returns seconds spent throttled"""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+def backoff_delay(attempt: int, base: float = BACKOFF_BASE, cap: float = BACKOFF_CAP) -> float:
+    """Exponential backoff with full jitter for a zero-based retry attempt"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+_limiter = TokenBucket(float(os.getenv('SLEEPER_RATE_LIMIT', DEFAULT_RATE_LIMIT)),
+                       int(os.getenv('SLEEPER_RATE_BURST', DEFAULT_RATE_BURST)))
+_max_retries = DEFAULT_MAX_RETRIES
+_metrics_lock = threading.Lock()
+_metrics: Dict[str, float] = {}
+
+def reset_request_metrics() -> None:
+    """Zero the request layer metrics"""
+    with _metrics_lock:
+        _metrics.update({
+            'requests': 0, 'throttled_requests': 0, 'throttled_seconds': 0.0,
+            'retries': 0, 'backoff_seconds': 0.0, 'rate_limited_responses': 0, 'server_errors': 0
+        })
+
+reset_request_metrics()
+
+def _record(**increments) -> None:
+    """Add to the request layer metrics"""
+    with _metrics_lock:
+        for key, value in increments.items():
+            _metrics[key] += value
+
+def get_request_metrics() -> Dict[str, float]:
+    """Get request counts, throttled time and retry/backoff totals"""
+    with _metrics_lock:
+        return dict(_metrics)
+
+def configure_rate_limit(rate: float = None, burst: int = None, max_retries: int = None) -> None:
+    """Reconfigure the shared rate limiter and retry budget"""
+    global _limiter, _max_retries
+
+    if rate is not None or burst is not None:
+        _limiter = TokenBucket(rate if rate is not None else _limiter.rate,
+                               burst if burst is not None else _limiter.capacity)
+    if max_retries is not None:
+        _max_retries = max(0, max_retries)
+
+def configure_rate_limit_from_settings(config: Dict[str, Any]) -> None:
+    """Apply data_sources.sleeper.rate_limit / rate_limit_burst / max_retries"""
+    sleeper = config.get('data_sources', {}).get('sleeper', {})
+    configure_rate_limit(sleeper.get('rate_limit'), sleeper.get('rate_limit_burst'), sleeper.get('max_retries'))
+
+def _retry_after(response: requests.Response) -> Optional[float]:
+    """Parse a Retry-After header in seconds"""
+    value = response.headers.get('Retry-After')
+    try:
+        return min(BACKOFF_CAP, float(value)) if value is not None else None
+    except ValueError:
+        return None
+
+def sleeper_get(url: str, timeout: float = None, stream: bool = False) -> requests.Response:
+    """GET through the shared rate limiter, retrying 429/5xx and connection errors with jittered backoff
+
+    `timeout` defaults to the session's configured request timeout.
+    """
+    timeout = timeout if timeout is not None else _session_config['timeout']
+    attempt = 0
+    while True:
+        throttled = _limiter.acquire()
+        _record(requests=1, throttled_requests=1 if throttled > 0 else 0, throttled_seconds=throttled)
+
+        try:
+            response = get_session().get(url, timeout=timeout, stream=stream)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            if attempt >= _max_retries:
+                raise
+            delay = backoff_delay(attempt)
+            logger.warning(f"Sleeper request error ({e}), retrying in {delay:.2f}s")
+        else:
+            if response.status_code not in RETRY_STATUS_CODES:
+                return response
+
+            if response.status_code == 429:
+                _record(rate_limited_responses=1)
+            else:
+                _record(server_errors=1)
+            if attempt >= _max_retries:
+                return response
+            response.close()
+
+            retry_after = _retry_after(response)
+            delay = retry_after if retry_after is not None else backoff_delay(attempt)
+            logger.warning(f"Sleeper returned {response.status_code} for {url}, retrying in {delay:.2f}s")
+
+        _record(retries=1, backoff_seconds=delay)
+        time.sleep(delay)
+        attempt += 1
+
+class AsyncSleeperClient:
+    """Asyncio Sleeper client with semaphore-bounded concurrency
+
+    Each request runs make_sleeper_request in a worker thread, so every layer
+    underneath it (pooled session, caching, rate limiting) still applies. The
+    shared pool is not resized here (other clients may be mid-request); size it
+    up front with ensure_pool_size.
+    """
+
+    def __init__(self, max_concurrent: int = DEFAULT_MAX_CONCURRENT,
+                 request_fn: Callable[[str], Any] = None):
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1")
+        self.max_concurrent = max_concurrent
+
+        if request_fn is None:
+            try:
+                from .utils import make_sleeper_request
+            except ImportError:
+                from utils import make_sleeper_request
+            request_fn = make_sleeper_request
+        self.request_fn = request_fn
+
+    async def _fetch(self, endpoint: str, semaphore: asyncio.Semaphore,
+                     executor: ThreadPoolExecutor) -> Any:
+        """Fetch one endpoint while holding a concurrency slot"""
+        async with semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(executor, self.request_fn, endpoint)
+
+    async def fetch(self, endpoint: str) -> Any:
+        """Fetch a single endpoint"""
+        results = await self.fetch_many([endpoint])
+        return results[endpoint]
+
+    async def fetch_many(self, endpoints: Iterable[str]) -> Dict[str, Any]:
+        """Fetch endpoints concurrently; results are keyed by endpoint (None on failure)"""
+        unique_endpoints = list(dict.fromkeys(endpoints))
+        if not unique_endpoints:
+            return {}
+
+        semaphore = asyncio.Semaphore(self.max_concurrent)
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrent, len(unique_endpoints))) as executor:
+            responses = await asyncio.gather(
+                *(self._fetch(endpoint, semaphore, executor) for endpoint in unique_endpoints)
+            )
+
+        return dict(zip(unique_endpoints, responses))
+
+def fetch_many(endpoints: Iterable[str], max_concurrent: int = DEFAULT_MAX_CONCURRENT,
+               request_fn: Callable[[str], Any] = None) -> Dict[str, Any]:
+    """Sync facade: fetch endpoints concurrently from synchronous code"""
+    client = AsyncSleeperClient(max_concurrent, request_fn)
+    endpoints = list(endpoints)
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(client.fetch_many(endpoints))
+
+    # Called from inside a running event loop: drive a private loop on a helper thread
+    with ThreadPoolExecutor(max_workers=1) as runner:
+        return runner.submit(asyncio.run, client.fetch_many(endpoints)).result()
+
+def get_max_concurrent(config: Dict[str, Any]) -> int:
+    """Resolve request concurrency from the performance settings"""
+    performance = config.get('performance', {})
+    if not performance.get('parallel_requests', True):
+        return 1
+    return max(1, int(performance.get('max_concurrent_api_calls', DEFAULT_MAX_CONCURRENT)))
@@ -4,7 +4,6 @@ LEGION TEAM EXTRACTION
 Production module for extracting team names, logos, and metadata from Sleeper API
 """
 
-import requests
 from typing import Dict, List, Optional
 import json
 import os
@@ -36,6 +35,10 @@ class LegionTeamExtractor:
         if not rosters or not users:
             raise Exception("Failed to fetch league data from Sleeper API")
         
+        return self.build_teams(rosters, users)
+    
+    def build_teams(self, rosters: List[Dict], users: List[Dict]) -> List[Dict]:
+        """Build team data from already-fetched rosters and users"""
         # Create user lookup
         user_lookup = {user['user_id']: user for user in users}
         
@@ -7,13 +7,66 @@ from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
 import os
 
-def make_sleeper_request(endpoint: str, base_url: str = "https://api.sleeper.app/v1") -> Optional[Dict]:
-    """Make request to Sleeper API with error handling"""
+try:
+    from .sleeper_client import sleeper_get, backoff_delay, SLEEPER_BASE_URL
+    from .response_cache import get_response_cache
+    from .immutable_store import get_immutable_store
+    from .cassette import get_cassette
+except ImportError:
+    from sleeper_client import sleeper_get, backoff_delay, SLEEPER_BASE_URL
+    from response_cache import get_response_cache
+    from immutable_store import get_immutable_store
+    from cassette import get_cassette
+
+def make_sleeper_request(endpoint: str, base_url: str = SLEEPER_BASE_URL) -> Optional[Dict]:
+    """Make request to Sleeper API with error handling
+    
+    In replay mode responses come only from the active cassette; in record mode every
+    response returned here is captured into it.
+    """
     url = f"{base_url}/{endpoint}"
+    cassette = get_cassette()
+    
+    if cassette is not None and cassette.replaying:
+        hit, data = cassette.play(url)
+        if not hit:
+            logging.warning(f"Sleeper cassette has no recording for {endpoint}")
+        return data
+    
+    data = _fetch_sleeper(endpoint, url, base_url)
+    if cassette is not None and cassette.recording:
+        cassette.record(url, data)
+    return data
+
+def _fetch_sleeper(endpoint: str, url: str, base_url: str) -> Optional[Dict]:
+    """Fetch through the cache layers
+    
+    Immutable endpoints (past seasons, completed weeks) are served from the permanent
+    store, everything else from the TTL cache, before falling back to the rate-limited pooled session.
+    """
+    permanent = get_immutable_store() if base_url == SLEEPER_BASE_URL else None
+    if permanent is not None and not permanent.is_immutable(endpoint):
+        permanent = None
+    cache = get_response_cache() if base_url == SLEEPER_BASE_URL and permanent is None else None
+    
+    if permanent is not None:
+        data = permanent.get(endpoint)
+        if data is not None:
+            return data
+    elif cache is not None:
+        hit, data = cache.get(endpoint)
+        if hit:
+            return data
+    
     try:
-        response = requests.get(url, timeout=10)
+        response = sleeper_get(url)
         response.raise_for_status()
-        return response.json()
+        data = response.json()
+        if permanent is not None:
+            permanent.set(endpoint, data)
+        elif cache is not None:
+            cache.set(endpoint, data)
+        return data
     except requests.exceptions.RequestException as e:
         logging.error(f"Sleeper API request failed: {endpoint} - {str(e)}")
         return None
@@ -23,6 +76,24 @@ def make_sleeper_request(endpoint: str, base_url: str = "https://api.sleeper.app
 
 logger = logging.getLogger(__name__)
 
+SETTINGS_PATH = os.path.join(os.path.dirname(__file__), '..', 'config', 'settings.yaml')
+
+def load_settings(path: str = None) -> Dict[str, Any]:
+    """Load config/settings.yaml (empty config if missing or PyYAML unavailable)"""
+    path = path or SETTINGS_PATH
+    try:
+        import yaml
+    except ImportError:
+        logger.warning("PyYAML not available, using default settings")
+        return {}
+    
+    try:
+        with open(path, 'r') as f:
+            return yaml.safe_load(f) or {}
+    except (OSError, yaml.YAMLError) as e:
+        logger.warning(f"Failed to load settings from {path}: {e}")
+        return {}
+
 def calculate_gini_coefficient(values: List[float]) -> float:
     """Calculate Gini coefficient for measuring inequality"""
     if not values:
@@ -316,8 +387,8 @@ def merge_configs(base_config: Dict[str, Any], override_config: Dict[str, Any])
     merged.update(override_config)
     return merged
 
-def retry_on_failure(max_retries: int = 3, delay: float = 1.0):
-    """Decorator for retrying functions on failure"""
+def retry_on_failure(max_retries: int = 3, delay: float = 1.0, max_delay: float = 30.0):
+    """Decorator for retrying functions on failure (exponential backoff with jitter)"""
     def decorator(func):
         def wrapper(*args, **kwargs):
             last_exception = None
@@ -328,9 +399,10 @@ def retry_on_failure(max_retries: int = 3, delay: float = 1.0):
                 except Exception as e:
                     last_exception = e
                     if attempt < max_retries - 1:
-                        logger.warning(f"Attempt {attempt + 1} failed: {e}. Retrying in {delay}s...")
+                        wait = backoff_delay(attempt, base=delay, cap=max_delay)
+                        logger.warning(f"Attempt {attempt + 1} failed: {e}. Retrying in {wait:.2f}s...")
                         import time
-                        time.sleep(delay)
+                        time.sleep(wait)
                     else:
                         logger.error(f"All {max_retries} attempts failed")
             
@@ -12,80 +12,126 @@ import logging
 
 try:
     from .models import Team, Player, Position
-    from .utils import make_sleeper_request
     from .ingram_calculator import IngramCalculator
     from .alvarado_calculator import AlvaradoCalculator
+    from .matchup_store import MatchupStore
+    from .league_context import LeagueContext
+    from .schedule_graph import ScheduleGraph
 except ImportError:
     from models import Team, Player, Position
-    from utils import make_sleeper_request
     from ingram_calculator import IngramCalculator
     from alvarado_calculator import AlvaradoCalculator
+    from matchup_store import MatchupStore
+    from league_context import LeagueContext
+    from schedule_graph import ScheduleGraph
 
 logger = logging.getLogger(__name__)
 
+def zion_tensor_matrix(counts: np.ndarray, features: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Zion tensor vectors and magnitudes from schedule counts and opponent features
+    
+    `counts` is teams x teams games played and `features` teams x 4 (win %, score
+    variance, Ingram, Alvarado; NaN when unknown). Leading axes are batched, so a
+    stack of per-week counts and features gives every week's tensors at once.
+    """
+    faced = (counts > 0).astype(float)
+    
+    # Dimension 1 weights opponents by games played; 2-4 count each opponent once
+    valid = ~np.isnan(features)
+    values = np.where(valid, features, 0.0)
+    weights = np.concatenate([counts.sum(axis=-1, keepdims=True), faced @ valid[..., 1:]], axis=-1)
+    totals = np.concatenate([counts @ values[..., :1], faced @ values[..., 1:]], axis=-1)
+    means = np.divide(totals, weights, out=np.full_like(totals, np.nan), where=weights > 0)
+    
+    tensors = np.stack([
+        np.where(np.isnan(means[..., 0]), 0.5, means[..., 0]),
+        np.where(np.isnan(means[..., 1]), 0.0, np.minimum(means[..., 1] / 1000.0, 1.0)),
+        np.where(np.isnan(means[..., 2]), 0.5, means[..., 2]),
+        np.where(np.isnan(means[..., 3]), 0.5, np.minimum(means[..., 3] / 20.0, 1.0))
+    ], axis=-1)
+    return tensors, np.sqrt((tensors ** 2).sum(axis=-1))
+
 class ZionTensorCalculator:
     """Calculate Zion Tensor using 4D Strength of Schedule methodology"""
     
-    def __init__(self, league_id: str = "1267325171853701120"):
+    def __init__(self, league_id: str = "1267325171853701120", matchup_store: MatchupStore = None,
+                 ingram_calc: IngramCalculator = None, alvarado_calc: AlvaradoCalculator = None):
         self.league_id = league_id
-        self.ingram_calc = IngramCalculator()
-        self.alvarado_calc = AlvaradoCalculator(league_id)
-        self.matchup_cache = {}
+        self.matchup_store = matchup_store or MatchupStore(league_id)
+        self.ingram_calc = ingram_calc or IngramCalculator()
+        self.alvarado_calc = alvarado_calc or AlvaradoCalculator(league_id, self.matchup_store)
+        self.context: Optional[LeagueContext] = None
+        self._ingram_by_team: Dict[int, float] = {}
+        self._alvarado_by_team: Dict[int, float] = {}
+        self._graph: Optional[ScheduleGraph] = None
+        self._graph_source = None
+    
+    def bind_context(self, context: LeagueContext) -> None:
+        """Read schedule and team data from a shared league context
+        
+        Opponent Ingram and Alvarado scores are memoized per context, so each team's
+        score is computed once per run instead of once per opponent that faced it.
+        """
+        self.context = context
+        self._ingram_by_team = {}
+        self._alvarado_by_team = {}
+        if self.alvarado_calc.context is not context:
+            self.alvarado_calc.bind_context(context)
         
     def _fetch_all_matchups(self, weeks: List[int] = None) -> Dict[int, List[Dict[str, Any]]]:
         """Fetch all weekly matchups for tensor calculation"""
-        if weeks is None:
-            weeks = list(range(1, 9))  # Weeks 1-8 (current)
-        
-        all_matchups = {}
+        if self.context is not None and weeks is None:
+            return self.context.matchups
         
-        for week in weeks:
-            try:
-                matchups = make_sleeper_request(f"league/{self.league_id}/matchups/{week}")
-                if matchups:
-                    all_matchups[week] = matchups
-                    
-            except Exception as e:
-                logger.warning(f"Failed to fetch week {week} matchups: {e}")
-                continue
+        all_matchups = self.matchup_store.get_all_matchups(weeks)
         
-        logger.info(f"Loaded matchups for {len(all_matchups)} weeks")
+        logger.debug(f"Loaded matchups for {len(all_matchups)} weeks")
         return all_matchups
     
-    def _get_team_opponents(self, team_id: str, all_matchups: Dict[int, List[Dict[str, Any]]]) -> List[str]:
-        """Get list of opponent team IDs for a team"""
-        opponents = []
-        
-        for week, matchups in all_matchups.items():
-            # Find team's matchup for this week
-            team_matchup = None
-            for matchup in matchups:
-                if str(matchup.get('roster_id')) == str(team_id):
-                    team_matchup = matchup
-                    break
-            
-            if not team_matchup:
-                continue
-            
-            # Find opponent in same matchup_id
-            matchup_id = team_matchup.get('matchup_id')
-            if matchup_id:
-                for matchup in matchups:
-                    if (matchup.get('matchup_id') == matchup_id and 
-                        str(matchup.get('roster_id')) != str(team_id)):
-                        opponents.append(str(matchup.get('roster_id')))
-                        break
-        
-        return opponents
+    def _team_lookup(self, teams: List[Team]) -> Dict[int, Team]:
+        """roster_id -> Team (the context's index when bound)"""
+        if self.context is not None:
+            return self.context.team_index
+        return {int(team.team_id): team for team in teams}
+    
+    def _schedule(self, all_matchups: Dict[int, List[Dict[str, Any]]]) -> ScheduleGraph:
+        """Schedule graph for a matchup set (the context's when bound, else built once and reused)"""
+        if self.context is not None and all_matchups is self.context.matchups:
+            return self.context.schedule
+        if self._graph is None or self._graph_source is not all_matchups:
+            self._graph = ScheduleGraph(all_matchups)
+            self._graph_source = all_matchups
+        return self._graph
+    
+    def _get_team_opponents(self, team_id: Any, all_matchups: Dict[int, List[Dict[str, Any]]]) -> List[int]:
+        """Get list of opponent roster IDs for a team, in week order"""
+        return list(self._schedule(all_matchups).opponents(int(team_id)))
+    
+    def _team_ingram(self, opponent: Team, players: Dict[str, Player]) -> float:
+        """Ingram Index for a team, memoized while a context is bound"""
+        if self.context is None:
+            return self.ingram_calc.calculate_team_ingram(opponent, players)
+        roster_id = int(opponent.team_id)
+        if roster_id not in self._ingram_by_team:
+            self._ingram_by_team[roster_id] = self.ingram_calc.calculate_team_ingram(opponent, players)
+        return self._ingram_by_team[roster_id]
+    
+    def _team_alvarado(self, opponent: Team) -> float:
+        """Alvarado Index for a team, memoized while a context is bound"""
+        if self.context is None:
+            return self.alvarado_calc.calculate_team_alvarado(opponent)
+        roster_id = int(opponent.team_id)
+        if roster_id not in self._alvarado_by_team:
+            self._alvarado_by_team[roster_id] = self.alvarado_calc.calculate_team_alvarado(opponent)
+        return self._alvarado_by_team[roster_id]
     
-    def _calculate_dimension_1_traditional(self, team_id: str, opponents: List[str], 
+    def _calculate_dimension_1_traditional(self, team_id: str, opponents: List[int], 
                                          teams: List[Team]) -> float:
         """Dimension 1: Traditional SoS (opponent win percentage)"""
         if not opponents:
             return 0.5  # Neutral if no opponents
         
-        # Create team lookup
-        team_lookup = {str(team.team_id): team for team in teams}
+        team_lookup = self._team_lookup(teams)
         
         opponent_win_pcts = []
         
@@ -104,21 +150,24 @@ class ZionTensorCalculator:
         logger.debug(f"Team {team_id} Traditional SoS: {avg_opp_win_pct:.3f}")
         return avg_opp_win_pct
     
-    def _calculate_dimension_2_volatility(self, team_id: str, opponents: List[str],
+    def _calculate_dimension_2_volatility(self, team_id: str, opponents: List[int],
                                         all_matchups: Dict[int, List[Dict[str, Any]]]) -> float:
         """Dimension 2: Volatility Exposure (opponent score variance)"""
         if not opponents:
             return 0.0
         
         # Collect opponent weekly scores
-        opponent_scores = {opp_id: [] for opp_id in set(opponents)}
-        
-        for week, matchups in all_matchups.items():
-            for matchup in matchups:
-                roster_id = str(matchup.get('roster_id'))
-                if roster_id in opponent_scores:
-                    points = matchup.get('points', 0.0)
-                    opponent_scores[roster_id].append(points)
+        if self.context is not None and all_matchups is self.context.matchups:
+            opponent_scores = {opp_id: self.context.team_scores(opp_id) for opp_id in set(opponents)}
+        else:
+            opponent_scores = {opp_id: [] for opp_id in set(opponents)}
+            
+            for week, matchups in all_matchups.items():
+                for matchup in matchups:
+                    roster_id = int(matchup.get('roster_id'))
+                    if roster_id in opponent_scores:
+                        points = matchup.get('points', 0.0)
+                        opponent_scores[roster_id].append(points)
         
         # Calculate variance for each opponent
         opponent_variances = []
@@ -138,21 +187,20 @@ class ZionTensorCalculator:
         logger.debug(f"Team {team_id} Volatility Exposure: {normalized_variance:.3f}")
         return normalized_variance
     
-    def _calculate_dimension_3_positional(self, team_id: str, opponents: List[str],
+    def _calculate_dimension_3_positional(self, team_id: str, opponents: List[int],
                                         teams: List[Team], players: Dict[str, Player]) -> float:
         """Dimension 3: Positional Stress (opponent Ingram indices)"""
         if not opponents:
             return 0.5
         
-        # Create team lookup
-        team_lookup = {str(team.team_id): team for team in teams}
+        team_lookup = self._team_lookup(teams)
         
         opponent_ingram_scores = []
         
         for opp_id in set(opponents):  # Remove duplicates
             opponent = team_lookup.get(opp_id)
             if opponent:
-                ingram_score = self.ingram_calc.calculate_team_ingram(opponent, players)
+                ingram_score = self._team_ingram(opponent, players)
                 opponent_ingram_scores.append(ingram_score)
         
         if not opponent_ingram_scores:
@@ -164,14 +212,13 @@ class ZionTensorCalculator:
         logger.debug(f"Team {team_id} Positional Stress: {avg_opp_ingram:.3f}")
         return avg_opp_ingram
     
-    def _calculate_dimension_4_efficiency(self, team_id: str, opponents: List[str],
+    def _calculate_dimension_4_efficiency(self, team_id: str, opponents: List[int],
                                         teams: List[Team]) -> float:
         """Dimension 4: Efficiency Pressure (opponent Alvarado indices)"""
         if not opponents:
             return 0.5
         
-        # Create team lookup
-        team_lookup = {str(team.team_id): team for team in teams}
+        team_lookup = self._team_lookup(teams)
         
         opponent_alvarado_scores = []
         
@@ -179,7 +226,7 @@ class ZionTensorCalculator:
             opponent = team_lookup.get(opp_id)
             if opponent:
                 try:
-                    alvarado_score = self.alvarado_calc.calculate_team_alvarado(opponent)
+                    alvarado_score = self._team_alvarado(opponent)
                     opponent_alvarado_scores.append(alvarado_score)
                 except Exception as e:
                     logger.warning(f"Failed to calculate Alvarado for opponent {opp_id}: {e}")
@@ -289,11 +336,14 @@ class ZionTensorCalculator:
         
         return interpretation
     
-    def calculate_league_zion_tensors(self, teams: List[Team], 
-                                    players: Dict[str, Player]) -> Dict[str, Dict[str, Any]]:
-        """Calculate Zion Tensors for all teams in league"""
+    def calculate_league_zion_tensors(self, teams: List[Team], players: Dict[str, Player],
+                                    matrix: bool = True) -> Dict[str, Dict[str, Any]]:
+        """Calculate Zion Tensors for all teams in league (matrix mode unless `matrix` is False)"""
         logger.info("Calculating Zion Tensors for all teams...")
         
+        if matrix:
+            return self.calculate_league_zion_matrix(teams, players)
+        
         zion_tensors = {}
         
         for team in teams:
@@ -314,6 +364,106 @@ class ZionTensorCalculator:
         
         return zion_tensors
     
+    def _schedule_counts(self, index: Dict[int, int],
+                         all_matchups: Dict[int, List[Dict[str, Any]]]) -> np.ndarray:
+        """Teams x teams matrix of how many times each team faced each other team"""
+        return self._schedule(all_matchups).count_matrix(index)
+    
+    def _score_variances(self, index: Dict[int, int],
+                         all_matchups: Dict[int, List[Dict[str, Any]]]) -> np.ndarray:
+        """Sample variance of each team's weekly points (NaN with fewer than two weeks)"""
+        if self.context is not None and all_matchups is self.context.matchups:
+            scores = {roster_id: self.context.team_scores(roster_id) for roster_id in index}
+        else:
+            scores = {roster_id: [] for roster_id in index}
+            for week, matchups in all_matchups.items():
+                for matchup in matchups:
+                    roster_id = int(matchup.get('roster_id'))
+                    if roster_id in scores:
+                        scores[roster_id].append(matchup.get('points', 0.0))
+        
+        variances = np.full(len(index), np.nan)
+        for roster_id, row in index.items():
+            if len(scores[roster_id]) > 1:
+                variances[row] = statistics.variance(scores[roster_id])
+        return variances
+    
+    def calculate_league_zion_matrix(self, teams: List[Team], players: Dict[str, Player],
+                                     ingram_scores: Dict[int, float] = None,
+                                     alvarado_scores: Dict[int, float] = None,
+                                     roster_ids: Optional[List[int]] = None) -> Dict[str, Dict[str, Any]]:
+        """Calculate Zion Tensors for all teams with matrix products
+        
+        Builds the teams x teams schedule-count matrix C once and a teams x 4 feature
+        matrix (win %, score variance, Ingram, Alvarado). Dimension 1 averages over
+        every game (C @ win% / games); dimensions 2-4 average over distinct opponents
+        (1[C > 0] @ feature / opponents), skipping opponents without a feature value.
+        Matches calculate_team_zion_tensor team by team. Ingram and Alvarado scores
+        (roster_id -> raw score) are computed here when not supplied. `roster_ids`
+        limits the tensors to those teams' rows of C; the feature matrix still covers
+        every team, since any of them can be an opponent.
+        """
+        all_matchups = self._fetch_all_matchups()
+        index = {int(team.team_id): i for i, team in enumerate(teams)}
+        
+        counts = self._schedule_counts(index, all_matchups)
+        if roster_ids is not None:
+            wanted = set(int(roster_id) for roster_id in roster_ids)
+            targets = [team for team in teams if int(team.team_id) in wanted]
+        else:
+            targets = teams
+        rows = {int(team.team_id): i for i, team in enumerate(targets)}
+        counts_rows = counts[[index[roster_id] for roster_id in rows]]
+        faced = (counts_rows > 0).astype(float)
+        
+        if ingram_scores is None:
+            ingram_scores = {int(team.team_id): self._team_ingram(team, players) for team in teams}
+        if alvarado_scores is None:
+            alvarado_scores = {}
+            for team in teams:
+                try:
+                    alvarado_scores[int(team.team_id)] = self._team_alvarado(team)
+                except Exception as e:
+                    logger.warning(f"Failed to calculate Alvarado for opponent {team.team_id}: {e}")
+        
+        features = np.full((len(teams), 4), np.nan)
+        features[:, 0] = [team.win_percentage for team in teams]
+        features[:, 1] = self._score_variances(index, all_matchups)
+        for roster_id, row in index.items():
+            features[row, 2] = ingram_scores.get(roster_id, np.nan)
+            features[row, 3] = alvarado_scores.get(roster_id, np.nan)
+        
+        tensors, magnitudes = zion_tensor_matrix(counts_rows, features)
+        
+        zion_tensors = {}
+        for team in targets:
+            row = rows[int(team.team_id)]
+            if not counts_rows[row].any():
+                logger.warning(f"No opponents found for team {team.team_name}")
+                zion_tensors[team.team_id] = {
+                    'tensor_vector': [0.5, 0.0, 0.5, 0.5],
+                    'tensor_magnitude': 0.5,
+                    'dimensions': {'traditional': 0.5, 'volatility': 0.0, 'positional': 0.5, 'efficiency': 0.5}
+                }
+                continue
+            
+            tensor_vector = [float(value) for value in tensors[row]]
+            zion_tensors[team.team_id] = {
+                'tensor_vector': tensor_vector,
+                'tensor_magnitude': float(magnitudes[row]),
+                'dimensions': {
+                    'traditional': tensor_vector[0],
+                    'volatility': tensor_vector[1],
+                    'positional': tensor_vector[2],
+                    'efficiency': tensor_vector[3]
+                },
+                'opponents_faced': int(faced[row].sum()),
+                'interpretation': self._interpret_tensor(tensor_vector)
+            }
+        
+        logger.info(f"Zion Tensors calculated for {len(targets)} teams (matrix mode)")
+        return zion_tensors
+    
     def analyze_schedule_difficulty(self, teams: List[Team], 
                                   players: Dict[str, Player]) -> Dict[str, Any]:
         """Analyze schedule difficulty across all dimensions"""
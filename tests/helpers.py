@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""Shared test helpers: a brute-force lineup check and a fake Sleeper API"""
+import sys
+import itertools
+from collections import Counter
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.lineup_optimizer import SLOT_ELIGIBILITY
+
+def brute_force_lineup(points, positions, slots):
+    """Best assignment of players to slots by trying every ordered pick"""
+    best = 0.0
+    for picks in itertools.permutations(range(len(positions) + len(slots)), len(slots)):
+        total = 0.0
+        for slot, pick in zip(slots, picks):
+            if pick < len(positions) and positions[pick] in SLOT_ELIGIBILITY[slot]:
+                total += max(points[pick], 0.0)
+            elif pick < len(positions):
+                break
+        else:
+            best = max(best, total)
+    return best
+
+def build_week(week: int, num_teams: int = 4):
+    """Build one week of Sleeper matchup entries (1v2, 3v4, ...)"""
+    return [
+        {
+            'roster_id': roster_id,
+            'matchup_id': (roster_id + 1) // 2,
+            'points': 100.0 + roster_id * 5 + week,
+            'players_points': {f"p{roster_id}_{slot}": 10.0 + slot for slot in range(3)},
+            'starters': [f"p{roster_id}_{slot}" for slot in range(3)]
+        }
+        for roster_id in range(1, num_teams + 1)
+    ]
+
+class FakeSleeper:
+    """Stand-in for make_sleeper_request that counts calls per endpoint"""
+
+    def __init__(self, num_teams: int = 4):
+        self.num_teams = num_teams
+        self.calls = Counter()
+
+    def __call__(self, endpoint: str):
+        self.calls[endpoint] += 1
+        if "/matchups/" in endpoint:
+            return build_week(int(endpoint.rsplit('/', 1)[1]), self.num_teams)
+        if endpoint.endswith("/drafts"):
+            return [{'draft_id': 'd1'}]
+        if endpoint.startswith("draft/"):
+            return [{'player_id': f"p{r}_0", 'pick_no': r, 'round': 1, 'roster_id': r}
+                    for r in range(1, self.num_teams + 1)]
+        if endpoint.endswith("/rosters"):
+            return [{'roster_id': r, 'owner_id': f"u{r}", 'settings': {}} for r in range(1, self.num_teams + 1)]
+        if endpoint.endswith("/users"):
+            return [{'user_id': f"u{r}", 'display_name': f"Owner {r}", 'metadata': {}}
+                    for r in range(1, self.num_teams + 1)]
+        return None
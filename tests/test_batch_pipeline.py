@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Unit tests for the multi-league batch pipeline"""
+import unittest
+import sys
+import os
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from scripts.pipeline import BatchCPRPipeline, RealCPRPipeline, STATS_ENDPOINTS, apply_pool_size
+from src.database import LocalDatabase
+from src.models import CPRMetrics
+
+LEAGUES = ["101", "202", "303"]
+CONFIG = {'performance': {'max_concurrent_leagues': 3}}
+
+def fake_fetch_many(calls):
+    """fetch_many stand-in returning a tiny league per league ID and empty stats"""
+    def fetch(endpoints, max_concurrent=None):
+        endpoints = list(endpoints)
+        calls.append(endpoints)
+        responses = {}
+        for endpoint in endpoints:
+            parts = endpoint.split('/')
+            if parts[0] == 'stats':
+                responses[endpoint] = {f"{parts[-1]}_p": {'gp': 1, 'pts_ppr': 10.0}}
+            elif endpoint.endswith('/rosters'):
+                responses[endpoint] = [{'roster_id': 1, 'owner_id': 'u1', 'players': [f"p{parts[1]}", "shared"],
+                                        'starters': [f"p{parts[1]}"]}]
+            elif endpoint.endswith('/users'):
+                responses[endpoint] = [{'user_id': 'u1', 'display_name': f"Owner {parts[1]}"}]
+            else:
+                responses[endpoint] = {'league_id': parts[1], 'name': f"League {parts[1]}"}
+        return responses
+    return fetch
+
+class TestBatchPipeline(unittest.TestCase):
+    """Test shared fetching and concurrent per-league runs"""
+
+    def setUp(self):
+        self.calls = []
+        self.loaded = []
+        for target, side_effect in (
+            ('scripts.pipeline.fetch_many', fake_fetch_many(self.calls)),
+            ('scripts.pipeline.load_players', lambda ids, max_age=None: self.loaded.append(set(ids)) or
+                {pid: {'full_name': pid, 'position': 'WR'} for pid in ids}),
+            ('scripts.pipeline.Database', lambda: None),
+        ):
+            patcher = patch(target, side_effect=side_effect)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = patch('scripts.pipeline.ensure_pool_size')
+        self.ensure_pool_size = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_global_data_fetched_once(self):
+        """Test stats and players are fetched once for every league and Player objects shared"""
+        batch = BatchCPRPipeline(LEAGUES, config=CONFIG)
+        raw_data = batch.fetch_data()
+
+        self.assertEqual(len(self.calls), 1)
+        for endpoint in STATS_ENDPOINTS.values():
+            self.assertEqual(self.calls[0].count(endpoint), 1)
+        self.assertEqual(self.loaded, [{"p101", "p202", "p303", "shared"}])
+        self.assertIs(raw_data["101"]['players'], raw_data["303"]['players'])
+        self.assertEqual(raw_data["202"]['league_info']['name'], "League 202")
+
+        processed = batch.pipelines["202"].process_data(raw_data["202"])
+        self.assertIs(processed['players'], raw_data["202"]['players'])
+        self.assertEqual(processed['teams'][0].owner_name, "Owner 202")
+
+    def test_run_reports_each_league_and_throughput(self):
+        """Test every league runs on its own data and throughput is reported"""
+        def run_pipeline(pipeline, raw_data=None):
+            return {'success': pipeline.league_id != "303", 'error': 'boom',
+                    'league': raw_data['league_info']['league_id']}
+
+        with patch.object(RealCPRPipeline, 'run_pipeline', autospec=True, side_effect=run_pipeline):
+            summary = BatchCPRPipeline(LEAGUES, config=CONFIG).run()
+
+        self.assertEqual({lid: r['league'] for lid, r in summary['results'].items()},
+                         {lid: lid for lid in LEAGUES})
+        self.assertEqual((summary['succeeded'], summary['failed']), (2, 1))
+        self.assertGreater(summary['leagues_per_minute'], 0)
+
+    def test_pool_sized_for_concurrent_leagues(self):
+        """Test the shared pool is sized once for every league's requests in flight"""
+        batch = BatchCPRPipeline(LEAGUES, config=CONFIG)
+
+        # Last, after each league's pipeline applied its session settings
+        self.ensure_pool_size.assert_called_with(batch.max_concurrent * 3)
+
+    def test_pool_size_flag_never_below_in_flight(self):
+        """Test --pool-size can grow the pool but not shrink it below the requests in flight"""
+        batch = BatchCPRPipeline(LEAGUES, config=CONFIG)
+        in_flight = batch.max_concurrent * batch.max_workers
+
+        with patch('scripts.pipeline.configure_session') as configure_session:
+            with self.assertLogs('scripts.pipeline', level='WARNING'):
+                apply_pool_size(2, in_flight)
+            configure_session.assert_called_with(pool_size=in_flight)
+            apply_pool_size(in_flight + 5, in_flight)
+            configure_session.assert_called_with(pool_size=in_flight + 5)
+
+    def test_local_results_per_league(self):
+        """Test leagues saved to one local data directory keep their own results"""
+        with tempfile.TemporaryDirectory() as data_dir:
+            db = LocalDatabase(data_dir)
+            for league_id in LEAGUES[:2]:
+                db.save_cpr_rankings(league_id, [CPRMetrics(f"team_{league_id}", "Team", 1.0,
+                                                            1.0, 1.0, 1.0, 1.0, 1.0, 1.0)])
+
+            for league_id in LEAGUES[:2]:
+                self.assertTrue(os.path.exists(os.path.join(data_dir, f"cpr_rankings_{league_id}_latest.json")))
+                saved = db.get_cpr_rankings(league_id)
+                self.assertEqual(saved['league_id'], league_id)
+                self.assertEqual(saved['rankings'][0]['team_id'], f"team_{league_id}")
+
+if __name__ == '__main__':
+    unittest.main()
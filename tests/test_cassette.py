@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Unit tests for Sleeper record/replay cassettes"""
+import unittest
+import os
+import sys
+import tempfile
+import shutil
+import argparse
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src import cassette, response_cache, immutable_store, utils
+from src.cassette import Cassette
+
+def _session(payloads: dict) -> Mock:
+    """Fake session answering each URL suffix with a payload"""
+    def get(url, **kwargs):
+        response = Mock()
+        response.status_code = 200
+        response.json.return_value = next(data for suffix, data in payloads.items() if url.endswith(suffix))
+        return response
+
+    session = Mock()
+    session.get.side_effect = get
+    return session
+
+class TestCassette(unittest.TestCase):
+    """Test recording, replaying and CLI/env selection"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir, True)
+        self.path = os.path.join(self.tmp_dir, 'run.json.gz')
+
+        for patcher in (patch.object(response_cache, '_cache_enabled', False),
+                        patch.object(immutable_store, '_store_enabled', False),
+                        patch.object(cassette, '_cassette', None),
+                        patch.object(cassette, '_cassette_loaded', True)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_record_then_replay_offline(self):
+        """Test recorded responses replay without any network I/O"""
+        session = _session({"/state/nfl": {"week": 8}, "/league/1/users": [{"user_id": "u1"}]})
+
+        cassette.configure_cassette('record', self.path)
+        with patch('src.sleeper_client.get_session', return_value=session):
+            utils.make_sleeper_request("state/nfl")
+            utils.make_sleeper_request("league/1/users")
+        cassette.configure_cassette('replay', self.path)
+
+        offline = Mock()
+        with patch('src.sleeper_client.get_session', return_value=offline):
+            self.assertEqual(utils.make_sleeper_request("state/nfl"), {"week": 8})
+            self.assertEqual(utils.make_sleeper_request("league/1/users"), [{"user_id": "u1"}])
+            self.assertIsNone(utils.make_sleeper_request("league/1/rosters"))
+
+        offline.get.assert_not_called()
+        stats = cassette.get_cassette().stats()
+        self.assertEqual((stats['plays'], stats['misses'], stats['entries']), (2, 1, 2))
+
+    def test_replay_latency_is_injected(self):
+        """Test replay sleeps the configured latency per hit"""
+        recorder = Cassette(self.path, 'record')
+        recorder.record("https://api.sleeper.app/v1/state/nfl", {"week": 8})
+        recorder.save()
+
+        player = Cassette(self.path, 'replay', latency_ms=25)
+        with patch('src.cassette.time.sleep') as mock_sleep:
+            player.play("https://api.sleeper.app/v1/state/nfl")
+            player.play("https://api.sleeper.app/v1/league/1")
+
+        mock_sleep.assert_called_once_with(0.025)
+
+    def test_cli_flags_and_env(self):
+        """Test --record/--replay flags and SLEEPER_CASSETTE_MODE select the mode"""
+        parser = argparse.ArgumentParser()
+        cassette.add_cassette_arguments(parser)
+
+        active = cassette.configure_cassette_from_args(parser.parse_args(['--record', self.path]))
+        self.assertTrue(active.recording)
+
+        with patch.dict(os.environ, {'SLEEPER_CASSETTE_MODE': 'off'}):
+            self.assertIsNone(cassette.configure_cassette_from_env())
+
+        with self.assertRaises(ValueError):
+            cassette.configure_cassette('rewind')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""Unit tests for the week-by-week CPR backfill"""
+import unittest
+import sys
+import copy
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.cpr import CPREngine, COMPONENTS
+from src.cpr_backfill import prefix_slopes, prefix_variances
+from scripts.synthetic import league, round_robin
+
+LEAGUE_ID = "test_league"
+
+class TestCPRBackfill(unittest.TestCase):
+    """Test every backfilled week against a run on the weeks up to it"""
+
+    def setUp(self):
+        self.teams, self.players = league(8)
+        self.matchups = round_robin(8, 12)
+        for target in ('src.alvarado_calculator.make_sleeper_request', 'src.team_extraction.make_sleeper_request'):
+            patcher = patch(target, return_value=None)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.engine = CPREngine({}, LEAGUE_ID)
+        self.result = self.engine.backfill_league_cpr(self.teams, self.players, self.matchups)
+
+    def _as_of(self, week):
+        """Engine bound to weeks 1..week with team records from those weeks"""
+        matchups = {w: self.matchups[w] for w in range(1, week + 1)}
+        teams = copy.deepcopy(self.teams)
+        by_id = {int(team.team_id): team for team in teams}
+        for team in teams:
+            team.wins = team.losses = team.ties = 0
+        for entries in matchups.values():
+            for a in entries:
+                b = next(e for e in entries if e['matchup_id'] == a['matchup_id'] and e is not a)
+                team = by_id[a['roster_id']]
+                if a['points'] > b['points']:
+                    team.wins += 1
+                elif a['points'] < b['points']:
+                    team.losses += 1
+                else:
+                    team.ties += 1
+        engine = CPREngine({}, LEAGUE_ID)
+        engine.matchup_store.prime(matchups)
+        engine.matchup_store.weeks = sorted(matchups)
+        engine.bind_context(engine.build_context(teams, self.players))
+        return engine, teams
+
+    def test_weeks_match_truncated_runs(self):
+        """Test SMI and Zion as of each week equal the engine on weeks up to it"""
+        self.assertEqual(self.result['weeks'], list(range(1, 13)))
+        smi, zion = COMPONENTS.index('smi'), COMPONENTS.index('zion')
+        for week in (1, 2, 5, 12):
+            engine, teams = self._as_of(week)
+            tensors = engine.zion_calc.calculate_league_zion_matrix(teams, self.players, self.engine._ingram_raw,
+                                                                    self.engine._alvarado_raw)
+            w = week - 1
+            for i, team in enumerate(teams):
+                self.assertAlmostEqual(self.result['components'][w, i, smi], engine.calculate_smi(team, teams),
+                                       places=9)
+                self.assertAlmostEqual(self.result['components'][w, i, zion],
+                                       max(2.0 - tensors[team.team_id]['tensor_magnitude'], 0.0), places=9)
+                self.assertAlmostEqual(self.result['win_pct'][w, i], team.win_percentage)
+
+    def test_lineup_strength_and_ranks(self):
+        """Test SLI uses points per week through W and ranks follow CPR"""
+        w = 4
+        team = self.teams[2]
+        points = [np.mean([self.matchups[week][i]['players_points'][player_id]
+                           for week in range(1, w + 2) for i in range(8)
+                           if player_id in self.matchups[week][i]['players_points']])
+                  for player_id in team.starters]
+        sli = self.result['components'][w, 2, COMPONENTS.index('sli')]
+        self.assertAlmostEqual(sli, min(np.mean(points) / 10.0, 2.0))
+
+        for week, rows in self.result['history'].items():
+            self.assertEqual([row['rank'] for row in rows], list(range(1, 9)))
+            self.assertEqual([row['cpr'] for row in rows], sorted((row['cpr'] for row in rows), reverse=True))
+
+    def test_fetches_whole_season(self):
+        """Test a run without matchups fetches every week the league settings cover"""
+        season = round_robin(8, 17)
+        requested = []
+        
+        def fake(endpoint):
+            requested.append(endpoint)
+            return season.get(int(endpoint.rsplit('/', 1)[1]))
+        
+        league_info = {'settings': {'playoff_week_start': 15, 'playoff_teams': 6}}
+        engine = CPREngine({}, LEAGUE_ID)
+        store_weeks = list(engine.matchup_store.weeks)
+        with patch('src.matchup_store.make_sleeper_request', side_effect=fake):
+            result = engine.backfill_league_cpr(self.teams, self.players, league=league_info)
+        
+        self.assertEqual(sorted(int(e.rsplit('/', 1)[1]) for e in requested), list(range(1, 18)))
+        self.assertEqual(result['weeks'], list(range(1, 18)))
+        
+        # Later runs on the engine keep the store's own weeks
+        self.assertEqual(engine.matchup_store.weeks, store_weeks)
+        with patch('src.matchup_store.make_sleeper_request', side_effect=fake):
+            engine.calculate_league_cpr(self.teams, self.players)
+        self.assertEqual(list(engine.context.weeks), store_weeks)
+    
+    def test_prefix_statistics(self):
+        """Test prefix slopes and variances against NumPy on each prefix"""
+        rng = np.random.default_rng(3)
+        scores = rng.uniform(60, 160, size=(10, 3))
+        played = rng.random((10, 3)) > 0.2
+        slopes, variances = prefix_slopes(scores, played), prefix_variances(scores, played)
+        for w in range(10):
+            for t in range(3):
+                y = scores[:w + 1, t][played[:w + 1, t]]
+                if len(y) < 2:
+                    self.assertTrue(np.isnan(slopes[w, t]))
+                    continue
+                self.assertAlmostEqual(slopes[w, t], np.polyfit(np.arange(len(y)), y, 1)[0], places=9)
+                self.assertAlmostEqual(variances[w, t], np.var(y, ddof=1), places=7)
+
+if __name__ == '__main__':
+    unittest.main()
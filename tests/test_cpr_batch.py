@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Unit tests for batched CPR components"""
+import unittest
+import sys
+import random
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.cpr import CPREngine, lineup_indices, lineup_slots, season_ppg
+from src.models import Team, Player, PlayerStats, Position
+
+LEAGUE_ID = "test_league"
+
+def random_league(num_teams: int, seed: int = 7):
+    """Teams with 7 starters and a 6-player bench; some players lack stats"""
+    rng = random.Random(seed)
+    players = {}
+    teams = []
+    for r in range(1, num_teams + 1):
+        roster = [f"p{r}_{slot}" for slot in range(13)]
+        for player_id in roster:
+            stats = {}
+            if rng.random() > 0.15:
+                games = rng.randint(0, 17)
+                stats[2025] = PlayerStats(season=2025, games_played=games,
+                                          fantasy_points=round(rng.uniform(0, 350), 2))
+            players[player_id] = Player(player_id=player_id, name=player_id, position=Position.WR,
+                                        team="FA", stats=stats)
+        starters = roster[:rng.randint(0, 9)]
+        teams.append(Team(team_id=str(r), team_name=f"Team {r}", owner_name="", roster=roster,
+                          starters=starters))
+    return teams, players
+
+class TestBatchedLineupIndices(unittest.TestCase):
+    """Test the matrix SLI/BSI path against the per-team methods"""
+
+    def test_matches_per_team(self):
+        """Test batched SLI/BSI equal calculate_sli/calculate_bsi for every team"""
+        teams, players = random_league(40)
+        engine = CPREngine({}, LEAGUE_ID)
+
+        batched = engine.calculate_league_sli_bsi(teams, players)
+
+        for team in teams:
+            sli, bsi = batched[int(team.team_id)]
+            self.assertAlmostEqual(sli, engine.calculate_sli(team, players), places=12)
+            self.assertAlmostEqual(bsi, engine.calculate_bsi(team, players), places=12)
+
+    def test_empty_lineups(self):
+        """Test teams without starters, bench or stats score zero"""
+        teams = [Team(team_id="1", team_name="Empty", owner_name=""),
+                 Team(team_id="2", team_name="No stats", owner_name="", roster=["x", "y"], starters=["x"])]
+
+        sli, bsi = lineup_indices(*lineup_slots(teams), {}, 0.3)
+
+        self.assertEqual(sli.tolist(), [0.0, 0.0])
+        self.assertEqual(bsi.tolist(), [0.0, 0.0])
+
+    def test_season_ppg_skips_missing_games(self):
+        """Test players with zero games are left out of the PPG lookup"""
+        players = {
+            "a": Player(player_id="a", name="a", position=Position.QB, team="FA",
+                        stats={2025: PlayerStats(season=2025, games_played=2, fantasy_points=30.0)}),
+            "b": Player(player_id="b", name="b", position=Position.QB, team="FA",
+                        stats={2025: PlayerStats(season=2025, games_played=0)}),
+        }
+        self.assertEqual(season_ppg(players, 2025), {"a": 15.0})
+
+if __name__ == '__main__':
+    unittest.main()
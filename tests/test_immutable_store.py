@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Unit tests for the permanent immutable-data store"""
+import unittest
+import os
+import sys
+import tempfile
+import shutil
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src import immutable_store, response_cache, utils
+from src.immutable_store import ImmutableStore, classify_endpoint
+
+NFL_STATE = {'season': '2025', 'week': 9, 'season_type': 'regular'}
+
+class TestClassifyEndpoint(unittest.TestCase):
+    """Test immutable vs mutable endpoint classification"""
+    
+    def test_past_season_stats_are_immutable(self):
+        """Test 2019-2024 season stats never change"""
+        for year in range(2019, 2025):
+            self.assertTrue(classify_endpoint(f"stats/nfl/regular/{year}", NFL_STATE))
+        self.assertFalse(classify_endpoint("stats/nfl/regular/2025", NFL_STATE))
+    
+    def test_completed_weeks_are_immutable(self):
+        """Test weeks are final once last week's stat-correction window is over"""
+        self.assertTrue(classify_endpoint("league/123/matchups/7", NFL_STATE))
+        self.assertFalse(classify_endpoint("league/123/matchups/8", NFL_STATE))
+        self.assertFalse(classify_endpoint("league/123/matchups/9", NFL_STATE))
+        self.assertTrue(classify_endpoint("stats/nfl/regular/2025/3", NFL_STATE))
+        self.assertFalse(classify_endpoint("stats/nfl/regular/2025/8", NFL_STATE))
+    
+    def test_live_endpoints_are_mutable(self):
+        """Test rosters, players and state are never immutable"""
+        for endpoint in ["league/123/rosters", "players/nfl", "state/nfl", "league/123"]:
+            self.assertFalse(classify_endpoint(endpoint, NFL_STATE))
+    
+    def test_offseason_and_missing_state(self):
+        """Test nothing is frozen without a usable NFL state"""
+        self.assertFalse(classify_endpoint("league/123/matchups/1", None))
+        self.assertFalse(classify_endpoint("league/123/matchups/1", {'season': '2025', 'week': 0,
+                                                                      'season_type': 'off'}))
+
+class TestImmutableStore(unittest.TestCase):
+    """Test permanent storage"""
+    
+    def setUp(self):
+        """Create a throwaway store"""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir, True)
+        self.store = ImmutableStore(os.path.join(self.tmp_dir, "immutable.sqlite3"), state_fn=lambda: NFL_STATE)
+        self.addCleanup(self.store.close)
+    
+    def test_round_trip_is_compressed(self):
+        """Test stored data round-trips and is compressed"""
+        payload = {str(pid): {'pts_ppr': 100.5, 'gp': 17} for pid in range(500)}
+        self.store.set("stats/nfl/regular/2023", payload)
+        
+        self.assertEqual(self.store.get("stats/nfl/regular/2023"), payload)
+        self.assertLess(self.store.stats()['bytes'], len(str(payload)) / 4)
+    
+    def test_empty_responses_not_stored(self):
+        """Test empty payloads are not frozen"""
+        self.store.set("league/123/matchups/1", [])
+        
+        self.assertIsNone(self.store.get("league/123/matchups/1"))
+    
+    def test_steady_state_fetches_only_live_data(self):
+        """Test a second run only hits the network for mutable endpoints"""
+        cache_dir = os.path.join(self.tmp_dir, "ttl")
+        response = Mock()
+        response.json.side_effect = lambda: [{'roster_id': 1, 'points': 100.0}]
+        session = Mock()
+        session.get.return_value = response
+        endpoints = [f"league/123/matchups/{week}" for week in range(1, 10)] + ["stats/nfl/regular/2024"]
+        
+        with patch.object(immutable_store, '_store_enabled', True), \
+             patch.object(immutable_store, '_store', self.store), \
+             patch.object(response_cache, '_cache_enabled', True), \
+             patch.object(response_cache, '_cache', response_cache.ResponseCache(cache_dir, default_ttl=0)), \
+             patch('src.sleeper_client.get_session', return_value=session):
+            for endpoint in endpoints:
+                utils.make_sleeper_request(endpoint)
+            first_run = session.get.call_count
+            for endpoint in endpoints:
+                utils.make_sleeper_request(endpoint)
+        
+        self.assertEqual(first_run, len(endpoints))
+        second_run_urls = [c[0][0] for c in session.get.call_args_list[first_run:]]
+        self.assertEqual([url.rsplit('/', 1)[1] for url in second_run_urls], ["8", "9"])
+        self.assertTrue(all("league/123/matchups/" in url for url in second_run_urls))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Unit tests for incremental CPR recompute"""
+import unittest
+import sys
+import copy
+from pathlib import Path
+from unittest.mock import patch
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.cpr import CPREngine
+from scripts.synthetic import league, round_robin
+
+LEAGUE_ID = "test_league"
+
+class TestIncrementalCPR(unittest.TestCase):
+    """Test dependency-tracked updates against full recomputes"""
+
+    def setUp(self):
+        self.teams, self.players = league(8)
+        self.matchups = round_robin(8, 10)
+        self.weeks = {week: self.matchups[week] for week in range(1, 9)}
+        for target in ('src.alvarado_calculator.make_sleeper_request', 'src.team_extraction.make_sleeper_request'):
+            patcher = patch(target, return_value=None)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _engine(self, weeks):
+        engine = CPREngine({}, LEAGUE_ID)
+        engine.matchup_store.weeks = sorted(weeks)
+        return engine
+
+    def _full(self, teams, weeks, players=None):
+        result = self._engine(weeks).calculate_league_cpr(teams, players or self.players, weeks)
+        return {m.team_id: m.cpr for m in result['rankings']}
+
+    def _assert_same(self, result, expected):
+        actual = {m.team_id: m.cpr for m in result['rankings']}
+        self.assertEqual(set(actual), set(expected))
+        for team_id, cpr in expected.items():
+            self.assertAlmostEqual(actual[team_id], cpr, places=12)
+
+    def test_roster_transaction(self):
+        """Test a waiver claim recomputes one lineup and only its opponents' Zion"""
+        engine = self._engine(self.weeks)
+        engine.calculate_league_cpr(self.teams, self.players, self.weeks)
+
+        teams = copy.deepcopy(self.teams)
+        teams[1].roster[0], teams[1].roster[9] = teams[1].roster[9], teams[1].roster[0]
+        teams[1].starters = teams[1].roster[:7]
+        result = engine.update_league_cpr(teams, self.players)
+
+        self.assertEqual(result['recomputed']['lineup'], [2])
+        self.assertEqual(result['recomputed']['smi'], [])
+        opponents = set(engine.context.team_opponents(2))
+        self.assertEqual(set(result['recomputed']['zion']), opponents)
+        self.assertNotIn(2, opponents)
+        self._assert_same(result, self._full(teams, self.weeks))
+
+    def test_new_week(self):
+        """Test a new week of matchups, records and player stats matches a full recompute"""
+        engine = self._engine(self.weeks)
+        engine.calculate_league_cpr(self.teams, self.players, self.weeks)
+
+        weeks = {week: self.matchups[week] for week in range(1, 10)}
+        teams = copy.deepcopy(self.teams)
+        teams[0].wins += 1
+        # The week's games update season stats for every player on rosters 1-7
+        players = copy.deepcopy(self.players)
+        for team in teams[:7]:
+            for player_id in team.roster:
+                stats = players[player_id].stats[2025]
+                stats.games_played += 1
+                stats.fantasy_points += 12.5
+        result = engine.update_league_cpr(teams, players, matchups=weeks)
+
+        self.assertEqual(result['recomputed']['lineup'], list(range(1, 8)))
+        self.assertEqual(len(result['recomputed']['smi']), 8)
+        self._assert_same(result, self._full(teams, weeks, players))
+
+    def test_without_previous_run_is_full(self):
+        """Test an update with no prior state falls back to a full run"""
+        result = self._engine(self.weeks).update_league_cpr(self.teams, self.players, matchups=self.weeks)
+
+        self.assertNotIn('recomputed', result)
+        self._assert_same(result, self._full(self.teams, self.weeks))
+
+if __name__ == '__main__':
+    unittest.main()
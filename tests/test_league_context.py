@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Unit tests for the shared league context"""
+import unittest
+import sys
+import dataclasses
+from pathlib import Path
+from unittest.mock import patch
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.cpr import CPREngine
+from src.league_context import LeagueContext
+from src.matchup_store import MatchupStore
+from src.zion_calculator import ZionTensorCalculator
+from src.models import Team, Player, Position
+from tests.helpers import FakeSleeper, build_week
+
+LEAGUE_ID = "test_league"
+
+def _teams():
+    return [
+        Team(team_id=str(r), team_name=f"Team {r}", owner_name=f"Owner {r}", wins=r, losses=4 - r,
+             roster=[f"p{r}_{slot}" for slot in range(5)], starters=[f"p{r}_{slot}" for slot in range(3)])
+        for r in range(1, 5)
+    ]
+
+def _players():
+    positions = [Position.QB, Position.RB, Position.WR, Position.TE, Position.WR]
+    return {
+        f"p{r}_{slot}": Player(player_id=f"p{r}_{slot}", name=f"Player {r}{slot}",
+                               position=positions[slot], team="FA")
+        for r in range(1, 5) for slot in range(5)
+    }
+
+class TestLeagueContext(unittest.TestCase):
+    """Test context indexing and its use by the calculators"""
+
+    def setUp(self):
+        self.store = MatchupStore(LEAGUE_ID, weeks=range(1, 4))
+        self.store.prime({week: build_week(week) for week in range(1, 4)})
+        self.draft_data = {'draft_id': 'd1', 'picks': [{'player_id': 'p1_0', 'pick_no': 1}],
+                           'adp_mapping': {'p1_0': {'pick_no': 1}}}
+        self.context = LeagueContext.build(LEAGUE_ID, _teams(), _players(), self.store,
+                                           draft_data=self.draft_data,
+                                           legion_teams=[{'roster_id': 2, 'team_name': 'Legion Two'}])
+
+    def test_indexes(self):
+        """Test roster_id-keyed indexes and the schedule graph"""
+        self.assertEqual(self.context.team(3).team_name, "Team 3")
+        self.assertEqual(self.context.team_scores(1), (106.0, 107.0, 108.0))
+        self.assertEqual(self.context.team_opponents(4), (3, 3, 3))
+        self.assertEqual(self.context.weekly[2][3]['points'], 117.0)
+        self.assertEqual(self.context.draft_id, 'd1')
+        self.assertEqual(self.context.display_name(self.context.team(2)), "Legion Two")
+        self.assertEqual(self.context.display_name(self.context.team(1)), "Team 1")
+
+    def test_immutable(self):
+        """Test the context and its indexes cannot be reassigned"""
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            self.context.teams = ()
+        with self.assertRaises(TypeError):
+            self.context.team_index[9] = None
+
+    def test_zion_matches_unbound(self):
+        """Test Zion gives the same tensor with and without a bound context"""
+        teams, players = _teams(), _players()
+        with patch('src.alvarado_calculator.make_sleeper_request', return_value=None):
+            unbound = ZionTensorCalculator(LEAGUE_ID, self.store)
+            expected = unbound.calculate_team_zion_tensor(teams[0], teams, players)
+
+            bound = ZionTensorCalculator(LEAGUE_ID, self.store)
+            bound.bind_context(LeagueContext.build(LEAGUE_ID, teams, players, self.store))
+            actual = bound.calculate_team_zion_tensor(teams[0], teams, players)
+
+        self.assertEqual(actual['tensor_vector'], expected['tensor_vector'])
+
+    def test_engine_fetches_league_data_once(self):
+        """Test a CPR run fetches drafts, picks, rosters and users once each"""
+        fake = FakeSleeper(num_teams=4)
+        with patch('src.matchup_store.make_sleeper_request', side_effect=fake), \
+             patch('src.alvarado_calculator.make_sleeper_request', side_effect=fake), \
+             patch('src.team_extraction.make_sleeper_request', side_effect=fake):
+            engine = CPREngine({}, LEAGUE_ID)
+            result = engine.calculate_league_cpr(_teams(), _players())
+
+        self.assertEqual(len(result['rankings']), 4)
+        self.assertIsNotNone(engine.context)
+        for endpoint in (f"league/{LEAGUE_ID}/drafts", "draft/d1/picks",
+                         f"league/{LEAGUE_ID}/rosters", f"league/{LEAGUE_ID}/users"):
+            self.assertEqual(fake.calls[endpoint], 1, endpoint)
+
+    def test_engine_uses_supplied_rosters_and_users(self):
+        """Test rosters and users passed to the engine are not refetched"""
+        fake = FakeSleeper(num_teams=4)
+        rosters, users = fake(f"league/{LEAGUE_ID}/rosters"), fake(f"league/{LEAGUE_ID}/users")
+        users[0]['metadata'] = {'team_name': 'Custom One'}
+        fake.calls.clear()
+        with patch('src.matchup_store.make_sleeper_request', side_effect=fake), \
+             patch('src.alvarado_calculator.make_sleeper_request', side_effect=fake), \
+             patch('src.team_extraction.make_sleeper_request', side_effect=fake):
+            result = CPREngine({}, LEAGUE_ID).calculate_league_cpr(_teams(), _players(),
+                                                                  rosters=rosters, users=users)
+
+        self.assertNotIn(f"league/{LEAGUE_ID}/rosters", fake.calls)
+        self.assertIn("Custom One", {metrics.team_name for metrics in result['rankings']})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Unit tests for incremental league sync"""
+import unittest
+import os
+import sys
+import tempfile
+import shutil
+from collections import Counter
+from pathlib import Path
+from unittest.mock import patch
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.league_sync import LeagueSync
+from src.matchup_store import MatchupStore
+
+LEAGUE_ID = "test_league"
+
+class FakeLeague:
+    """Mutable fake Sleeper league that counts calls per endpoint"""
+
+    def __init__(self):
+        self.week = 3
+        self.calls = Counter()
+        self.rosters = [{'roster_id': r, 'owner_id': f"u{r}", 'players': [f"p{r}"]} for r in range(1, 5)]
+        self.transactions = {1: [{'transaction_id': 't1', 'status': 'complete'}], 2: [], 3: []}
+
+    def __call__(self, endpoint: str):
+        self.calls[endpoint] += 1
+        if endpoint == "state/nfl":
+            return {'season': '2025', 'week': self.week, 'leg': self.week}
+        if endpoint.endswith("/rosters"):
+            return [dict(roster) for roster in self.rosters]
+        if endpoint.endswith("/users"):
+            return [{'user_id': f"u{r}", 'display_name': f"Owner {r}"} for r in range(1, 5)]
+        if "/matchups/" in endpoint:
+            week = int(endpoint.rsplit('/', 1)[1])
+            return [{'roster_id': r, 'matchup_id': (r + 1) // 2, 'points': 100.0 + week} for r in range(1, 5)]
+        if "/transactions/" in endpoint:
+            return list(self.transactions.get(int(endpoint.rsplit('/', 1)[1]), []))
+        if endpoint == f"league/{LEAGUE_ID}":
+            return {'league_id': LEAGUE_ID, 'name': 'Test'}
+        return None
+
+class TestLeagueSync(unittest.TestCase):
+    """Test the cursor, incremental fetch plan and merges"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir, True)
+        self.path = os.path.join(self.tmp_dir, 'state.json')
+        self.fake = FakeLeague()
+        patcher = patch('src.league_sync.make_sleeper_request', side_effect=self.fake)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _sync(self, **kwargs):
+        return LeagueSync(LEAGUE_ID, self.path, max_concurrent=1).sync(**kwargs)
+
+    def test_first_run_is_full(self):
+        """Test the first sync pulls every week and leg and persists a cursor"""
+        summary = self._sync()
+
+        self.assertEqual(summary['mode'], 'full')
+        self.assertEqual(summary['weeks'], [1, 2, 3])
+        sync = LeagueSync(LEAGUE_ID, self.path)
+        self.assertEqual(sync.cursor['week'], 3)
+        self.assertEqual(sync.cursor['transaction_leg'], 3)
+        self.assertEqual(set(sync.matchups()), {1, 2, 3})
+
+    def test_unchanged_rerun_only_touches_open_week(self):
+        """Test a mid-week rerun refetches only rosters, the current week and leg"""
+        self._sync()
+        self.fake.calls.clear()
+
+        summary = self._sync()
+
+        self.assertEqual(summary['mode'], 'incremental')
+        self.assertEqual(summary['weeks'], [3])
+        self.assertEqual(summary['changed_rosters'], [])
+        self.assertEqual(set(self.fake.calls), {
+            "state/nfl", f"league/{LEAGUE_ID}/rosters",
+            f"league/{LEAGUE_ID}/matchups/3", f"league/{LEAGUE_ID}/transactions/3"
+        })
+
+    def test_changes_are_merged(self):
+        """Test new transactions, roster changes and a new week are merged"""
+        self._sync()
+        self.fake.week = 4
+        self.fake.rosters[1]['players'] = ["p2", "p9"]
+        self.fake.transactions[4] = [{'transaction_id': 't2', 'status': 'complete'}]
+
+        summary = self._sync()
+
+        self.assertEqual(summary['weeks'], [3, 4])
+        self.assertEqual(summary['changed_rosters'], ["2"])
+        self.assertEqual(summary['new_transactions'], 1)
+        self.assertEqual(self.fake.calls[f"league/{LEAGUE_ID}/users"], 2)
+
+        sync = LeagueSync(LEAGUE_ID, self.path)
+        self.assertEqual([t['transaction_id'] for t in sync.transactions()], ["t1", "t2"])
+        self.assertEqual(sync.state['rosters'][1]['players'], ["p2", "p9"])
+
+    def test_synced_matchups_prime_store(self):
+        """Test synced weeks seed the matchup store without refetching"""
+        self._sync()
+        store = MatchupStore(LEAGUE_ID, weeks=[1, 2, 3])
+
+        with patch('src.matchup_store.make_sleeper_request') as mock_request:
+            store.prime(LeagueSync(LEAGUE_ID, self.path).matchups())
+            store.load()
+
+        mock_request.assert_not_called()
+        self.assertEqual(store.get_team_scores(1), [101.0, 102.0, 103.0])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Unit tests for the optimal-lineup solver"""
+import unittest
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.models import LeagueInfo, Position
+from src.lineup_optimizer import LineupSolver, SLOT_ELIGIBILITY, LEGION_SLOTS
+from src.cpr import CPREngine
+from scripts.synthetic import league, round_robin
+from tests.helpers import brute_force_lineup
+
+POSITIONS = [Position.QB, Position.RB, Position.WR, Position.TE, Position.IDP, Position.K]
+SLEEPER_SLOTS = ["QB", "RB", "WR", "TE", "WRRB_FLEX", "REC_FLEX", "SUPER_FLEX", "K", "BN", "BN", "IR"]
+
+def random_roster(rng, size):
+    positions = [POSITIONS[i] for i in rng.integers(0, len(POSITIONS), size=size)]
+    return [f"p{i}" for i in range(size)], rng.normal(10, 7, size=size), positions
+
+class TestLineupSolver(unittest.TestCase):
+    """Test lineups and points against brute force"""
+
+    def test_roster_positions(self):
+        """Test bench/IR slots are dropped and Sleeper flex names are understood"""
+        info = LeagueInfo("1", "Test", 2025, 5, 12, SLEEPER_SLOTS, {})
+        solver = LineupSolver.from_league_info(info)
+
+        self.assertEqual(len(solver.slots), 8)
+        self.assertFalse(solver.laminar)
+        self.assertTrue(LineupSolver().laminar)
+        self.assertEqual(LineupSolver.from_roster_positions([]).slots, LineupSolver(LEGION_SLOTS).slots)
+
+    def test_non_laminar_slots_match_brute_force(self):
+        """Test the flex dynamic program on overlapping W/R and W/T flex slots"""
+        solver = LineupSolver.from_roster_positions(["RB", "WR", "WRRB_FLEX", "REC_FLEX", "SUPER_FLEX"])
+        rng = np.random.default_rng(8)
+        for _ in range(25):
+            player_ids, points, positions = random_roster(rng, 6)
+            expected = brute_force_lineup(points, positions, solver.slots)
+
+            batch = solver.lineup_points(points[:, None], solver.eligibility(positions))[0]
+            result = solver.solve(player_ids, points, positions)
+
+            self.assertAlmostEqual(batch, expected)
+            self.assertAlmostEqual(result['points'], expected)
+            for slot, player_id in result['lineup']:
+                if player_id is not None:
+                    self.assertIn(positions[player_ids.index(player_id)], SLOT_ELIGIBILITY[slot])
+
+    def test_weeks_are_independent(self):
+        """Test a players x weeks matrix solves each week separately"""
+        solver = LineupSolver()
+        rng = np.random.default_rng(9)
+        player_ids, _, positions = random_roster(rng, 15)
+        points = rng.normal(10, 7, size=(15, 6))
+
+        batch = solver.lineup_points(points, solver.eligibility(positions))
+        for week in range(6):
+            self.assertAlmostEqual(batch[week], solver.solve(player_ids, points[:, week], positions)['points'])
+
+    def test_engine_optimal_lineups(self):
+        """Test the engine builds every roster's best lineup from season PPG"""
+        teams, players = league(4)
+        engine = CPREngine({}, "test_league")
+        engine.set_roster_positions(["QB", "RB", "WR", "FLEX", "FLEX", "REC_FLEX", "IDP_FLEX", "BN"])
+
+        lineups = engine.calculate_optimal_lineups(teams, players)
+        optimal_sli = engine.calculate_optimal_sli(teams, players)
+
+        self.assertEqual(engine.alvarado_calc.lineup_slots, engine.lineup_solver.slots)
+        self.assertEqual(engine.ingram_calc.lineup_slots, engine.lineup_solver.slots)
+        self.assertEqual((engine.ingram_calc.total_starters, engine.ingram_calc.bench_size), (7, 1))
+        for team in teams:
+            lineup = lineups[int(team.team_id)]
+            self.assertEqual(len(lineup['lineup']), 7)
+            self.assertEqual(len(lineup['bench']) + sum(1 for _, p in lineup['lineup'] if p), len(team.roster))
+            self.assertAlmostEqual(optimal_sli[int(team.team_id)], min(lineup['points'] / 70.0, 2.0))
+
+    def test_cpr_result_reports_optimal_sli(self):
+        """Test the CPR result carries every team's optimal-lineup SLI"""
+        teams, players = league(4)
+        for target in ('src.alvarado_calculator.make_sleeper_request', 'src.team_extraction.make_sleeper_request'):
+            patcher = patch(target, return_value=None)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        engine = CPREngine({}, "test_league")
+
+        result = engine.calculate_league_cpr(teams, players, round_robin(4, 8))
+
+        self.assertEqual(result['optimal_sli'], {str(roster_id): sli for roster_id, sli in
+                                                 engine.calculate_optimal_sli(teams, players).items()})
+        self.assertEqual(set(result['optimal_sli']), {team.team_id for team in teams})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Unit tests for the shared matchup store"""
+import unittest
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.matchup_store import MatchupStore, season_weeks
+from src.cpr import CPREngine
+from src.models import Team, Player, Position
+from tests.helpers import FakeSleeper
+
+LEAGUE_ID = "test_league"
+
+class TestMatchupStore(unittest.TestCase):
+    """Test matchup loading and indexing"""
+    
+    def setUp(self):
+        """Set up a store backed by the fake API"""
+        self.fake = FakeSleeper()
+        patcher = patch('src.matchup_store.make_sleeper_request', side_effect=self.fake)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.store = MatchupStore(LEAGUE_ID, weeks=range(1, 4))
+    
+    def test_each_week_fetched_once(self):
+        """Test repeated lookups do not refetch"""
+        for _ in range(5):
+            self.store.get_team_scores(1)
+            self.store.get_all_matchups()
+        
+        self.assertEqual(self.store.fetch_count, 3)
+        self.assertTrue(all(count == 1 for count in self.fake.calls.values()))
+    
+    def test_roster_and_matchup_index(self):
+        """Test lookup by roster_id (int or str) and matchup_id"""
+        self.assertEqual(self.store.get_team_matchup(2, "3")['roster_id'], 3)
+        self.assertEqual({m['roster_id'] for m in self.store.get_matchup_entries(2, 1)}, {1, 2})
+        self.assertEqual(self.store.get_opponent_matchup(1, 4)['roster_id'], 3)
+    
+    def test_team_scores_in_week_order(self):
+        """Test weekly scores come back in week order"""
+        self.assertEqual(self.store.get_team_scores(1), [106.0, 107.0, 108.0])
+    
+    def test_season_weeks_from_settings(self):
+        """Test season length follows the playoff start, field size and round type"""
+        self.assertEqual(season_weeks(None), list(range(1, 18)))
+        settings = {'playoff_week_start': 15, 'playoff_teams': 4}
+        self.assertEqual(season_weeks({'settings': settings})[-1], 16)
+        self.assertEqual(season_weeks({'settings': dict(settings, playoff_round_type=1)})[-1], 17)
+        self.assertEqual(season_weeks({'settings': dict(settings, playoff_round_type=2)})[-1], 18)
+
+    def test_refresh_refetches(self):
+        """Test refresh drops loaded weeks"""
+        self.store.load()
+        self.store.refresh()
+        self.store.load()
+        
+        self.assertEqual(self.store.fetch_count, 6)
+
+class TestSharedStoreInEngine(unittest.TestCase):
+    """Test a full CPR run fetches each week once"""
+    
+    def test_league_run_request_count(self):
+        """Test matchup requests are O(weeks), not O(teams^2 x weeks)"""
+        fake = FakeSleeper(num_teams=4)
+        teams = [
+            Team(team_id=str(r), team_name=f"Team {r}", owner_name=f"Owner {r}", wins=r, losses=4 - r,
+                 roster=[f"p{r}_{slot}" for slot in range(5)], starters=[f"p{r}_{slot}" for slot in range(3)])
+            for r in range(1, 5)
+        ]
+        players = {
+            f"p{r}_{slot}": Player(player_id=f"p{r}_{slot}", name=f"Player {r}{slot}",
+                                   position=[Position.QB, Position.RB, Position.WR, Position.TE, Position.WR][slot],
+                                   team="FA")
+            for r in range(1, 5) for slot in range(5)
+        }
+        
+        with patch('src.matchup_store.make_sleeper_request', side_effect=fake), \
+             patch('src.alvarado_calculator.make_sleeper_request', side_effect=fake), \
+             patch('src.team_extraction.make_sleeper_request', side_effect=fake):
+            engine = CPREngine({}, LEAGUE_ID)
+            result = engine.calculate_league_cpr(teams, players)
+        
+        self.assertEqual(len(result['rankings']), 4)
+        matchup_calls = sum(c for e, c in fake.calls.items() if "/matchups/" in e)
+        self.assertEqual(matchup_calls, 8)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Unit tests for grouped NIV ranking"""
+import unittest
+import sys
+import random
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.niv import NIVEngine
+from src.models import Team, Player, PlayerStats, Position
+
+POSITIONS = [Position.QB, Position.RB, Position.WR, Position.TE, Position.K, Position.DEF]
+
+def random_players(count: int, seed: int = 11):
+    rng = random.Random(seed)
+    players = {}
+    for i in range(count):
+        stats = {}
+        if rng.random() > 0.2:
+            stats[2025] = PlayerStats(season=2025, games_played=rng.randint(0, 17),
+                                      fantasy_points=round(rng.uniform(0, 300), 1))
+        players[f"p{i}"] = Player(player_id=f"p{i}", name=f"Player {i}", position=rng.choice(POSITIONS),
+                                  team="FA", stats=stats)
+    return players
+
+class TestNIVRanking(unittest.TestCase):
+    """Test ranks and percentiles from the grouped path"""
+
+    def setUp(self):
+        self.engine = NIVEngine({}, "test_league")
+
+    def test_positional_percentile_matches_scan(self):
+        """Test binary-search percentiles equal the per-player peer scan"""
+        players = random_players(300)
+        position_points = self.engine._position_points(players)
+
+        for player in players.values():
+            self.assertEqual(self.engine._calculate_positional_niv(player, players, position_points),
+                             self.engine._calculate_positional_niv(player, players))
+
+    def test_ranks(self):
+        """Test overall ranks and per-position ranks follow NIV order"""
+        players = random_players(200)
+        teams = [Team(team_id="1", team_name="All", owner_name="", roster=list(players))]
+
+        rankings = self.engine.calculate_league_niv(teams, players)['rankings']
+
+        self.assertEqual([m.rank for m in rankings], list(range(1, len(rankings) + 1)))
+        for position in POSITIONS:
+            group = [m for m in rankings if m.position == position]
+            self.assertEqual([m.positional_rank for m in group], list(range(1, len(group) + 1)))
+            self.assertEqual([m.niv for m in group], sorted((m.niv for m in group), reverse=True))
+
+    def test_team_ids_leave_players_untouched(self):
+        """Test each player's team comes from its own league's rosters, without changing shared players"""
+        players = random_players(20)
+        ids = list(players)
+        league_a = [Team(team_id="a1", team_name="A1", owner_name="", roster=ids[:10]),
+                    Team(team_id="a2", team_name="A2", owner_name="", roster=ids[10:])]
+        league_b = [Team(team_id="b1", team_name="B1", owner_name="", roster=ids)]
+
+        rankings_a = self.engine.calculate_league_niv(league_a, players)['rankings']
+        rankings_b = self.engine.calculate_league_niv(league_b, players)['rankings']
+
+        self.assertEqual({m.player_id: m.team_id for m in rankings_a},
+                         {player_id: "a1" if i < 10 else "a2" for i, player_id in enumerate(ids)})
+        self.assertEqual({m.team_id for m in rankings_b}, {"b1"})
+        self.assertFalse(any(hasattr(player, 'team_id') for player in players.values()))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Unit tests for full-universe NIV"""
+import unittest
+import os
+import sys
+import tempfile
+import shutil
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.niv import NIVEngine
+from src.models import Team, Player, PlayerStats, position_from_sleeper
+from src.player_snapshot import PlayerSnapshot, write_snapshot
+from scripts.synthetic import universe
+
+class TestUniverseNIV(unittest.TestCase):
+    """Test columnar NIV against the per-player engine"""
+
+    def setUp(self):
+        self.engine = NIVEngine({}, "test_league")
+
+    def test_matches_per_player_engine(self):
+        """Test every component equals the rostered-player path over the same players"""
+        players_db, season_stats = universe(600)
+        players = {}
+        for player_id, record in players_db.items():
+            stats = season_stats.get(player_id)
+            players[player_id] = Player(
+                player_id=player_id, name=record["full_name"], position=position_from_sleeper(record["position"]),
+                team="FA", stats={2025: PlayerStats(season=2025, games_played=stats["gp"],
+                                                    fantasy_points=stats["pts_ppr"])} if stats else {})
+        teams = [Team(team_id="1", team_name="All", owner_name="", roster=list(players))]
+        expected = {m.player_id: m for m in self.engine.calculate_league_niv(teams, players)['rankings']}
+
+        result = self.engine.calculate_universe_niv(season_stats, players_db=players_db)
+
+        for row, player_id in enumerate(result['player_ids']):
+            for field in ('niv', 'positional_niv', 'market_niv', 'explosive_niv', 'consistency_niv'):
+                self.assertAlmostEqual(result[field][row], getattr(expected[player_id], field), delta=0.011,
+                                       msg=f"{player_id} {field}")
+            self.assertEqual(result['position'][row], expected[player_id].position.value)
+
+    def test_snapshot_source_and_records(self):
+        """Test the snapshot path and filtered, ranked records"""
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir, True)
+        players_db, season_stats = universe(300)
+        path = os.path.join(tmp_dir, 'players.snapshot')
+        write_snapshot(players_db, path)
+
+        from_snapshot = self.engine.calculate_universe_niv(season_stats, snapshot=PlayerSnapshot(path))
+        from_dict = self.engine.calculate_universe_niv(season_stats, players_db=players_db)
+
+        by_id = dict(zip(from_dict['player_ids'], from_dict['niv']))
+        for player_id, niv in zip(from_snapshot['player_ids'], from_snapshot['niv']):
+            self.assertEqual(niv, by_id[player_id])
+
+        records = self.engine.universe_records(from_dict, position="IDP", limit=5)
+        self.assertLessEqual(len(records), 5)
+        self.assertEqual([r['positional_rank'] for r in records], list(range(1, len(records) + 1)))
+        self.assertTrue(all(r['position'] == "IDP" for r in records))
+
+    def test_full_universe(self):
+        """Test every one of ~11k players gets a distinct overall rank"""
+        players_db, season_stats = universe(11000)
+
+        result = self.engine.calculate_universe_niv(season_stats, players_db=players_db)
+
+        self.assertEqual(result['total_players'], 11000)
+        self.assertEqual(sorted(result['rank'].tolist()), list(range(1, 11001)))
+
+if __name__ == '__main__':
+    unittest.main()
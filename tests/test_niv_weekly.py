@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""Unit tests for NIV consistency and explosive components from weekly scores"""
+import unittest
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.niv import NIVEngine, weekly_niv_arrays, weekly_stats_matrix, EXPLOSIVE_MULTIPLE
+from src.points_matrix import PointsMatrix
+from src.models import Team, Player, PlayerStats, Position
+from scripts.synthetic import league, round_robin, universe, weekly_payloads
+
+def reference(scores):
+    """Consistency and explosive NIV for one player's played weeks"""
+    scores = np.asarray(scores, dtype=float)
+    if len(scores) == 0 or scores.mean() <= 0:
+        return 0.0, 0.0
+    mean = scores.mean()
+    explosive = (scores > EXPLOSIVE_MULTIPLE * mean).mean() * 100
+    if len(scores) < 2:
+        return 0.0, explosive
+    return mean / (mean + scores.std(ddof=1)) * 100, explosive
+
+class TestWeeklyNIV(unittest.TestCase):
+    """Test weekly-score components against a per-player computation"""
+
+    def setUp(self):
+        self.engine = NIVEngine({}, "test_league")
+
+    def test_matches_per_player_reference(self):
+        """Test vectorized consistency and explosive rate player by player"""
+        rng = np.random.default_rng(3)
+        points = rng.gamma(2.0, 6.0, size=(200, 12))
+        played = rng.random((200, 12)) > 0.3
+        played[0] = False
+        played[1] = [True] + [False] * 11
+
+        consistency, explosive = weekly_niv_arrays(points, played)
+
+        for row in range(200):
+            expected = reference(points[row, played[row]])
+            self.assertAlmostEqual(consistency[row], expected[0], places=9)
+            self.assertAlmostEqual(explosive[row], expected[1], places=9)
+        self.assertEqual((consistency[0], explosive[0]), (0.0, 0.0))
+        self.assertEqual(consistency[1], 0.0)
+
+    def test_steady_player_beats_boom_bust(self):
+        """Test an even scorer is more consistent and less explosive than a boom/bust one"""
+        points = np.array([[15.0, 14.0, 16.0, 15.0], [2.0, 40.0, 1.0, 17.0]])
+        consistency, explosive = weekly_niv_arrays(points, np.ones_like(points, dtype=bool))
+
+        self.assertGreater(consistency[0], consistency[1])
+        self.assertEqual(explosive[0], 0.0)
+        self.assertEqual(explosive[1], 25.0)
+
+    def test_universe_uses_weekly_stats(self):
+        """Test the universe path reads weekly payloads for every player"""
+        players_db, season_stats = universe(500)
+        weekly = weekly_payloads(season_stats, 10)
+
+        result = self.engine.calculate_universe_niv(season_stats, players_db=players_db, weekly_stats=weekly)
+
+        for row, player_id in enumerate(result['player_ids'][:100]):
+            scores = [weekly[week][player_id]['pts_ppr'] for week in sorted(weekly) if player_id in weekly[week]]
+            if len(scores) < 2 or sum(scores) <= 0:
+                continue  # season-total estimate (see test_single_game_same_in_both_paths)
+            consistency, explosive = reference(scores)
+            self.assertAlmostEqual(result['consistency_niv'][row], round(consistency, 2), places=9)
+            self.assertAlmostEqual(result['explosive_niv'][row], round(explosive, 2), places=9)
+
+    def test_weekly_stats_matrix_played(self):
+        """Test gp marks played weeks, falling back to scoring without it"""
+        points, played = weekly_stats_matrix(['a', 'b', 'c'], {
+            2: {'a': {'gp': 0, 'pts_ppr': 0.0}, 'b': {'pts_ppr': 3.5}},
+            1: {'a': {'gp': 1, 'pts_ppr': 0.0}, 'c': {}},
+        })
+
+        self.assertEqual(points.tolist(), [[0.0, 0.0], [0.0, 3.5], [0.0, 0.0]])
+        self.assertEqual(played.tolist(), [[True, False], [False, True], [False, False]])
+
+    def test_league_uses_points_matrix(self):
+        """Test league NIV takes weekly components from the played weeks of the points matrix"""
+        teams, players = league(6)
+        matrix = PointsMatrix.from_matchups(round_robin(6, 8))
+        estimated = {m.player_id: m for m in self.engine.calculate_league_niv(teams, players)['rankings']}
+
+        rankings = self.engine.calculate_league_niv(teams, players, matrix)['rankings']
+
+        for metrics in rankings:
+            row = matrix.index.get(metrics.player_id)
+            if row is None:
+                # Never in a matchup: season-total estimate
+                consistency = estimated[metrics.player_id].consistency_niv
+                explosive = estimated[metrics.player_id].explosive_niv
+            else:
+                consistency, explosive = (round(value, 2) for value in
+                                          reference(matrix.points[row, matrix.played()[row]]))
+            self.assertAlmostEqual(metrics.consistency_niv, consistency, places=9)
+            self.assertAlmostEqual(metrics.explosive_niv, explosive, places=9)
+
+    def test_league_counts_played_weeks(self):
+        """Test bye weeks, unplayed weeks and the open week don't count, and one played week
+        falls back to the estimate"""
+        entry = lambda scores: {'roster_id': 1, 'matchup_id': 1, 'points': 50.0, 'players_points': scores}
+        matrix = PointsMatrix.from_matchups({
+            1: [entry({'p1_0': 20.0, 'p1_1': 10.0, 'p1_2': 9.0})],
+            2: [entry({'p1_0': 0.0, 'p1_1': 14.0, 'p1_2': 0.0})],   # p1_0 on bye
+            3: [entry({'p1_0': 10.0, 'p1_1': 10.0, 'p1_2': 0.0})],
+            4: [entry({'p1_0': 30.0, 'p1_1': 2.0})],                 # current week, in progress
+            5: [entry({'p1_0': 0.0, 'p1_1': 0.0})],                  # not played yet
+        })
+
+        weekly = self.engine._weekly_components(['p1_0', 'p1_1', 'p1_2'], matrix, current_week=5)
+
+        self.assertEqual(matrix.played(5)[:, 3:].sum(), 0)
+        self.assertAlmostEqual(weekly['p1_0'][0], reference([20.0, 10.0])[0])
+        self.assertEqual(weekly['p1_0'][1], 0.0)
+        self.assertAlmostEqual(weekly['p1_1'][0], reference([10.0, 14.0, 10.0])[0])
+        self.assertNotIn('p1_2', weekly)
+
+    def test_league_all_scored_weeks_without_current_week(self):
+        """Test every scored week counts when there's no NFL week (season over)"""
+        entry = lambda scores: {'roster_id': 1, 'matchup_id': 1, 'points': 50.0, 'players_points': scores}
+        matrix = PointsMatrix.from_matchups({week: [entry({'p1_0': points})]
+                                             for week, points in {1: 20.0, 2: 0.0, 3: 10.0, 4: 30.0}.items()})
+
+        weekly = self.engine._weekly_components(['p1_0'], matrix)
+
+        self.assertEqual(weekly['p1_0'], reference([20.0, 10.0, 30.0]))
+
+    def test_single_game_same_in_both_paths(self):
+        """Test a one-game player gets the season estimate on both the rostered and universe paths"""
+        players = {'100': Player(player_id='100', name='One Game', position=Position.WR, team="FA",
+                                 stats={2025: PlayerStats(season=2025, games_played=1, fantasy_points=24.0)})}
+        teams = [Team(team_id="1", team_name="T", owner_name="", roster=['100'])]
+        matrix = PointsMatrix.from_matchups({1: [{'roster_id': 1, 'matchup_id': 1, 'points': 24.0,
+                                                  'players_points': {'100': 24.0}}]})
+
+        rostered = self.engine.calculate_league_niv(teams, players, matrix)['rankings'][0]
+        free_agent = self.engine.calculate_universe_niv({'100': {'gp': 1, 'pts_ppr': 24.0}},
+                                                        players_db={'100': {'position': 'WR'}},
+                                                        weekly_stats={1: {'100': {'gp': 1, 'pts_ppr': 24.0}}})
+
+        self.assertEqual((rostered.consistency_niv, rostered.explosive_niv), (100.0, 0.0))
+        self.assertEqual(free_agent['consistency_niv'][0], rostered.consistency_niv)
+        self.assertEqual(free_agent['explosive_niv'][0], rostered.explosive_niv)
+        self.assertEqual(free_agent['niv'][0], rostered.niv)
+
+if __name__ == '__main__':
+    unittest.main()
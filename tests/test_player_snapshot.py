@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Unit tests for the columnar player snapshot"""
+import unittest
+import os
+import sys
+import json
+import tempfile
+import shutil
+from pathlib import Path
+from unittest.mock import patch
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src import cassette
+from src.models import Position, InjuryStatus
+from src.player_snapshot import (
+    PlayerSnapshot, write_snapshot, diff_snapshots, refresh_snapshot, snapshot_player
+)
+
+def _players():
+    return {
+        "4046": {"full_name": "Patrick Mahomes", "position": "QB", "team": "KC", "status": "Active",
+                 "fantasy_positions": ["QB"], "age": 30, "years_exp": 8, "search_rank": 12},
+        "6794": {"full_name": "Justin Jefferson", "position": "WR", "team": "MIN", "status": "Active",
+                 "injury_status": "Questionable", "fantasy_positions": ["WR"], "age": 26},
+        "KC": {"first_name": "Kansas City", "last_name": "Chiefs", "position": "DEF", "team": "KC",
+               "fantasy_positions": ["DEF"]},
+    }
+
+class TestPlayerSnapshot(unittest.TestCase):
+    """Test the snapshot format, lookups and deltas"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir, True)
+        self.path = os.path.join(self.tmp_dir, 'players.snapshot')
+
+    def test_round_trip(self):
+        """Test records survive the columnar encoding"""
+        write_snapshot(_players(), self.path)
+        snapshot = PlayerSnapshot(self.path)
+
+        self.assertEqual(len(snapshot), 3)
+        mahomes = snapshot.get("4046")
+        self.assertEqual((mahomes['full_name'], mahomes['position'], mahomes['team']), ("Patrick Mahomes", "QB", "KC"))
+        self.assertEqual((mahomes['age'], mahomes['years_exp'], mahomes['search_rank']), (30.0, 8, 12))
+        self.assertIsNone(mahomes['injury_status'])
+
+        defense = snapshot.get("KC")
+        self.assertEqual(defense['full_name'], "Kansas City Chiefs")
+        self.assertIsNone(defense['age'])
+        self.assertEqual(defense['fantasy_positions'], ["DEF"])
+        self.assertIsNone(snapshot.get("missing"))
+
+    def test_get_many_and_columns(self):
+        """Test batch lookups and zero-copy category columns"""
+        write_snapshot(_players(), self.path)
+        snapshot = PlayerSnapshot(self.path)
+
+        self.assertEqual(set(snapshot.get_many(["6794", 4046, "missing"])), {"4046", "6794"})
+        self.assertEqual(set(snapshot.get_many()), {"4046", "6794", "KC"})
+
+        vocab = snapshot.vocabulary('position')
+        self.assertEqual([vocab[code] for code in snapshot.column('position')], ["QB", "WR", "DEF"])
+        self.assertEqual(snapshot.player_ids(), ["4046", "6794", "KC"])
+
+    def test_delta(self):
+        """Test added/removed players and status/team/injury changes are reported"""
+        write_snapshot(_players(), self.path)
+        old = PlayerSnapshot(self.path)
+
+        players = _players()
+        players["6794"]["injury_status"] = "Out"
+        players["4046"]["team"] = "BUF"
+        del players["KC"]
+        players["11111"] = {"full_name": "Rookie", "position": "RB", "team": "NYJ"}
+        new_path = os.path.join(self.tmp_dir, 'new.snapshot')
+        write_snapshot(players, new_path)
+
+        delta = diff_snapshots(old, PlayerSnapshot(new_path))
+
+        self.assertEqual(delta['added'], ["11111"])
+        self.assertEqual(delta['removed'], ["KC"])
+        self.assertEqual(delta['changed'], {"4046": {"team": ["KC", "BUF"]},
+                                            "6794": {"injury_status": ["Questionable", "Out"]}})
+        self.assertEqual(delta['summary']['injury_status_changes'], 1)
+
+    def test_refresh_only_when_stale(self):
+        """Test refresh reuses a fresh snapshot and writes a delta when rebuilding"""
+        players = _players()
+        with patch.object(cassette, '_cassette', None), patch.object(cassette, '_cassette_loaded', True), \
+             patch('src.player_snapshot.stream_players', return_value=players) as mock_stream:
+            first, delta = refresh_snapshot(self.path)
+            self.assertIsNone(delta)
+            second, delta = refresh_snapshot(self.path)
+            self.assertIsNone(delta)
+            self.assertEqual(mock_stream.call_count, 1)
+
+            players["4046"]["status"] = "Inactive"
+            _, delta = refresh_snapshot(self.path, force=True)
+
+        self.assertEqual(delta['changed'], {"4046": {"status": ["Active", "Inactive"]}})
+        with open(f"{self.path}.delta.json") as f:
+            self.assertEqual(json.load(f)['summary']['status_changes'], 1)
+
+    def test_snapshot_player(self):
+        """Test snapshot records map onto Player models"""
+        write_snapshot(_players(), self.path)
+        player = snapshot_player(PlayerSnapshot(self.path).get("6794"))
+
+        self.assertEqual(player.position, Position.WR)
+        self.assertEqual(player.injury_status, InjuryStatus.QUESTIONABLE)
+        self.assertEqual(player.fantasy_positions, [Position.WR])
+
+    def test_snapshot_player_positions(self):
+        """Test IDP roles and DST map like the pipeline's position_from_sleeper"""
+        write_snapshot({"1": {"full_name": "Linebacker", "position": "LB", "fantasy_positions": ["LB", "DL"]},
+                        "2": {"full_name": "Defense", "position": "DST"}}, self.path)
+        snapshot = PlayerSnapshot(self.path)
+
+        linebacker = snapshot_player(snapshot.get("1"))
+        self.assertEqual(linebacker.position, Position.IDP)
+        self.assertEqual(linebacker.fantasy_positions, [Position.IDP, Position.IDP])
+        self.assertEqual(snapshot_player(snapshot.get("2")).position, Position.DEF)
+
+if __name__ == '__main__':
+    unittest.main()
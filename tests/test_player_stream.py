@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Unit tests for the streaming players/nfl parser"""
+import unittest
+import sys
+import json
+import tempfile
+import shutil
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src import response_cache, cassette
+from src.player_stream import iter_object_items, stream_players
+from src.response_cache import ResponseCache
+
+PLAYERS = {
+    "4046": {"full_name": "Patrick Mahomes", "position": "QB", "team": "KC", "fantasy_positions": ["QB"]},
+    "6794": {"full_name": "Justin Jefferson", "position": "WR", "team": "MIN", "age": 26},
+    "KC": {"first_name": "Kansas City", "last_name": "Chiefs", "position": "DEF", "team": "KC"},
+    "9999": {"full_name": "Zoë \"Quotes\" {Braces}", "position": "TE", "team": None, "height": 76.5},
+}
+
+def _chunks(payload: bytes, size: int):
+    """Split a payload into fixed-size byte chunks"""
+    return [payload[i:i + size] for i in range(0, len(payload), size)]
+
+class TestIterObjectItems(unittest.TestCase):
+    """Test incremental decoding across chunk boundaries"""
+
+    def test_matches_full_decode_at_any_chunk_size(self):
+        """Test every chunking yields the same players as json.loads"""
+        payload = json.dumps(PLAYERS, indent=1, ensure_ascii=False).encode('utf-8')
+
+        for size in (1, 2, 3, 7, 64, len(payload)):
+            self.assertEqual(dict(iter_object_items(_chunks(payload, size))), PLAYERS, size)
+
+    def test_filters_and_projects(self):
+        """Test only wanted players and requested fields are kept"""
+        payload = json.dumps(PLAYERS).encode('utf-8')
+
+        players = dict(iter_object_items(_chunks(payload, 5), {"6794", "KC", "missing"}, ["position", "team"]))
+
+        self.assertEqual(players, {"6794": {"position": "WR", "team": "MIN"},
+                                   "KC": {"position": "DEF", "team": "KC"}})
+
+    def test_numbers_split_across_chunks(self):
+        """Test a top-level number is not cut short at a chunk boundary"""
+        self.assertEqual(dict(iter_object_items([b'{"a": 12', b'34, "b": [1', b', 2]}'])), {"a": 1234, "b": [1, 2]})
+
+    def test_empty_and_truncated_payloads(self):
+        """Test empty objects decode and truncated payloads raise"""
+        self.assertEqual(dict(iter_object_items([b' { } '])), {})
+        with self.assertRaises(ValueError):
+            dict(iter_object_items([b'{"4046": {"position": "QB"']))
+
+class TestStreamPlayers(unittest.TestCase):
+    """Test network streaming and the raw on-disk cache"""
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir, True)
+        self.cache = ResponseCache(cache_dir=self.cache_dir)
+
+        for patcher in (patch.object(response_cache, '_cache_enabled', True),
+                        patch.object(response_cache, '_cache', self.cache),
+                        patch.object(cassette, '_cassette', None),
+                        patch.object(cassette, '_cassette_loaded', True)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _response(self):
+        response = Mock()
+        response.iter_content.return_value = iter(_chunks(json.dumps(PLAYERS).encode('utf-8'), 16))
+        return response
+
+    def test_streams_once_then_serves_raw_cache(self):
+        """Test the payload is streamed from the network once and reparsed from disk after"""
+        with patch('src.player_stream.sleeper_get', return_value=self._response()) as mock_get:
+            first = stream_players(["4046"])
+            second = stream_players(["6794", 4046])
+
+        mock_get.assert_called_once()
+        self.assertTrue(mock_get.call_args[1]['stream'])
+        self.assertEqual(first, {"4046": PLAYERS["4046"]})
+        self.assertEqual(set(second), {"4046", "6794"})
+
+    def test_all_players_when_unfiltered(self):
+        """Test no filter keeps every player"""
+        with patch('src.player_stream.sleeper_get', return_value=self._response()):
+            self.assertEqual(stream_players(), PLAYERS)
+
+if __name__ == '__main__':
+    unittest.main()
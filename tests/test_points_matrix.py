@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""Unit tests for the weekly players x weeks points matrix"""
+import unittest
+import sys
+import os
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.cpr import CPREngine
+from src.points_matrix import PointsMatrix, PointsMatrixStore, completed_weeks, NOT_ROSTERED
+from scripts.synthetic import league, round_robin
+
+LEAGUE_ID = "test_league"
+
+def with_lineups(matchups):
+    """Matchups whose entries also list players (12 per roster) and starters (first 7)"""
+    for entries in matchups.values():
+        for entry in entries:
+            roster = [f"p{entry['roster_id']}_{slot}" for slot in range(12)]
+            entry['players'] = roster
+            entry['starters'] = roster[:7]
+    return matchups
+
+class TestPointsMatrix(unittest.TestCase):
+    """Test the matrix against the matchup entries it is built from"""
+
+    def setUp(self):
+        self.matchups = with_lineups(round_robin(6, 5))
+        self.matrix = PointsMatrix.from_matchups(self.matchups)
+
+    def test_matches_players_points(self):
+        """Test every cell against the entries' players_points, rosters and starters"""
+        self.assertEqual(self.matrix.weeks, (1, 2, 3, 4, 5))
+        self.assertEqual(self.matrix.points.shape, (72, 5))
+        for week, entries in self.matchups.items():
+            w = self.matrix.week_index[week]
+            for entry in entries:
+                for player_id in entry['players']:
+                    row = self.matrix.index[player_id]
+                    self.assertEqual(self.matrix.points[row, w], entry['players_points'].get(player_id, 0.0))
+                    self.assertEqual(self.matrix.roster_ids[row, w], entry['roster_id'])
+                    self.assertEqual(self.matrix.starter[row, w], player_id in entry['starters'])
+
+        np.testing.assert_array_equal(self.matrix.bench, self.matrix.rostered & ~self.matrix.starter)
+        self.assertEqual(int(self.matrix.starter.sum()), 6 * 7 * 5)
+
+    def test_take_and_roster_filter(self):
+        """Test taking rows for unknown players and weeks, and for one roster only"""
+        taken = self.matrix.take(['p1_0', 'missing'], [2, 9])
+        self.assertEqual(taken.shape, (2, 2))
+        self.assertEqual(taken[0, 0], self.matchups[2][[e['roster_id'] for e in self.matchups[2]].index(1)]
+                         ['players_points']['p1_0'])
+        self.assertEqual(taken[1].tolist(), [0.0, 0.0])
+        self.assertEqual(taken[0, 1], 0.0)
+        self.assertFalse(self.matrix.take(['p1_0'], roster_id=2).any())
+
+    def test_weekly_stats(self):
+        """Test vectorized per-player statistics against NumPy per player"""
+        stats = self.matrix.weekly_stats(self.matrix.starter)
+        row = self.matrix.index['p3_2']
+        weekly = self.matrix.points[row]
+        self.assertEqual(stats['games'][row], 5)
+        self.assertAlmostEqual(stats['mean'][row], weekly.mean())
+        self.assertAlmostEqual(stats['std'][row], weekly.std(ddof=1))
+        bench_row = self.matrix.index['p3_9']
+        self.assertTrue(np.isnan(stats['mean'][bench_row]))
+
+    def test_merge_and_select_weeks(self):
+        """Test splitting by weeks and merging back gives the same matrix"""
+        early = self.matrix.select_weeks([1, 2])
+        late = PointsMatrix.from_matchups(self.matchups, [3, 4, 5])
+        merged = early.merge(late).select_weeks(self.matrix.weeks)
+        rows = merged.rows(self.matrix.player_ids)
+        np.testing.assert_array_equal(merged.points[rows], self.matrix.points)
+        np.testing.assert_array_equal(merged.roster_ids[rows], self.matrix.roster_ids)
+        self.assertTrue((self.matrix.select_weeks([7]).roster_ids == NOT_ROSTERED).all())
+
+class TestPointsMatrixStore(unittest.TestCase):
+    """Test persistence of completed weeks"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.path = os.path.join(self.directory.name, 'points.npz')
+        self.matchups = with_lineups(round_robin(6, 4))
+
+    def test_completed_weeks(self):
+        """Test last week stays open for stat corrections, and nothing is final without the NFL week"""
+        self.matchups[5] = [dict(entry, points=0.0) for entry in self.matchups[4]]
+        self.assertEqual(completed_weeks(self.matchups, None), [])
+        self.assertEqual(completed_weeks(self.matchups, current_week=5), [1, 2, 3])
+        self.assertEqual(completed_weeks(self.matchups, current_week=6), [1, 2, 3, 4])
+
+    def test_round_trip(self):
+        """Test save/load and reuse of stored weeks"""
+        store = PointsMatrixStore(LEAGUE_ID, self.path)
+        built = store.update(self.matchups, current_week=5)
+        stored = store.load()
+        self.assertEqual(stored.weeks, (1, 2, 3))
+        np.testing.assert_array_equal(stored.points, built.select_weeks([1, 2, 3]).points)
+
+        # Stored weeks are read back, not rebuilt: a changed entry for week 1 is not seen
+        changed = {week: [dict(entry) for entry in entries] for week, entries in self.matchups.items()}
+        changed[1][0]['players_points'] = {player_id: 99.0 for player_id in changed[1][0]['players_points']}
+        again = store.update(changed, current_week=5)
+        self.assertFalse((again.points == 99.0).any())
+        np.testing.assert_array_equal(again.select_weeks(built.weeks).points[again.rows(built.player_ids)],
+                                      built.points)
+
+    def test_last_week_stays_mutable(self):
+        """Test week N-1 is rebuilt from matchups (stat corrections) and nothing is stored without the NFL week"""
+        store = PointsMatrixStore(LEAGUE_ID, self.path)
+        store.update(self.matchups)
+        self.assertIsNone(store.load())
+
+        store.update(self.matchups, current_week=5)
+        corrected = {week: [dict(entry) for entry in entries] for week, entries in self.matchups.items()}
+        corrected[4][0]['players_points'] = {player_id: 99.0 for player_id in corrected[4][0]['players_points']}
+        matrix = store.update(corrected, current_week=5)
+
+        self.assertEqual(store.load().weeks, (1, 2, 3))
+        self.assertTrue((matrix.select_weeks([4]).points == 99.0).any())
+
+    def test_engine_context_uses_store(self):
+        """Test CPR runs with and without the store give the same rankings"""
+        teams, players = league(6)
+        matchups = with_lineups(round_robin(6, 8))
+        for target in ('src.alvarado_calculator.make_sleeper_request', 'src.team_extraction.make_sleeper_request'):
+            patcher = patch(target, return_value=None)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = patch('src.league_context.make_sleeper_request', return_value={'season_type': 'regular', 'week': 9})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        plain = CPREngine({}, LEAGUE_ID).calculate_league_cpr(teams, players, matchups)
+        cached_engine = CPREngine({}, LEAGUE_ID)
+        cached_engine.points_store = PointsMatrixStore(LEAGUE_ID, self.path)
+        cached_engine.calculate_league_cpr(teams, players, matchups)
+        cached = cached_engine.calculate_league_cpr(teams, players, matchups)
+
+        self.assertTrue(os.path.exists(self.path))
+        self.assertEqual([(m.team_id, round(m.cpr, 10)) for m in plain['rankings']],
+                         [(m.team_id, round(m.cpr, 10)) for m in cached['rankings']])
+
+if __name__ == '__main__':
+    unittest.main()
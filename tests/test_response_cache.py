@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Unit tests for the on-disk Sleeper response cache"""
+import unittest
+import os
+import sys
+import tempfile
+import shutil
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src import response_cache, immutable_store, utils
+from src.response_cache import ResponseCache
+
+class TestResponseCache(unittest.TestCase):
+    """Test TTL policies, eviction and counters"""
+    
+    def setUp(self):
+        """Create a throwaway cache directory"""
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir, True)
+        self.cache = ResponseCache(cache_dir=self.cache_dir, default_ttl=300)
+    
+    def test_round_trip(self):
+        """Test stored responses are served back"""
+        self.cache.set("league/1/rosters", [{"roster_id": 1}])
+        
+        self.assertEqual(self.cache.get("league/1/rosters"), (True, [{"roster_id": 1}]))
+        self.assertEqual(self.cache.get("league/1/users"), (False, None))
+    
+    def test_ttl_policies(self):
+        """Test per-endpoint TTLs"""
+        self.assertEqual(self.cache.ttl_for("players/nfl"), 86400)
+        self.assertEqual(self.cache.ttl_for("players/nfl/trending/add"), 900)
+        self.assertEqual(self.cache.ttl_for("stats/nfl/regular/2024"), 3600)
+        self.assertEqual(self.cache.ttl_for("league/1/matchups/3"), 300)
+    
+    def test_expired_entry_is_a_miss(self):
+        """Test entries older than their TTL are not served"""
+        self.cache.set("state/nfl", {"week": 8})
+        
+        with patch('src.response_cache.time.time', return_value=10 ** 12):
+            hit, _ = self.cache.get("state/nfl")
+        
+        self.assertFalse(hit)
+        self.assertEqual(self.cache.stats()['expired'], 1)
+    
+    def test_zero_ttl_is_never_cached(self):
+        """Test a zero TTL policy disables caching for that endpoint"""
+        cache = ResponseCache(cache_dir=self.cache_dir, ttl_policies=[("state/nfl", 0)])
+        cache.set("state/nfl", {"week": 8})
+        
+        self.assertEqual(cache.stats()['entries'], 0)
+    
+    def test_entry_count_eviction(self):
+        """Test least recently used entries are evicted past max_entries"""
+        cache = ResponseCache(cache_dir=self.cache_dir, max_entries=2)
+        for week in range(1, 4):
+            cache.set(f"league/1/matchups/{week}", [{"week": week}])
+            os.utime(cache._path(f"league/1/matchups/{week}"), (week, week))
+        cache.set("league/1/matchups/4", [{"week": 4}])
+        
+        self.assertEqual(cache.stats()['entries'], 2)
+        self.assertFalse(cache.get("league/1/matchups/1")[0])
+        self.assertTrue(cache.get("league/1/matchups/4")[0])
+    
+    def test_byte_bound_eviction(self):
+        """Test the cache stays under max_bytes"""
+        cache = ResponseCache(cache_dir=self.cache_dir, max_bytes=2000)
+        for week in range(1, 10):
+            cache.set(f"league/1/matchups/{week}", ["x" * 400])
+        
+        self.assertLessEqual(cache.stats()['bytes'], 2000)
+        self.assertGreater(cache.stats()['evictions'], 0)
+    
+    def test_no_temp_files_left_behind(self):
+        """Test atomic writes leave only finished entries"""
+        self.cache.set("players/nfl", {"4046": {"full_name": "Patrick Mahomes"}})
+        
+        self.assertEqual([name for name in os.listdir(self.cache_dir) if name.endswith('.tmp')], [])
+    
+    def test_hit_miss_counters(self):
+        """Test hit and miss counters"""
+        self.cache.get("state/nfl")
+        self.cache.set("state/nfl", {"week": 8})
+        self.cache.get("state/nfl")
+        
+        stats = self.cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['writes']), (1, 1, 1))
+        self.assertAlmostEqual(stats['hit_rate'], 0.5)
+
+class TestCachedSleeperRequest(unittest.TestCase):
+    """Test the cache sits underneath make_sleeper_request"""
+    
+    def test_repeat_request_skips_network(self):
+        """Test a second request within the TTL does no network I/O"""
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir, True)
+        cache = ResponseCache(cache_dir=cache_dir)
+        response = Mock()
+        response.json.return_value = {"week": 8}
+        session = Mock()
+        session.get.return_value = response
+        
+        with patch.object(response_cache, '_cache_enabled', True), \
+             patch.object(immutable_store, '_store_enabled', False), \
+             patch.object(response_cache, '_cache', cache), \
+             patch('src.sleeper_client.get_session', return_value=session):
+            first = utils.make_sleeper_request("state/nfl")
+            second = utils.make_sleeper_request("state/nfl")
+        
+        self.assertEqual(first, second)
+        session.get.assert_called_once()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""Unit tests for the schedule graph index"""
+import unittest
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.schedule_graph import ScheduleGraph
+
+def _week(pairs, bye=None):
+    entries = []
+    for matchup_id, (a, b) in enumerate(pairs, 1):
+        entries += [{'roster_id': a, 'matchup_id': matchup_id, 'points': 0.0},
+                    {'roster_id': str(b), 'matchup_id': str(matchup_id), 'points': 0.0}]
+    if bye is not None:
+        entries.append({'roster_id': bye, 'matchup_id': None, 'points': 0.0})
+    return entries
+
+class TestScheduleGraph(unittest.TestCase):
+    """Test pair, opponent and remaining-schedule lookups"""
+
+    def setUp(self):
+        self.graph = ScheduleGraph({
+            3: _week([(1, 4), (2, 3)]),
+            1: _week([(1, 2)], bye=3),
+            2: _week([(1, 3), (2, 4)]),
+        })
+
+    def test_pairs_and_opponents(self):
+        """Test week -> matchup_id -> pairs and week-ordered opponents with int IDs"""
+        self.assertEqual(self.graph.weeks, (1, 2, 3))
+        self.assertEqual(dict(self.graph.pairs(3)), {1: (1, 4), 2: (2, 3)})
+        self.assertEqual(self.graph.opponents(1), (2, 3, 4))
+        self.assertEqual(self.graph.opponents(3), (1, 2))
+        self.assertEqual(self.graph.opponents(1, weeks=[2, 3]), (3, 4))
+        self.assertEqual(self.graph.opponent(2, 4), 2)
+        self.assertIsNone(self.graph.opponent(1, 3))
+
+    def test_remaining_schedule(self):
+        """Test games after a given week"""
+        self.assertEqual(self.graph.remaining_schedule(2, after_week=1), ((2, 4), (3, 3)))
+        self.assertEqual(self.graph.remaining_schedule(2, after_week=3), ())
+
+    def test_count_matrix(self):
+        """Test the teams x teams game-count matrix"""
+        index = {1: 0, 2: 1, 3: 2, 4: 3}
+        counts = self.graph.count_matrix(index)
+
+        self.assertEqual(counts[0].tolist(), [0, 1, 1, 1])
+        self.assertEqual(counts.sum(), 10)
+        self.assertEqual(self.graph.count_matrix(index, weeks=[1])[1].tolist(), [1, 0, 0, 0])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Unit tests for the Monte Carlo season simulator"""
+import unittest
+import sys
+from pathlib import Path
+from unittest.mock import patch, mock_open
+
+import numpy as np
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src import response_cache, immutable_store
+from src.season_simulator import SeasonSimulator, bracket_order
+from scripts.synthetic import league, round_robin
+from scripts.pipeline import RealCPRPipeline
+
+def season(num_teams: int = 12, weeks: int = 14, played: int = 8):
+    """Round-robin regular season with only the first `played` weeks scored"""
+    matchups = round_robin(num_teams, weeks)
+    for week in range(played + 1, weeks + 1):
+        for entry in matchups[week]:
+            entry['points'] = 0.0
+    return matchups
+
+class TestSeasonSimulator(unittest.TestCase):
+    """Test playoff odds from simulated seasons"""
+
+    def test_bracket_order(self):
+        """Test top seeds are kept apart until the final"""
+        self.assertEqual(bracket_order(8), [0, 7, 3, 4, 1, 6, 2, 5])
+        simulator = SeasonSimulator(season(), playoff_teams=6)
+        self.assertEqual(simulator.byes, 2)
+
+    def test_probabilities_are_consistent(self):
+        """Test odds sum to the number of playoff spots, byes, finalists and champions"""
+        simulator = SeasonSimulator(season(), playoff_week_start=15, playoff_teams=6)
+        result = simulator.simulate(4000, seed=7, batch_size=1500)
+
+        self.assertEqual(simulator.current_week, 9)
+        self.assertEqual(result['remaining_weeks'], 6)
+        self.assertAlmostEqual(result['playoff_probability'].sum(), 6.0)
+        self.assertAlmostEqual(result['bye_probability'].sum(), 2.0)
+        self.assertAlmostEqual(result['finals_probability'].sum(), 2.0)
+        self.assertAlmostEqual(result['championship_probability'].sum(), 1.0)
+        self.assertAlmostEqual(result['expected_wins'].sum(), 12 * 14 / 2)
+        self.assertTrue(np.all(result['bye_probability'] <= result['playoff_probability']))
+        self.assertTrue(np.all(result['championship_probability'] <= result['finals_probability']))
+
+    def test_finished_regular_season_is_deterministic(self):
+        """Test seeding matches the final standings once every week is played"""
+        matchups = season(played=14)
+        simulator = SeasonSimulator(matchups, playoff_week_start=15, playoff_teams=4)
+        result = simulator.simulate(500, seed=1)
+
+        order = np.lexsort((-simulator.points_for, -simulator.wins))
+        expected = np.zeros(12)
+        expected[order[:4]] = 1.0
+        np.testing.assert_array_equal(result['playoff_probability'], expected)
+        self.assertEqual(simulator.byes, 0)
+
+    def test_bootstrap_and_league_settings(self):
+        """Test the bootstrap score model and Sleeper playoff settings"""
+        league = {'settings': {'playoff_week_start': 13, 'playoff_teams': 8}}
+        simulator = SeasonSimulator.from_league(league, season(), method='bootstrap')
+        result = simulator.simulate(1000, seed=2)
+
+        self.assertEqual(result['remaining_weeks'], 4)
+        self.assertAlmostEqual(result['playoff_probability'].sum(), 8.0)
+        self.assertEqual(result['bye_probability'].sum(), 0.0)
+        odds = SeasonSimulator.team_odds(result)
+        self.assertEqual(sorted(odds), list(range(1, 13)))
+
+    def test_process_pool_matches_serial(self):
+        """Test results depend on the seed, not the worker count"""
+        simulator = SeasonSimulator(season())
+        serial = simulator.simulate(3000, seed=11, batch_size=1000)
+        pooled = simulator.simulate(3000, seed=11, batch_size=1000, workers=2)
+
+        np.testing.assert_array_equal(serial['championship_probability'], pooled['championship_probability'])
+
+class TestPipelineOdds(unittest.TestCase):
+    """Test the CPR pipeline reports playoff odds from the whole season schedule"""
+
+    def setUp(self):
+        matchups = season(weeks=17)
+        for target, kwargs in (
+            ('src.matchup_store.make_sleeper_request', {'side_effect': lambda e: matchups.get(int(e.rsplit('/', 1)[1]))}),
+            ('src.alvarado_calculator.make_sleeper_request', {'return_value': None}),
+            ('src.team_extraction.make_sleeper_request', {'return_value': None}),
+            ('scripts.pipeline.current_nfl_week', {'return_value': 9}),
+            ('scripts.pipeline.Database', {'return_value': None}),
+            ('scripts.pipeline.open', {'new': mock_open(), 'create': True}),
+        ):
+            patcher = patch(target, **kwargs)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        for module, flag in ((response_cache, '_cache_enabled'), (immutable_store, '_store_enabled')):
+            patcher = patch.object(module, flag, False)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_run_pipeline_reports_odds_for_every_roster(self):
+        """Test every roster gets odds simulated over the remaining regular season"""
+        teams, players = league(12)
+        pipeline = RealCPRPipeline("test_league", config={'performance': {'season_simulations': 2000}})
+        pipeline.cpr_engine.points_store = None
+        raw_data = {
+            'players': players,
+            'league_info': {'name': 'Test League', 'season': '2025',
+                            'settings': {'playoff_week_start': 15, 'playoff_teams': 6}},
+            'rosters': [{'roster_id': int(team.team_id), 'owner_id': f"u{team.team_id}", 'players': team.roster,
+                         'starters': team.starters, 'settings': {}} for team in teams],
+            'users': [{'user_id': f"u{team.team_id}", 'display_name': team.team_name} for team in teams],
+        }
+
+        result = pipeline.run_pipeline(raw_data)
+
+        self.assertTrue(result['success'])
+        odds = result['season_odds']
+        self.assertEqual(sorted(odds['team_odds']), list(range(1, 13)))
+        self.assertEqual((odds['current_week'], odds['remaining_weeks']), (9, 6))
+        self.assertAlmostEqual(sum(o['playoff_probability'] for o in odds['team_odds'].values()), 6.0)
+        self.assertIn("## Playoff Odds", result['report'])
+        for team in teams:
+            self.assertIn(f"| {team.team_name} |", result['report'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Unit tests for lineup Shapley values"""
+import unittest
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.models import Team, Position
+from src.lineup_optimizer import LEGION_SLOTS, eligibility_matrix, optimal_lineup_points
+from src.shapley import team_shapley, league_shapley, hoeffding_permutations
+from src.alvarado_calculator import AlvaradoCalculator
+from scripts.synthetic import random_team
+from tests.helpers import brute_force_lineup
+
+POSITIONS = [Position.QB, Position.RB, Position.WR, Position.TE, Position.IDP]
+
+class TestShapley(unittest.TestCase):
+    """Test the coalition game, exact and sampled Shapley values"""
+
+    def test_lineup_value_is_optimal(self):
+        """Test the narrowest-slot-first fill against brute force"""
+        slots = ('RB', 'WR', 'FLEX_WRT', 'FLEX_WT')
+        rng = np.random.default_rng(4)
+        for _ in range(30):
+            positions = [POSITIONS[1 + i] for i in rng.integers(0, 3, size=6)]
+            points = rng.normal(8, 6, size=6)
+            value = optimal_lineup_points(points[:, None], eligibility_matrix(positions, slots))[0]
+            self.assertAlmostEqual(value, brute_force_lineup(points, positions, slots))
+
+    def test_two_quarterbacks_split_the_slot(self):
+        """Test the textbook case: one slot, two eligible players"""
+        result = team_shapley(["a", "b"], np.array([[10.0], [6.0]]), [Position.QB, Position.QB], slots=('QB',))
+
+        self.assertEqual(result['method'], 'exact')
+        self.assertAlmostEqual(result['values']['a'], 7.0)
+        self.assertAlmostEqual(result['values']['b'], 3.0)
+
+    def test_efficiency_and_null_players(self):
+        """Test values add up to the optimal lineup and non-scorers get zero"""
+        player_ids, points, positions = random_team(10, 8, seed=1)
+        points[3] = 0.0
+        result = team_shapley(player_ids, points, positions)
+
+        self.assertAlmostEqual(sum(result['values'].values()), result['total'])
+        self.assertEqual(result['values']['p3'], 0.0)
+        self.assertEqual(result['coalitions'], 2 ** 9)
+
+    def test_sampling_converges_to_exact(self):
+        """Test permutation sampling lands within its reported half-widths of the exact values"""
+        player_ids, points, positions = random_team(9, 6, seed=2)
+        exact = team_shapley(player_ids, points, positions)
+        sampled = team_shapley(player_ids, points, positions, exact_max_players=0, tolerance=0.5, seed=3)
+
+        self.assertEqual(sampled['method'], 'sampled')
+        self.assertLessEqual(max(sampled['half_width'].values()), 0.5)
+        for player_id in player_ids:
+            self.assertAlmostEqual(sampled['values'][player_id], exact['values'][player_id], delta=0.75)
+        self.assertGreater(hoeffding_permutations(100.0, 1.0, 20), sampled['permutations'])
+
+    def test_league_parallel_matches_serial(self):
+        """Test the process pool gives the same values as a serial run"""
+        teams = {r: random_team(14, 6, seed=r) for r in range(1, 4)}
+        seeds = {r: r for r in teams}
+        serial = league_shapley(teams, seeds=seeds)
+        pooled = league_shapley(teams, workers=2, seeds=seeds)
+
+        for r in teams:
+            self.assertEqual(serial[r]['method'], 'sampled')
+            self.assertEqual(serial[r]['values'], pooled[r]['values'])
+
+    def test_alvarado_shares(self):
+        """Test Alvarado's Shapley values are shares of the optimal lineup"""
+        calc = AlvaradoCalculator("test_league")
+        player_ids, points, _ = random_team(8, 4, seed=5)
+        team = Team(team_id="1", team_name="T", owner_name="", roster=player_ids, starters=player_ids[:7])
+        weekly = {week + 1: {1: {'points': 100.0, 'players_points': dict(zip(player_ids, points[:, week]))}}
+                  for week in range(4)}
+
+        shares = [calc._calculate_shapley_value(p, team, weekly) for p in player_ids]
+        self.assertAlmostEqual(sum(shares), 100.0)
+        self.assertEqual(len(LEGION_SLOTS), 7)
+
+if __name__ == '__main__':
+    unittest.main()
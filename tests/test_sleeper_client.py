@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""Unit tests for the pooled Sleeper request layer"""
+import unittest
+import sys
+import time
+import asyncio
+import threading
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src import sleeper_client
+from src import response_cache, immutable_store
+from src.utils import make_sleeper_request, load_settings
+
+class TestSleeperSession(unittest.TestCase):
+    """Test shared session pooling"""
+    
+    def setUp(self):
+        """Start each test with a fresh session and no response cache"""
+        self.original_config = sleeper_client.get_session_config()
+        sleeper_client.close_session()
+        for module, flag in ((response_cache, '_cache_enabled'), (immutable_store, '_store_enabled')):
+            patcher = patch.object(module, flag, False)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+    
+    def tearDown(self):
+        """Restore the original session configuration"""
+        sleeper_client.configure_session(**self.original_config)
+    
+    def test_session_is_shared(self):
+        """Test repeated calls reuse one session"""
+        self.assertIs(sleeper_client.get_session(), sleeper_client.get_session())
+    
+    def test_configure_pool_size(self):
+        """Test pool size is applied to the mounted adapter"""
+        sleeper_client.configure_session(pool_size=3)
+        adapter = sleeper_client.get_session().get_adapter("https://api.sleeper.app/v1")
+        
+        self.assertEqual(adapter._pool_maxsize, 3)
+        self.assertEqual(sleeper_client.get_session_config()['pool_size'], 3)
+    
+    def test_configure_resets_session(self):
+        """Test reconfiguring opens a fresh session"""
+        first = sleeper_client.get_session()
+        sleeper_client.configure_session(pool_size=4)
+        
+        self.assertIsNot(first, sleeper_client.get_session())
+    
+    def test_keep_alive_disabled(self):
+        """Test disabling keep-alive closes connections after each request"""
+        sleeper_client.configure_session(keep_alive=False)
+        
+        self.assertEqual(sleeper_client.get_session().headers['Connection'], 'close')
+    
+    def test_ensure_pool_size_only_grows(self):
+        """Test the pool is resized only when it is too small"""
+        sleeper_client.configure_session(pool_size=4)
+        session = sleeper_client.get_session()
+        
+        sleeper_client.ensure_pool_size(2)
+        self.assertIs(sleeper_client.get_session(), session)
+        sleeper_client.ensure_pool_size(8)
+        self.assertEqual(sleeper_client.get_session_config()['pool_size'], 8)
+    
+    def test_client_keeps_shared_session(self):
+        """Test creating a client never replaces a session other requests may be using"""
+        sleeper_client.configure_session(pool_size=2)
+        session = sleeper_client.get_session()
+        
+        sleeper_client.AsyncSleeperClient(max_concurrent=10, request_fn=Mock())
+        
+        self.assertIs(sleeper_client.get_session(), session)
+        self.assertEqual(sleeper_client.get_session_config()['pool_size'], 2)
+    
+    def test_session_from_settings(self):
+        """Test settings.yaml pool_size/keep_alive/timeout apply unless the environment sets them"""
+        settings = {'data_sources': {'sleeper': {'pool_size': 6, 'keep_alive': False, 'timeout': 30}}}
+        with patch.dict('os.environ', {}, clear=True):
+            sleeper_client.configure_session_from_settings(settings)
+        self.assertEqual(sleeper_client.get_session_config(), {'pool_size': 6, 'keep_alive': False, 'timeout': 30.0})
+        
+        session = sleeper_client.get_session()
+        with patch.dict('os.environ', {}, clear=True):
+            sleeper_client.configure_session_from_settings(settings)
+        self.assertIs(sleeper_client.get_session(), session)
+        
+        with patch.dict('os.environ', {'SLEEPER_POOL_SIZE': '12'}):
+            sleeper_client.configure_session_from_settings({'data_sources': {'sleeper': {'pool_size': 3}}})
+        self.assertEqual(sleeper_client.get_session_config()['pool_size'], 6)
+    
+    def test_invalid_pool_size(self):
+        """Test pool size must be positive"""
+        with self.assertRaises(ValueError):
+            sleeper_client.configure_session(pool_size=0)
+    
+    def test_make_sleeper_request_uses_session(self):
+        """Test make_sleeper_request goes through the shared session"""
+        response = Mock()
+        response.json.return_value = {"season": "2025"}
+        
+        with patch.object(sleeper_client.get_session(), 'get', return_value=response) as mock_get:
+            result = make_sleeper_request("state/nfl")
+        
+        self.assertEqual(result, {"season": "2025"})
+        mock_get.assert_called_once()
+        self.assertTrue(mock_get.call_args[0][0].endswith("/state/nfl"))
+    
+    def test_configured_timeout(self):
+        """Test requests use the configured timeout without replacing the session"""
+        session = sleeper_client.get_session()
+        sleeper_client.configure_session(timeout=30)
+        
+        with patch.object(session, 'get', return_value=Mock(status_code=200)) as mock_get:
+            make_sleeper_request("state/nfl")
+        
+        self.assertIs(sleeper_client.get_session(), session)
+        self.assertEqual(mock_get.call_args[1]['timeout'], 30)
+    
+    def test_timeout_precedence(self):
+        """Test a per-call timeout beats settings.yaml, which keeps the 10s default"""
+        sleeper_client.configure_session_from_settings(load_settings())
+        self.assertEqual(sleeper_client.get_session_config()['timeout'], sleeper_client.DEFAULT_TIMEOUT)
+        
+        with patch.object(sleeper_client.get_session(), 'get', return_value=Mock(status_code=200)) as mock_get:
+            sleeper_client.sleeper_get("https://api.sleeper.app/v1/state/nfl")
+            sleeper_client.sleeper_get("https://api.sleeper.app/v1/state/nfl", timeout=3)
+        
+        self.assertEqual([call[1]['timeout'] for call in mock_get.call_args_list], [10, 3])
+
+class SlowRequest:
+    """Request stand-in that sleeps and tracks peak concurrency"""
+    
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.in_flight = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+    
+    def __call__(self, endpoint: str):
+        with self.lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        time.sleep(self.delay)
+        with self.lock:
+            self.in_flight -= 1
+        return {"endpoint": endpoint}
+
+class TestAsyncSleeperClient(unittest.TestCase):
+    """Test bounded-concurrency fetching"""
+    
+    def test_concurrency_is_bounded(self):
+        """Test no more than max_concurrent requests are in flight"""
+        request = SlowRequest()
+        endpoints = [f"stats/nfl/regular/{year}" for year in range(2015, 2027)]
+        
+        results = sleeper_client.fetch_many(endpoints, max_concurrent=3, request_fn=request)
+        
+        self.assertEqual(len(results), len(endpoints))
+        self.assertLessEqual(request.peak, 3)
+        self.assertGreater(request.peak, 1)
+    
+    def test_wall_time_drops_to_batches(self):
+        """Test wall time tracks batches rather than the sum of requests"""
+        request = SlowRequest(delay=0.05)
+        endpoints = [f"league/x/matchups/{week}" for week in range(1, 11)]
+        
+        start = time.perf_counter()
+        sleeper_client.fetch_many(endpoints, max_concurrent=5, request_fn=request)
+        elapsed = time.perf_counter() - start
+        
+        self.assertLess(elapsed, 0.05 * len(endpoints) * 0.6)
+    
+    def test_duplicate_endpoints_fetched_once(self):
+        """Test duplicate endpoints are requested once"""
+        request = Mock(side_effect=lambda endpoint: endpoint)
+        
+        results = sleeper_client.fetch_many(["state/nfl", "state/nfl"], request_fn=request)
+        
+        self.assertEqual(results, {"state/nfl": "state/nfl"})
+        request.assert_called_once_with("state/nfl")
+    
+    def test_facade_inside_running_loop(self):
+        """Test the sync facade works when called from async code"""
+        async def caller():
+            return sleeper_client.fetch_many(["state/nfl"], request_fn=lambda e: {"ok": e})
+        
+        self.assertEqual(asyncio.run(caller()), {"state/nfl": {"ok": "state/nfl"}})
+    
+    def test_async_fetch(self):
+        """Test the async single-endpoint API"""
+        client = sleeper_client.AsyncSleeperClient(2, request_fn=lambda e: e.upper())
+        
+        self.assertEqual(asyncio.run(client.fetch("state/nfl")), "STATE/NFL")
+    
+    def test_max_concurrent_from_settings(self):
+        """Test performance settings are honored"""
+        self.assertEqual(sleeper_client.get_max_concurrent(
+            {'performance': {'parallel_requests': True, 'max_concurrent_api_calls': 7}}), 7)
+        self.assertEqual(sleeper_client.get_max_concurrent(
+            {'performance': {'parallel_requests': False, 'max_concurrent_api_calls': 7}}), 1)
+        self.assertEqual(sleeper_client.get_max_concurrent({}), sleeper_client.DEFAULT_MAX_CONCURRENT)
+
+def _response(status_code: int, headers: dict = None) -> Mock:
+    """Fake requests.Response with a status code"""
+    response = Mock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    return response
+
+class TestRateLimiting(unittest.TestCase):
+    """Test the token bucket and retry/backoff layer"""
+    
+    def setUp(self):
+        self._limiter = sleeper_client._limiter
+        self._max_retries = sleeper_client._max_retries
+        sleeper_client.configure_rate_limit(rate=1000.0, burst=100, max_retries=3)
+        sleeper_client.reset_request_metrics()
+    
+    def tearDown(self):
+        sleeper_client._limiter = self._limiter
+        sleeper_client._max_retries = self._max_retries
+    
+    def test_bucket_allows_burst_then_throttles(self):
+        """Test requests beyond the burst wait for refill"""
+        bucket = sleeper_client.TokenBucket(rate=10.0, capacity=3)
+        
+        waits = [bucket.reserve() for _ in range(5)]
+        
+        self.assertEqual(waits[:3], [0.0, 0.0, 0.0])
+        self.assertAlmostEqual(waits[3], 0.1, places=2)
+        self.assertAlmostEqual(waits[4], 0.2, places=2)
+    
+    def test_backoff_is_bounded(self):
+        """Test jittered backoff never exceeds the exponential ceiling or cap"""
+        for attempt in range(10):
+            delay = sleeper_client.backoff_delay(attempt, base=0.5, cap=4.0)
+            self.assertGreaterEqual(delay, 0.0)
+            self.assertLessEqual(delay, min(4.0, 0.5 * 2 ** attempt))
+    
+    @patch('src.sleeper_client.time.sleep')
+    def test_retries_rate_limited_response(self, mock_sleep):
+        """Test 429 is retried after Retry-After and counted"""
+        session = Mock()
+        session.get.side_effect = [_response(429, {'Retry-After': '2'}), _response(200)]
+        
+        with patch('src.sleeper_client.get_session', return_value=session):
+            response = sleeper_client.sleeper_get("https://api.sleeper.app/v1/state/nfl")
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(session.get.call_count, 2)
+        mock_sleep.assert_called_with(2.0)
+        
+        metrics = sleeper_client.get_request_metrics()
+        self.assertEqual(metrics['requests'], 2)
+        self.assertEqual(metrics['retries'], 1)
+        self.assertEqual(metrics['rate_limited_responses'], 1)
+    
+    @patch('src.sleeper_client.time.sleep')
+    def test_gives_up_after_max_retries(self, mock_sleep):
+        """Test persistent 5xx returns the last response once retries run out"""
+        session = Mock()
+        session.get.return_value = _response(503)
+        
+        with patch('src.sleeper_client.get_session', return_value=session):
+            response = sleeper_client.sleeper_get("https://api.sleeper.app/v1/state/nfl")
+        
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(session.get.call_count, 4)
+        self.assertEqual(sleeper_client.get_request_metrics()['server_errors'], 4)
+    
+    @patch('src.sleeper_client.time.sleep')
+    def test_retries_connection_errors(self, mock_sleep):
+        """Test connection errors are retried and re-raised when exhausted"""
+        import requests
+        session = Mock()
+        session.get.side_effect = requests.exceptions.ConnectionError("reset")
+        
+        with patch('src.sleeper_client.get_session', return_value=session):
+            with self.assertRaises(requests.exceptions.ConnectionError):
+                sleeper_client.sleeper_get("https://api.sleeper.app/v1/state/nfl")
+        
+        self.assertEqual(session.get.call_count, 4)
+        self.assertEqual(sleeper_client.get_request_metrics()['retries'], 3)
+    
+    def test_rate_limit_from_settings(self):
+        """Test data_sources.sleeper settings configure the limiter"""
+        sleeper_client.configure_rate_limit_from_settings(
+            {'data_sources': {'sleeper': {'rate_limit': 5.0, 'rate_limit_burst': 7, 'max_retries': 1}}})
+        
+        self.assertEqual(sleeper_client._limiter.rate, 5.0)
+        self.assertEqual(sleeper_client._limiter.capacity, 7)
+        self.assertEqual(sleeper_client._max_retries, 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Unit tests for the CPR weight sweep"""
+import unittest
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.cpr import CPREngine, COMPONENTS, weight_matrix, sample_weight_sets, rank_matrix
+from scripts.synthetic import league, round_robin
+
+LEAGUE_ID = "test_league"
+
+class TestWeightSweep(unittest.TestCase):
+    """Test batch scoring and rank-stability statistics"""
+
+    def setUp(self):
+        self.teams, self.players = league(10)
+        for target in ('src.alvarado_calculator.make_sleeper_request', 'src.team_extraction.make_sleeper_request'):
+            patcher = patch(target, return_value=None)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.engine = CPREngine({}, LEAGUE_ID)
+        self.result = self.engine.calculate_league_cpr(self.teams, self.players, round_robin(10, 8))
+
+    def test_configured_weights_reproduce_rankings(self):
+        """Test sweeping the engine's own weights gives its CPR scores and ranks"""
+        sweep = self.engine.sweep_weights([self.engine.weights])
+
+        by_team = dict(zip(sweep['team_ids'], zip(sweep['scores'][0], sweep['ranks'][0])))
+        for metrics in self.result['rankings']:
+            score, rank = by_team[int(metrics.team_id)]
+            self.assertAlmostEqual(score, metrics.cpr, places=12)
+            self.assertEqual(rank, metrics.rank)
+        self.assertTrue(np.all(sweep['mean_rank_shift'] == 0))
+
+    def test_single_component_weights(self):
+        """Test an SLI-only weight set ranks teams by SLI"""
+        sweep = self.engine.sweep_weights([{'sli': 1.0}])
+
+        sli = np.array([self.engine._components[r]['sli'] for r in sweep['team_ids']])
+        np.testing.assert_array_equal(sweep['ranks'][0], rank_matrix(sli[None, :])[0])
+
+    def test_stability_statistics(self):
+        """Test rank frequencies over sampled weight sets"""
+        weight_sets = sample_weight_sets(self.engine.weights, 500, seed=1)
+        sweep = self.engine.sweep_weights(weight_sets)
+
+        self.assertEqual(sweep['scores'].shape, (500, 10))
+        np.testing.assert_allclose(sweep['rank_frequency'].sum(axis=1), 1.0)
+        np.testing.assert_allclose(sweep['rank_frequency'].sum(axis=0), 1.0)
+        self.assertTrue(np.all(sweep['best_rank'] <= sweep['mean_rank']))
+        self.assertTrue(np.all(sweep['mean_rank'] <= sweep['worst_rank']))
+
+    def test_weight_normalization(self):
+        """Test weight rows off 1.0 are normalized like the engine's config"""
+        weights = weight_matrix([{'sli': 2.0, 'bsi': 2.0}, {'sli': 0.995}])
+
+        self.assertEqual(weights[0].tolist(), [0.5, 0.5, 0.0, 0.0, 0.0, 0.0])
+        self.assertEqual(weights[1][0], 0.995)
+        self.assertEqual(len(COMPONENTS), weights.shape[1])
+
+    def test_requires_components(self):
+        """Test sweeping before any run is an error"""
+        with self.assertRaises(ValueError):
+            CPREngine({}, LEAGUE_ID).sweep_weights([{'sli': 1.0}])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Unit tests for the league-level (matrix) Zion tensor"""
+import unittest
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.cpr import CPREngine
+from src.league_context import LeagueContext
+from src.matchup_store import MatchupStore
+from src.zion_calculator import ZionTensorCalculator
+from src.models import Team
+from scripts.synthetic import league, round_robin
+
+LEAGUE_ID = "test_league"
+class TestZionMatrix(unittest.TestCase):
+    """Test matrix Zion against the per-team tensor"""
+
+    def setUp(self):
+        self.teams, self.players = league(10)
+        self.store = MatchupStore(LEAGUE_ID, weeks=range(1, 13))
+        self.store.prime(round_robin(10, 12))
+        draft = {'draft_id': 'd1', 'picks': [], 'adp_mapping': {f"p{r}_0": {'pick_no': r} for r in range(1, 11)}}
+        self.context = LeagueContext.build(LEAGUE_ID, self.teams, self.players, self.store, draft_data=draft)
+
+    def _assert_same(self, expected, actual):
+        for team in self.teams:
+            for a, b in zip(expected[team.team_id]['tensor_vector'], actual[team.team_id]['tensor_vector']):
+                self.assertAlmostEqual(a, b, places=12)
+            self.assertAlmostEqual(expected[team.team_id]['tensor_magnitude'],
+                                   actual[team.team_id]['tensor_magnitude'], places=12)
+            self.assertEqual(expected[team.team_id].get('opponents_faced'),
+                             actual[team.team_id].get('opponents_faced'))
+
+    def test_matches_per_team_with_context(self):
+        """Test the matrix form equals the per-team loop with a bound context"""
+        calc = ZionTensorCalculator(LEAGUE_ID, self.store)
+        calc.bind_context(self.context)
+
+        expected = calc.calculate_league_zion_tensors(self.teams, self.players, matrix=False)
+        actual = calc.calculate_league_zion_tensors(self.teams, self.players)
+
+        self._assert_same(expected, actual)
+
+    def test_matches_per_team_without_context(self):
+        """Test the matrix form reads the matchup store directly when unbound"""
+        with patch('src.alvarado_calculator.make_sleeper_request', return_value=None):
+            calc = ZionTensorCalculator(LEAGUE_ID, self.store)
+            expected = calc.calculate_league_zion_tensors(self.teams, self.players, matrix=False)
+            actual = calc.calculate_league_zion_matrix(self.teams, self.players)
+
+        self._assert_same(expected, actual)
+
+    def test_subset_rows_match_full(self):
+        """Test restricting to a few roster IDs gives the same tensors for those teams"""
+        calc = ZionTensorCalculator(LEAGUE_ID, self.store)
+        calc.bind_context(self.context)
+
+        full = calc.calculate_league_zion_matrix(self.teams, self.players)
+        subset = calc.calculate_league_zion_matrix(self.teams, self.players, roster_ids=[3, 7])
+
+        self.assertEqual(set(subset), {"3", "7"})
+        for team_id in subset:
+            self.assertEqual(full[team_id]['tensor_vector'], subset[team_id]['tensor_vector'])
+            self.assertEqual(full[team_id]['opponents_faced'], subset[team_id]['opponents_faced'])
+
+    def test_team_without_opponents(self):
+        """Test a team with no games gets the neutral tensor"""
+        teams = self.teams + [Team(team_id="99", team_name="Idle", owner_name="")]
+        calc = ZionTensorCalculator(LEAGUE_ID, self.store)
+        calc.bind_context(LeagueContext.build(LEAGUE_ID, teams, self.players, self.store))
+
+        result = calc.calculate_league_zion_matrix(teams, self.players)
+
+        self.assertEqual(result["99"]['tensor_magnitude'], 0.5)
+
+    def test_engine_batch_matches_reference(self):
+        """Test batched engine components equal the per-team reference path"""
+        engine = CPREngine({}, LEAGUE_ID)
+        engine.matchup_store = self.store
+        engine.bind_context(self.context)
+
+        batched = engine.calculate_league_components(self.teams, self.players)
+
+        for team in self.teams:
+            reference = engine.calculate_team_components(team, self.players, self.teams)
+            for key, value in reference.items():
+                self.assertAlmostEqual(batched[int(team.team_id)][key], value, places=12, msg=key)
+
+if __name__ == '__main__':
+    unittest.main()